@@ -0,0 +1,195 @@
+"""
+Columnar computation of the advanced analytics.
+
+advanced_analytics works on the hot tier series of a client (see
+hot_tier): platform totals are array sums, dates are formatted once per
+distinct day and the 30-day spend windows are slices of the date-sorted
+arrays. Nothing is done per record.
+
+bucketed_metrics serves windowed, bucketed chart data the same way.
+
+records_advanced_analytics is the loop the view used to run over every
+record, parsing each date for the 30-day windows. It is kept as the
+reference that tests and the benchmark_analytics command compare
+against. Both produce the same output, up to float summation order.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from .hot_tier import EPOCH
+
+STAT_METRICS = ['impressions', 'clicks', 'spend', 'revenue', 'conversions']
+GRANULARITIES = ['day', 'week', 'month']
+
+
+def _derive(platform_stats):
+    for stats in platform_stats.values():
+        stats['ctr'] = (stats['clicks'] / stats['impressions']) if stats['impressions'] > 0 else 0
+        stats['roi'] = (stats['revenue'] / stats['spend']) if stats['spend'] > 0 else 0
+    return platform_stats
+
+
+def _insights(platform_stats, spend_last_30, spend_prev_30):
+    insights = []
+    # Best/worst performing platform
+    best_platform = max(
+        platform_stats.items(),
+        key=lambda x: x[1]['roi'] if x[1]['spend'] > 0 else -1,
+        default=(None, None)
+    )[0]
+    worst_platform = min(
+        platform_stats.items(),
+        key=lambda x: x[1]['roi'] if x[1]['spend'] > 0 else float('inf'),
+        default=(None, None)
+    )[0]
+    # Spend efficiency
+    if best_platform:
+        insights.append({
+            'type': 'opportunity',
+            'title': f'Best Performing Platform: {best_platform}',
+            'description': f'{best_platform} has the highest ROI of {platform_stats[best_platform]["roi"]:.2f}. Consider increasing budget allocation.',
+            'priority': 'high',
+        })
+    if worst_platform and platform_stats[worst_platform]['spend'] > 0:
+        insights.append({
+            'type': 'warning',
+            'title': f'Least Efficient Platform: {worst_platform}',
+            'description': f'{worst_platform} has the lowest ROI of {platform_stats[worst_platform]["roi"]:.2f}. Review campaign strategy or reduce spend.',
+            'priority': 'medium',
+        })
+    # Conversion rate
+    total_conversions = sum(stats['conversions'] for stats in platform_stats.values())
+    total_clicks = sum(stats['clicks'] for stats in platform_stats.values())
+    conversion_rate = (total_conversions / total_clicks) if total_clicks > 0 else 0
+    insights.append({
+        'type': 'metric',
+        'title': 'Overall Conversion Rate',
+        'description': f'Your overall conversion rate is {conversion_rate:.2%}.',
+        'priority': 'info',
+    })
+    # Spend trend (last 30 days vs previous 30 days)
+    if spend_prev_30 > 0:
+        spend_trend = (spend_last_30 - spend_prev_30) / spend_prev_30
+        trend_desc = 'increased' if spend_trend > 0 else 'decreased'
+        insights.append({
+            'type': 'trend',
+            'title': 'Spend Trend',
+            'description': f'Your spend has {trend_desc} by {abs(spend_trend):.2%} compared to the previous month.',
+            'priority': 'info',
+        })
+    return insights
+
+
+def _date_strings(days):
+    # Format each distinct day once; the series hold many rows per day
+    distinct, inverse = np.unique(days, return_inverse=True)
+    labels = (EPOCH + distinct.astype('timedelta64[D]')).astype(str).astype(object)
+    return labels[inverse].tolist()
+
+
+def advanced_analytics(series, kpis, today):
+    """Analytics of {platform: Series}; today is a hot_tier day number."""
+    record_count = sum(len(platform_series) for platform_series in series.values())
+    if not record_count:
+        return {'summary': kpis, 'record_count': 0, 'insights': []}
+    platform_stats = {}
+    for platform, platform_series in series.items():
+        if not len(platform_series):
+            continue
+        stats = {name: platform_series.total(name) for name in STAT_METRICS}
+        stats['dates'] = _date_strings(platform_series.days)
+        stats['roi'] = 0
+        stats['ctr'] = 0
+        platform_stats[platform] = stats
+    _derive(platform_stats)
+    spend_last_30 = sum(s.window(start=today - 30).total('spend') for s in series.values())
+    spend_prev_30 = sum(s.window(today - 60, today - 31).total('spend') for s in series.values())
+    return {
+        'summary': kpis,
+        'record_count': record_count,
+        'insights': _insights(platform_stats, spend_last_30, spend_prev_30),
+        'platform_stats': platform_stats,
+    }
+
+
+def _bucket_starts(days, granularity):
+    """Day number of the first day of each day's bucket."""
+    if granularity == 'week':
+        # Day 0 (1970-01-01) was a Thursday; weeks start on Monday
+        return days - (days + 3) % 7
+    if granularity == 'month':
+        months = (EPOCH + days.astype('timedelta64[D]')).astype('datetime64[M]')
+        return (months.astype('datetime64[D]') - EPOCH).astype(np.int32)
+    return days
+
+
+def bucketed_metrics(series, fields, granularity='day', start=None, end=None):
+    """Totals and per-bucket sums of fields over the day numbers start..end.
+
+    series is {platform: Series}. Returns {'kpis': {field: total},
+    'series': [{'period': 'YYYY-MM-DD', field: sum, ...}]} with one entry
+    per bucket that has data, in date order.
+    """
+    windows = [s.window(start, end) for s in series.values()]
+    days = np.concatenate([w.days for w in windows] or [np.empty(0, np.int32)])
+    buckets, inverse = np.unique(_bucket_starts(days, granularity), return_inverse=True)
+    sums = {
+        name: np.bincount(
+            inverse, weights=np.concatenate([w.metrics[name] for w in windows] or [np.empty(0)]),
+            minlength=len(buckets),
+        )
+        for name in fields
+    }
+    periods = _date_strings(buckets)
+    return {
+        'kpis': {name: float(sums[name].sum()) for name in fields},
+        'series': [
+            {'period': period, **{name: float(sums[name][i]) for name in fields}}
+            for i, period in enumerate(periods)
+        ],
+    }
+
+
+def records_advanced_analytics(records, kpis, today):
+    """Reference: the view's original loop over every record.
+
+    today is a hot_tier day number. The per-platform insights are shared
+    with advanced_analytics; everything per record is done as before.
+    """
+    if not records:
+        return {'summary': kpis, 'record_count': 0, 'insights': []}
+    platform_stats = defaultdict(lambda: {
+        'impressions': 0, 'clicks': 0, 'spend': 0, 'revenue': 0,
+        'conversions': 0, 'dates': [], 'roi': 0, 'ctr': 0
+    })
+    for r in records:
+        platform = r.get('platform', 'unknown')
+        platform_stats[platform]['impressions'] += float(r.get('impressions', 0) or 0)
+        platform_stats[platform]['clicks'] += float(r.get('clicks', 0) or 0)
+        platform_stats[platform]['spend'] += float(r.get('spend', 0) or 0)
+        platform_stats[platform]['revenue'] += float(r.get('revenue', 0) or 0)
+        platform_stats[platform]['conversions'] += float(r.get('conversions', 0) or 0)
+        if r.get('date'):
+            platform_stats[platform]['dates'].append(r['date'])
+    _derive(platform_stats)
+    # Spend trend (last 30 days vs previous 30 days)
+    today = (EPOCH + np.timedelta64(today, 'D')).item()
+    last_30 = [
+        r for r in records if r.get('date') and
+        (today - datetime.strptime(r['date'], '%Y-%m-%d').date()).days <= 30
+    ]
+    prev_30 = [
+        r for r in records if r.get('date') and
+        30 < (today - datetime.strptime(r['date'], '%Y-%m-%d').date()).days <= 60
+    ]
+    spend_last_30 = sum(float(r.get('spend', 0) or 0) for r in last_30)
+    spend_prev_30 = sum(float(r.get('spend', 0) or 0) for r in prev_30)
+    return {
+        'summary': kpis,
+        'record_count': len(records),
+        'insights': _insights(platform_stats, spend_last_30, spend_prev_30),
+        'platform_stats': dict(platform_stats),
+    }
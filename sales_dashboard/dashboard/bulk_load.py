@@ -0,0 +1,146 @@
+"""
+Bulk loading of DataFrames into model tables.
+
+On PostgreSQL, bulk_load streams the rows through COPY FROM STDIN from an
+in-memory CSV buffer into a temporary table. A single INSERT ... SELECT
+then moves them into the target table, with ON CONFLICT DO UPDATE (upsert)
+or DO NOTHING when asked. That is one round trip per COPY_CHUNK_ROWS rows
+instead of one parameterized INSERT per bulk_create batch. Other databases
+(SQLite in development and tests) fall back to bulk_create with the same
+conflict handling.
+
+Frames are keyed by field attname (client_id, not client). Concrete fields
+missing from the frame get their model default, and auto_now/auto_now_add
+fields get the current time, because COPY bypasses Model.pre_save.
+"""
+
+import csv
+import io
+import logging
+import uuid
+
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BULK_CREATE_BATCH_SIZE = 1000
+COPY_CHUNK_ROWS = 100000
+# Missing values are written as \N, so an unquoted empty field stays ''
+COPY_NULL = r'\N'
+
+
+def copy_supported(using=DEFAULT_DB_ALIAS):
+    """Whether the database behind using can load rows with COPY."""
+    return connections[using].vendor == 'postgresql'
+
+
+def _load_fields(model, frame):
+    """Concrete non-primary-key fields, with frame completed for all of them."""
+    fields = [
+        field for field in model._meta.concrete_fields if not field.primary_key
+    ]
+    frame = frame.copy()
+    now = timezone.now()
+    for field in fields:
+        if field.attname in frame.columns:
+            continue
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            frame[field.attname] = now
+        else:
+            frame[field.attname] = field.get_default()
+    return fields, frame[[field.attname for field in fields]]
+
+
+def csv_buffer(frame):
+    """Write frame as CSV for COPY, with missing values as COPY_NULL."""
+    buffer = io.StringIO()
+    frame.to_csv(
+        buffer, index=False, header=False, na_rep=COPY_NULL,
+        quoting=csv.QUOTE_MINIMAL, lineterminator='\n',
+    )
+    buffer.seek(0)
+    return buffer
+
+
+def _copy(cursor, table, columns, buffer):
+    sql = (
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+    raw = cursor.cursor
+    if hasattr(raw, 'copy_expert'):
+        # psycopg2
+        raw.copy_expert(sql, buffer)
+    else:
+        # psycopg 3
+        with raw.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _conflict_clause(model, qn, unique_fields, update_fields, ignore_conflicts):
+    if update_fields:
+        target = ', '.join(qn(model._meta.get_field(name).column) for name in unique_fields)
+        updates = ', '.join(
+            f'{column} = EXCLUDED.{column}'
+            for column in (qn(model._meta.get_field(name).column) for name in update_fields)
+        )
+        return f' ON CONFLICT ({target}) DO UPDATE SET {updates}'
+    if ignore_conflicts:
+        return ' ON CONFLICT DO NOTHING'
+    return ''
+
+
+def _copy_load(model, frame, unique_fields, update_fields, ignore_conflicts, using):
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    fields, frame = _load_fields(model, frame)
+    columns = [qn(field.column) for field in fields]
+    table = qn(model._meta.db_table)
+    staging = qn(f'load_{uuid.uuid4().hex[:12]}')
+    conflict = _conflict_clause(model, qn, unique_fields, update_fields, ignore_conflicts)
+    written = 0
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {', '.join(columns)} FROM {table} WITH NO DATA"
+        )
+        for start in range(0, len(frame), COPY_CHUNK_ROWS):
+            _copy(cursor, staging, columns, csv_buffer(frame.iloc[start:start + COPY_CHUNK_ROWS]))
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"SELECT {', '.join(columns)} FROM {staging}{conflict}"
+            )
+            written += cursor.rowcount
+            cursor.execute(f'TRUNCATE {staging}')
+        cursor.execute(f'DROP TABLE {staging}')
+    logger.debug(f"Loaded {written} of {len(frame)} rows into {model._meta.db_table} with COPY")
+    return written
+
+
+def bulk_load(model, frame, unique_fields=None, update_fields=None,
+              ignore_conflicts=False, batch_size=None, using=None):
+    """Insert the rows of frame into model's table.
+
+    With update_fields, rows that collide on unique_fields update those
+    fields instead; with ignore_conflicts, colliding rows are skipped.
+    Returns the number of rows written (for the bulk_create fallback, the
+    number of rows sent). Without using, the database routers pick the
+    alias.
+    """
+    if frame.empty:
+        return 0
+    using = using or router.db_for_write(model)
+    if copy_supported(using):
+        return _copy_load(model, frame, unique_fields, update_fields, ignore_conflicts, using)
+
+    objects = [model(**row) for row in frame.to_dict(orient='records')]
+    model.objects.using(using).bulk_create(
+        objects,
+        batch_size=batch_size or BULK_CREATE_BATCH_SIZE,
+        update_conflicts=bool(update_fields),
+        unique_fields=unique_fields if update_fields else None,
+        update_fields=update_fields,
+        ignore_conflicts=ignore_conflicts,
+    )
+    return len(objects)
@@ -0,0 +1,269 @@
+"""
+Resumable uploads of large exports.
+
+The browser splits a file into numbered parts (0-based, at most
+CHUNKED_UPLOAD_PART_SIZE bytes each) and sends the SHA-256 of every part in
+its X-Content-SHA256 header. Each part is streamed from the request into a
+temporary file under MEDIA_ROOT and verified there, so it never passes
+through Django's upload handlers and is never held in memory whole; only
+then is the upload locked and the part appended to its partial file, so
+the row lock is never held while the network is read. Parts are appended
+in order; after a dropped connection the client asks how many parts
+arrived and resumes from the next one.
+
+The checksum declared when the upload starts is the SHA-256 of the
+concatenated hex digests of all parts, which verifies the whole file
+without reading it again. Once the last part is in, the partial file
+becomes the upload's source_file and the ingestion task is queued.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from .ingestion import file_extension
+from .models import ChunkedUpload, UnifiedClientData
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_DIR = os.path.join('uploads', 'partial')
+READ_BLOCK_SIZE = 64 * 1024
+_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class ChunkedUploadError(Exception):
+    """A part or upload request that cannot be accepted, with its HTTP status."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def get_part_size():
+    """Largest accepted part, in bytes."""
+    return int(getattr(settings, 'CHUNKED_UPLOAD_PART_SIZE', 8 * 1024 * 1024))
+
+
+def partial_path(chunked):
+    """Path of the file the parts of chunked are appended to."""
+    return os.path.join(settings.MEDIA_ROOT, PARTIAL_DIR, f'{chunked.pk}.part')
+
+
+def manifest_checksum(part_checksums):
+    """SHA-256 of the concatenated hex digests of every part."""
+    return hashlib.sha256(''.join(part_checksums).encode()).hexdigest()
+
+
+def _check_sha256(value, name):
+    value = (value or '').strip().lower()
+    if not _SHA256_RE.match(value):
+        raise ChunkedUploadError(f'{name} must be a hex SHA-256 digest.')
+    return value
+
+
+def start_chunked_upload(client, file_name, total_parts, checksum, platform=''):
+    """Register a new resumable upload and create its empty partial file."""
+    try:
+        file_extension(file_name)
+    except ValueError as e:
+        raise ChunkedUploadError(str(e))
+    try:
+        total_parts = int(total_parts)
+    except (TypeError, ValueError):
+        total_parts = 0
+    if total_parts < 1:
+        raise ChunkedUploadError('total_parts must be a positive integer.')
+
+    chunked = ChunkedUpload.objects.create(
+        client=client,
+        file_name=os.path.basename(file_name),
+        platform=platform or '',
+        total_parts=total_parts,
+        checksum=_check_sha256(checksum, 'checksum'),
+    )
+    path = partial_path(chunked)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return chunked
+
+
+def chunked_status(chunked):
+    """JSON-serializable state of a resumable upload."""
+    return {
+        'id': chunked.pk,
+        'status': chunked.status,
+        'total_parts': chunked.total_parts,
+        'received_parts': chunked.received_parts,
+        'bytes_received': chunked.bytes_received,
+        'part_size': get_part_size(),
+        'upload_id': chunked.upload_id,
+        'error_message': chunked.error_message,
+    }
+
+
+def _receive_part_file(stream, part_size):
+    """Copy stream into a temporary file; return its path, digest and size."""
+    directory = os.path.join(settings.MEDIA_ROOT, PARTIAL_DIR)
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix='.incoming', dir=directory)
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with os.fdopen(fd, 'wb') as incoming:
+            while True:
+                block = stream.read(READ_BLOCK_SIZE)
+                if not block:
+                    break
+                written += len(block)
+                if written > part_size:
+                    raise ChunkedUploadError(
+                        f'Parts may be at most {part_size} bytes.', status=413
+                    )
+                digest.update(block)
+                incoming.write(block)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, digest.hexdigest(), written
+
+
+def _append_part(path, offset, part_path):
+    """Append the received part file to the partial file at offset."""
+    with open(path, 'r+b') as partial, open(part_path, 'rb') as part:
+        partial.truncate(offset)
+        partial.seek(offset)
+        shutil.copyfileobj(part, partial, READ_BLOCK_SIZE)
+
+
+def receive_part(client, chunked_id, number, stream, part_checksum):
+    """Append part number of a resumable upload, read from stream.
+
+    The part is read and verified before the upload row is locked.
+    Re-sending a part that was already stored is acknowledged without
+    writing, so clients can retry blindly. Receiving the last part
+    completes the upload.
+    """
+    part_checksum = _check_sha256(part_checksum, 'X-Content-SHA256')
+    if not ChunkedUpload.objects.filter(pk=chunked_id, client=client).exists():
+        raise ChunkedUploadError('Upload not found.', status=404)
+    part_path, digest, written = _receive_part_file(stream, get_part_size())
+    try:
+        if digest != part_checksum:
+            raise ChunkedUploadError(f'Part {number} checksum mismatch.')
+        chunked = _store_part(client, chunked_id, number, part_path, digest, written)
+    finally:
+        os.remove(part_path)
+    if chunked.status == 'failed':
+        raise ChunkedUploadError(chunked.error_message)
+    return chunked
+
+
+def _store_part(client, chunked_id, number, part_path, digest, written):
+    """Lock the upload and append a received, verified part to it."""
+    with transaction.atomic():
+        try:
+            chunked = ChunkedUpload.objects.select_for_update().get(
+                pk=chunked_id, client=client
+            )
+        except ChunkedUpload.DoesNotExist:
+            raise ChunkedUploadError('Upload not found.', status=404)
+
+        if number < chunked.received_parts:
+            if chunked.part_checksums[number] != digest:
+                raise ChunkedUploadError(
+                    f'Part {number} was already received with different content.',
+                    status=409
+                )
+            return chunked
+        if chunked.status != 'receiving':
+            raise ChunkedUploadError(f'Upload is {chunked.status}.', status=409)
+        if number != chunked.received_parts:
+            raise ChunkedUploadError(
+                f'Expected part {chunked.received_parts}, got part {number}.',
+                status=409
+            )
+        if number >= chunked.total_parts:
+            raise ChunkedUploadError(
+                f'Upload only has {chunked.total_parts} parts.'
+            )
+
+        path = partial_path(chunked)
+        try:
+            _append_part(path, chunked.bytes_received, part_path)
+        except Exception:
+            # Drop whatever was written so the part can be sent again
+            with open(path, 'r+b') as partial:
+                partial.truncate(chunked.bytes_received)
+            raise
+
+        chunked.part_checksums = chunked.part_checksums + [digest]
+        chunked.received_parts += 1
+        chunked.bytes_received += written
+        chunked.save(update_fields=[
+            'part_checksums', 'received_parts', 'bytes_received', 'updated_at'
+        ])
+        if chunked.received_parts == chunked.total_parts:
+            complete_chunked_upload(chunked)
+    return chunked
+
+
+def _store_partial_file(path, upload, file_name):
+    """Move the assembled file into storage as upload.source_file."""
+    field = upload.source_file.field
+    name = default_storage.get_available_name(field.generate_filename(upload, file_name))
+    try:
+        destination = default_storage.path(name)
+    except NotImplementedError:
+        with open(path, 'rb') as assembled:
+            name = default_storage.save(name, File(assembled))
+        os.remove(path)
+    else:
+        # Same filesystem as MEDIA_ROOT: rename instead of copying
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(path, destination)
+    upload.source_file.name = name
+    upload.save(update_fields=['source_file'])
+
+
+def complete_chunked_upload(chunked):
+    """Verify the whole-file checksum and queue ingestion of the upload.
+
+    Returns the new UnifiedClientData, or None (and marks chunked failed)
+    when the checksum does not match.
+    """
+    from .tasks import process_unified_upload
+
+    path = partial_path(chunked)
+    if manifest_checksum(chunked.part_checksums) != chunked.checksum:
+        os.remove(path)
+        chunked.status = 'failed'
+        chunked.error_message = 'File checksum mismatch.'
+        chunked.save(update_fields=['status', 'error_message', 'updated_at'])
+        logger.error(f"Chunked upload {chunked.pk} failed checksum verification")
+        return None
+
+    upload = UnifiedClientData.objects.create(
+        client=chunked.client,
+        source='upload',
+        file_name=chunked.file_name,
+        status='processing',
+        platforms_included=[chunked.platform] if chunked.platform else [],
+    )
+    _store_partial_file(path, upload, chunked.file_name)
+    chunked.upload = upload
+    chunked.status = 'complete'
+    chunked.save(update_fields=['upload', 'status', 'updated_at'])
+    transaction.on_commit(lambda: process_unified_upload.delay(upload.pk))
+    logger.info(
+        f"Chunked upload {chunked.pk} complete: {chunked.bytes_received} bytes "
+        f"in {chunked.total_parts} parts"
+    )
+    return upload
@@ -0,0 +1,92 @@
+"""
+Vectorized cleaning of formatted numeric values.
+
+Exports and reports carry numbers as display strings: "$125,000", "3.6x",
+"15.34%", "2,500", "(1,200)". clean_numeric parses a whole column at once
+with compiled regular expressions and counts how many values needed
+coercion and how many could not be parsed at all, instead of raising and
+swallowing one exception per bad value.
+
+Percent and multiplier suffixes are stripped without rescaling, so "15.34%"
+becomes 15.34, matching the percent-unit rate columns in platform exports.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Characters that only format a number: whitespace, thousands separators
+# and currency symbols
+_FORMATTING_RE = re.compile(r'[\s,$€£¥]')
+# Trailing percent or multiplier suffix ("15.34%", "3.6x", "3.6X")
+_SUFFIX_RE = re.compile(r'(?<=\d)[%xX]$')
+# Accounting style negatives: "(1200)" -> "-1200"
+_PARENTHESES_RE = re.compile(r'^\((.+)\)$')
+
+# Placeholders that mean "no value" rather than a malformed number
+NULL_TOKENS = ['', '-', '--', 'n/a', 'na', 'nan', 'none', 'null']
+
+
+def empty_report():
+    """Return a cleaning report with zero counts."""
+    return {'coerced': 0, 'rejected': 0, 'columns': {}}
+
+
+def merge_reports(report, other):
+    """Add the counts of other into report (in place) and return report."""
+    report['coerced'] += other['coerced']
+    report['rejected'] += other['rejected']
+    for column, counts in other['columns'].items():
+        totals = report['columns'].setdefault(column, {'coerced': 0, 'rejected': 0})
+        totals['coerced'] += counts['coerced']
+        totals['rejected'] += counts['rejected']
+    return report
+
+
+def clean_numeric(values):
+    """Parse a column of numbers and formatted number strings.
+
+    Returns a tuple (float64 ndarray, counts) where counts holds the number
+    of values that were coerced from a formatted string and the number of
+    non-empty values that were rejected (and became NaN).
+    """
+    series = pd.Series(values, copy=False)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype='float64', na_value=np.nan), {'coerced': 0, 'rejected': 0}
+
+    raw = series.astype('string').str.strip()
+    present = raw.notna() & ~raw.str.lower().isin(NULL_TOKENS)
+    cleaned = (
+        raw.str.replace(_FORMATTING_RE, '', regex=True)
+        .str.replace(_SUFFIX_RE, '', regex=True)
+        .str.replace(_PARENTHESES_RE, r'-\1', regex=True)
+    )
+    parsed = pd.to_numeric(cleaned.where(present), errors='coerce')
+    result = parsed.to_numpy(dtype='float64', na_value=np.nan)
+
+    present = present.to_numpy(dtype=bool, na_value=False)
+    valid = ~np.isnan(result)
+    changed = (cleaned != raw).to_numpy(dtype=bool, na_value=False)
+    counts = {
+        'coerced': int(np.count_nonzero(valid & changed)),
+        'rejected': int(np.count_nonzero(present & ~valid)),
+    }
+    return result, counts
+
+
+def clean_frame(frame, columns):
+    """Clean the given columns of frame in place.
+
+    Columns missing from frame are skipped. Returns the cleaning report for
+    the cleaned columns.
+    """
+    report = empty_report()
+    for column in columns:
+        if column not in frame.columns:
+            continue
+        frame[column], counts = clean_numeric(frame[column])
+        report['columns'][column] = counts
+        report['coerced'] += counts['coerced']
+        report['rejected'] += counts['rejected']
+    return report
@@ -0,0 +1,79 @@
+"""
+Versioned per-client cache of computed dashboard data.
+
+Entries are stored under the client's Client.data_version, which every
+write to the client's daily metrics bumps (sync, upload and backfill all
+go through facts.upsert_daily_metrics). A sync therefore makes the old
+entries unreachable without deleting anything, and they age out after
+DASHBOARD_CACHE_TIMEOUT. The version comes from the client row the
+request has already loaded, so a hit costs one cache GET.
+
+The cache is the DASHBOARD_CACHE_ALIAS backend: Redis in production and
+local memory in development. Hits and misses are counted per process,
+and the hit rate is logged every DASHBOARD_CACHE_STATS_EVERY lookups.
+"""
+
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 3600
+DEFAULT_STATS_EVERY = 1000
+_MISSING = object()
+
+_counts = {'hits': 0, 'misses': 0}
+_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')]
+
+
+def cache_key(client, name):
+    return f'dashboard:{name}:{client.pk}'
+
+
+def _count(outcome):
+    with _lock:
+        _counts[outcome] += 1
+        counts = dict(_counts)
+    every = getattr(settings, 'DASHBOARD_CACHE_STATS_EVERY', DEFAULT_STATS_EVERY)
+    lookups = counts['hits'] + counts['misses']
+    if every and lookups % every == 0:
+        logger.info(
+            f"Dashboard cache: {counts['hits']} hits, {counts['misses']} misses "
+            f"({counts['hits'] / lookups:.0%} hit rate) in this process"
+        )
+
+
+def cached(client, name, compute, *args):
+    """Return compute(client, *args), cached per client data version.
+
+    name must identify compute and args.
+    """
+    key = cache_key(client, name)
+    value = _cache().get(key, _MISSING, version=client.data_version)
+    if value is not _MISSING:
+        _count('hits')
+        return value
+    _count('misses')
+    value = compute(client, *args)
+    timeout = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+    _cache().set(key, value, timeout, version=client.data_version)
+    return value
+
+
+def stats():
+    """Hit and miss counts of this process."""
+    with _lock:
+        return dict(_counts)
+
+
+def reset_stats():
+    """Start counting hits and misses from zero."""
+    with _lock:
+        _counts.update(hits=0, misses=0)
@@ -0,0 +1,82 @@
+"""
+Read-replica routing for the heavy read-only views.
+
+Views decorated with @replica_reads send their ORM reads to the database
+alias named by REPLICA_DATABASE_ALIAS, when DATABASES defines it. All other
+reads and every write go to 'default'. The routing decision is held in a
+context variable that only lives for the view call, so the session and
+authentication lookups done by middleware keep reading from the primary.
+
+Replicas lag behind the primary. After a user triggers a sync,
+stick_to_primary marks their session so their replica-routed views read
+from the primary for REPLICA_STICKY_SECONDS, and they see their own
+writes.
+
+Locally the replica can be any second database. Give it
+TEST = {'MIRROR': 'default'} so the test runner points it at the test
+database instead of creating a separate one.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+from time import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_UNTIL_SESSION_KEY = 'db_primary_until'
+
+_read_alias = ContextVar('dashboard_read_alias', default=None)
+
+
+def replica_alias():
+    """Alias of the read replica, or None when no replica is configured."""
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def stick_to_primary(request):
+    """Serve this user's replica-routed reads from the primary for a while."""
+    sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 30)
+    request.session[PRIMARY_UNTIL_SESSION_KEY] = time() + sticky_seconds
+
+
+def reads_pinned_to_primary(request):
+    """Whether request falls inside its session's read-your-writes window."""
+    session = getattr(request, 'session', None)
+    if session is None:
+        return False
+    return session.get(PRIMARY_UNTIL_SESSION_KEY, 0) > time()
+
+
+def replica_reads(view):
+    """Route the ORM reads made while view runs to the read replica."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None or reads_pinned_to_primary(request):
+            return view(request, *args, **kwargs)
+        token = _read_alias.set(alias)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Send reads to the replica inside @replica_reads views; writes to default."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive their schema through replication
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,109 @@
+"""
+De-duplication of platform data.
+
+What is stored is a DailyMetric fact per (date, campaign), so that is what
+gets de-duplicated: each fact of a fetch or upload, summed over all of its
+rows for that key, is compared with the numbers currently stored for that
+key, and only new or changed facts are written. Re-uploading an export or
+re-syncing an unchanged window therefore stores nothing twice, while a
+corrected export replaces the facts it changes with their complete new
+numbers, including a correction that is later reverted. The comparison
+runs under the summary lock, so two workers ingesting the same rows
+concurrently see each other's writes.
+
+Rows without a date have no fact. They are reduced to a 64-bit content
+hash of (client, platform, date, campaign, metrics) and recorded in
+RecordFingerprint, whose unique index decides what is new: a batch is
+inserted with conflicts ignored and only the hashes the database actually
+accepted are kept.
+"""
+
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from .bulk_load import bulk_load
+from .facts import FACT_KEY, fact_keys, fact_rows, stored_facts, upsert_facts
+from .models import RecordFingerprint
+from .schema import CANONICAL_METRICS
+from .summary import locked_summary
+
+HASH_COLUMNS = ['date', 'campaign'] + CANONICAL_METRICS
+FINGERPRINT_BATCH_SIZE = 1000
+
+
+def row_hashes(frame, client_id, platform):
+    """Return an int64 content hash per row of a normalized frame."""
+    keyed = frame[HASH_COLUMNS].copy()
+    keyed.insert(0, 'client', client_id)
+    keyed.insert(1, 'platform', platform)
+    hashes = pd.util.hash_pandas_object(keyed, index=False)
+    return hashes.to_numpy(dtype='uint64').view('int64')
+
+
+def _first_seen(client, platform, hashes):
+    """Mask of the hashes that were never recorded for client, recording them."""
+    first_seen = ~pd.Series(hashes).duplicated().to_numpy()
+    batch = uuid.uuid4().hex
+    bulk_load(
+        RecordFingerprint,
+        pd.DataFrame({
+            'client_id': client.pk,
+            'platform': platform,
+            'row_hash': hashes[first_seen],
+            'batch': batch,
+        }),
+        ignore_conflicts=True,
+        batch_size=FINGERPRINT_BATCH_SIZE,
+    )
+    accepted = np.fromiter(
+        RecordFingerprint.objects.filter(batch=batch).values_list(
+            'row_hash', flat=True
+        ),
+        dtype='int64',
+    )
+    return first_seen & np.isin(hashes, accepted)
+
+
+def drop_duplicate_facts(client, platform, facts):
+    """Return the facts of a facts_frame that differ from the stored ones.
+
+    Call this under the summary lock (see summary.locked_summary), so the
+    stored numbers cannot change before the facts are written.
+    """
+    if facts.empty:
+        return facts
+    stored = facts[FACT_KEY].merge(
+        stored_facts(client, platform, facts), on=FACT_KEY, how='left'
+    )
+    unchanged = np.logical_and.reduce([
+        facts[name].to_numpy(dtype='float64') == stored[name].to_numpy(dtype='float64')
+        for name in CANONICAL_METRICS
+    ])
+    return facts[~unchanged]
+
+
+def store_new_facts(client, platform, facts):
+    """Upsert the facts that differ from the stored ones and return them.
+
+    facts must hold the complete numbers of each of their (date, campaign)
+    keys, e.g. the merge_facts of a whole upload. They are compared and
+    written in one transaction, under the summary lock (see
+    summary.locked_summary).
+    """
+    with locked_summary(client):
+        new_facts = drop_duplicate_facts(client, platform, facts)
+        upsert_facts(client, platform, new_facts)
+    return new_facts
+
+
+def new_rows(client, platform, frame, new_facts):
+    """The rows of frame that were stored: those of new_facts, and new dateless rows."""
+    dateless = fact_keys(frame)['date'].isna().to_numpy()
+    stored = fact_rows(frame, new_facts)
+    if dateless.any():
+        stored[dateless] = _first_seen(
+            client, platform, row_hashes(frame[dateless], client.pk, platform)
+        )
+    return frame[stored]
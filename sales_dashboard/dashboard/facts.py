@@ -0,0 +1,162 @@
+"""
+DailyMetric fact table.
+
+Sync and upload write their normalized rows here, one row per (client,
+platform, date, campaign) with typed metric columns, so read paths can
+filter and aggregate in the database instead of deserializing every JSON
+snapshot. Rows for the same key are summed (over the whole fetch or
+upload, see merge_facts) and then upserted, so a re-sync or corrected
+re-upload of a day replaces that day's numbers. Rows without a parseable
+date are only kept in the raw snapshots.
+"""
+
+import logging
+
+import pandas as pd
+from django.db.models import F
+
+from .bulk_load import bulk_load
+from .models import Client, DailyMetric
+from .schema import CANONICAL_METRICS, parse_dates
+
+logger = logging.getLogger(__name__)
+
+FACT_KEY = ['date', 'campaign']
+FACT_COLUMNS = ['platform', 'date', 'campaign'] + CANONICAL_METRICS
+FACT_BATCH_SIZE = 1000
+CAMPAIGN_MAX_LENGTH = DailyMetric._meta.get_field('campaign').max_length
+
+
+def fact_keys(frame):
+    """The (date, campaign) fact key of each row of a normalized frame.
+
+    Dates become datetime.date objects, or None for rows without a date.
+    """
+    dates = parse_dates(frame['date'])
+    return pd.DataFrame({
+        'date': dates.dt.date.astype(object).where(dates.notna(), None),
+        'campaign': frame['campaign'].str.slice(0, CAMPAIGN_MAX_LENGTH),
+    }, index=frame.index)
+
+
+def _sum_facts(facts):
+    return facts.groupby(FACT_KEY, sort=False, as_index=False)[CANONICAL_METRICS].sum()
+
+
+def facts_frame(frame):
+    """Collapse a normalized frame to one row per (date, campaign).
+
+    Rows without a date are dropped.
+    """
+    keys = fact_keys(frame)
+    dated = keys['date'].notna()
+    return _sum_facts(pd.concat([keys[dated], frame.loc[dated, CANONICAL_METRICS]], axis=1))
+
+
+def merge_facts(*facts):
+    """Sum fact frames, e.g. of the chunks of one upload, per (date, campaign)."""
+    return _sum_facts(pd.concat(facts, ignore_index=True))
+
+
+def fact_rows(frame, facts):
+    """Boolean mask of the rows of a normalized frame whose key is in facts."""
+    keys = fact_keys(frame)
+    hits = keys.merge(facts[FACT_KEY].assign(_hit=True), on=FACT_KEY, how='left')
+    return hits['_hit'].notna().to_numpy() & keys['date'].notna().to_numpy()
+
+
+def bump_data_version(client):
+    """Mark the derived data of client as stale."""
+    Client.objects.filter(pk=client.pk).update(data_version=F('data_version') + 1)
+    client.refresh_from_db(fields=['data_version'])
+
+
+def stored_facts(client, platform, facts):
+    """The stored DailyMetric rows in the date span of facts, as a facts frame."""
+    return pd.DataFrame.from_records(
+        DailyMetric.objects.filter(
+            client=client, platform=platform,
+            date__range=(facts['date'].min(), facts['date'].max()),
+        ).order_by().values_list(*FACT_KEY, *CANONICAL_METRICS),
+        columns=FACT_KEY + CANONICAL_METRICS,
+    )
+
+
+def fact_delta(client, platform, facts):
+    """What upserting facts changes in the client's totals.
+
+    Only the stored rows in the date span of facts are read. Returns the
+    number of new (date, campaign) rows and the change of each metric sum.
+    """
+    existing = stored_facts(client, platform, facts)
+    replaced = facts[FACT_KEY].merge(existing, on=FACT_KEY, how='inner')
+    metrics = {
+        name: float(facts[name].sum()) - float(replaced[name].astype('float64').sum())
+        for name in CANONICAL_METRICS
+    }
+    return len(facts) - len(replaced), metrics
+
+
+def upsert_daily_metrics(client, platform, frame):
+    """Insert or update the DailyMetric rows of a normalized frame.
+
+    Returns the number of fact rows written.
+    """
+    if frame.empty:
+        return 0
+    skipped = len(frame) - int(frame['date'].notna().sum())
+    if skipped:
+        logger.warning(
+            f"{skipped} {platform} rows for client {client.pk} have no date "
+            f"and were not added to the daily metrics"
+        )
+    return upsert_facts(client, platform, facts_frame(frame))
+
+
+def upsert_facts(client, platform, facts):
+    """Insert or replace the DailyMetric rows of a facts_frame.
+
+    Each (date, campaign) of facts must hold the complete numbers of that
+    day and campaign. Returns the number of fact rows written.
+    """
+    if facts.empty:
+        return 0
+    from .rollups import refresh_monthly_summaries, refresh_rollups
+    from .summary import apply_delta, locked_summary
+
+    first_date, last_date = facts['date'].min(), facts['date'].max()
+    with locked_summary(client) as summary:
+        new_rows, metrics = fact_delta(client, platform, facts)
+        written = bulk_load(
+            DailyMetric,
+            facts.assign(client_id=client.pk, platform=platform),
+            unique_fields=['client', 'platform', 'date', 'campaign'],
+            update_fields=CANONICAL_METRICS + ['updated_at'],
+            batch_size=FACT_BATCH_SIZE,
+        )
+        bump_data_version(client)
+        apply_delta(summary, client, platform, new_rows, metrics, first_date, last_date)
+        refresh_monthly_summaries(client, refresh_rollups(client, platform, first_date, last_date))
+    return written
+
+
+def metrics_frame(client, platforms=None, start=None, end=None):
+    """Load the daily metrics of client as a DataFrame.
+
+    The frame has FACT_COLUMNS with dates as ISO 'YYYY-MM-DD' strings, like
+    a normalized frame, optionally limited to platforms and to an
+    inclusive date range.
+    """
+    queryset = DailyMetric.objects.filter(client=client)
+    if platforms:
+        queryset = queryset.filter(platform__in=platforms)
+    if start:
+        queryset = queryset.filter(date__gte=start)
+    if end:
+        queryset = queryset.filter(date__lte=end)
+    frame = pd.DataFrame.from_records(
+        queryset.order_by().values_list(*FACT_COLUMNS), columns=FACT_COLUMNS
+    )
+    frame[CANONICAL_METRICS] = frame[CANONICAL_METRICS].astype('float64')
+    frame['date'] = pd.to_datetime(frame['date']).dt.strftime('%Y-%m-%d')
+    return frame
@@ -0,0 +1,151 @@
+"""
+Compressed JSON model field.
+
+CompressedJSONField stores a JSON document as zlib-compressed bytes in a
+binary column. Compression uses a preset dictionary of the keys and
+fragments that platform payloads repeat in every record, so even small
+snapshots shrink several times. Each stored value starts with a codec byte
+so the dictionary can be replaced later without breaking stored rows; the
+dictionary of an existing codec must never change.
+
+Values are decoded lazily: loading a row keeps the compressed bytes, and
+they are decompressed and parsed on first attribute access (then cached on
+the instance). .values()/.values_list() return CompressedJSON wrappers;
+call load_json on them to get the document.
+
+Unlike JSONField the column cannot be filtered by key.
+"""
+
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+CODEC_ZLIB_V1 = b'\x01'
+COMPRESSION_LEVEL = 6
+
+# Frozen: rows written with CODEC_ZLIB_V1 need exactly these bytes to decode.
+# zlib favours matches near the end of the dictionary, so the most frequent
+# fragments come last.
+ZLIB_V1_DICTIONARY = (
+    b'"pipeline_value": "target_accounts": "engaged_accounts": '
+    b'"new_leads": "qualified_leads": "opportunities": "deals_closed": '
+    b'"sent": "delivered": "opened": "clicked": "open_rate": "click_rate": '
+    b'"leads": "lead_rate": "ctr": "cpc": "cpm": "roi": "roas": '
+    b'"demandbase", "zoho", "mailchimp", "linkedin_ads", "google_ads", '
+    b'"month": "total": "status": null, true, false, '
+    b'0.0, "revenue": 0.0, "conversions": 0.0, "spend": 0.0, "clicks": '
+    b'0.0, "impressions": "2026-", "2025-", "campaign": "'
+    b'}, {"platform": "google_ads", "date": "2025-'
+)
+
+
+class CompressedJSON:
+    """A stored, still-compressed JSON value."""
+
+    __slots__ = ('raw',)
+
+    def __init__(self, raw):
+        self.raw = bytes(raw)
+
+    def __repr__(self):
+        return f'<CompressedJSON: {len(self.raw)} bytes>'
+
+
+def compress_json(value):
+    """Encode value as codec byte + zlib-compressed JSON."""
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zdict=ZLIB_V1_DICTIONARY)
+    payload = json.dumps(value, cls=DjangoJSONEncoder).encode()
+    return CODEC_ZLIB_V1 + compressor.compress(payload) + compressor.flush()
+
+
+def decompress_json(raw):
+    """Decode bytes written by compress_json.
+
+    Plain JSON text (rows written before the column was compressed) is
+    parsed as is.
+    """
+    raw = bytes(raw)
+    if raw[:1] == CODEC_ZLIB_V1:
+        decompressor = zlib.decompressobj(zdict=ZLIB_V1_DICTIONARY)
+        raw = decompressor.decompress(raw[1:]) + decompressor.flush()
+    return json.loads(raw)
+
+
+def load_json(value):
+    """Return the document held by value, decoding a CompressedJSON."""
+    if isinstance(value, CompressedJSON):
+        return decompress_json(value.raw)
+    return value
+
+
+class LazyJSONDescriptor(DeferredAttribute):
+    """Decode the compressed value on first access and cache the result."""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, CompressedJSON):
+            value = load_json(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        # Defining __set__ makes this a data descriptor, so __get__ runs even
+        # though the value lives in the instance __dict__
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedJSONField(models.BinaryField):
+    """JSON document stored zlib-compressed, decoded on first access."""
+
+    descriptor_class = LazyJSONDescriptor
+    description = 'Compressed JSON'
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.editable:
+            del kwargs['editable']
+        else:
+            kwargs['editable'] = False
+        return name, path, args, kwargs
+
+    def get_default(self):
+        # BinaryField turns str defaults into bytes; keep JSON defaults as given
+        return models.Field.get_default(self)
+
+    def pre_save(self, model_instance, add):
+        # Read the stored value directly so saving does not decode it
+        return model_instance.__dict__.get(self.attname)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return CompressedJSON(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        if isinstance(value, CompressedJSON):
+            value = value.raw
+        else:
+            value = compress_json(value)
+        return connection.Database.Binary(value)
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            return json.loads(value)
+        return load_json(value)
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        return models.JSONField().formfield(**kwargs)
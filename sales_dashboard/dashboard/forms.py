@@ -312,6 +312,30 @@ class CampaignFilterForm(forms.Form):
     )
 
 
+class UnifiedDataUploadForm(forms.Form):
+    """Form for uploading a platform export (CSV or Excel)"""
+    platform = forms.ChoiceField(
+        choices=[('', 'Detect from column headers')] + Campaign.PLATFORM_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    data_file = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.csv,.xlsx,.xlsm'
+        })
+    )
+
+    def clean_data_file(self):
+        from .ingestion import SUPPORTED_EXTENSIONS
+        data_file = self.cleaned_data.get('data_file')
+        if data_file and not data_file.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise forms.ValidationError(
+                "Unsupported file type. Please upload a CSV or Excel (.xlsx) file."
+            )
+        return data_file
+
+
 class GoogleAdsCredentialForm(forms.ModelForm):
     class Meta:
         model = GoogleAdsCredential
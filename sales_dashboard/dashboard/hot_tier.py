@@ -0,0 +1,169 @@
+"""
+Process-local hot tier of daily metric series.
+
+Dashboard reads keep each active client's DailyMetric rows in memory as
+contiguous NumPy arrays, one Series per (client, platform): day numbers
+(int32 days since 1970-01-01) sorted ascending, campaign codes into a
+tuple of names, and one float64 array per metric. Totals are array sums
+and date windows are slices found by binary search, so a request never
+walks individual records.
+
+Entries carry the Client.data_version they were loaded at. Writes to the
+facts bump that version (see facts.bump_data_version), and an entry whose
+version differs from the client's is reloaded on its next use. Each web
+and worker process has its own tier, bounded by HOT_TIER_MAX_BYTES; the
+least recently used entries are evicted first.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .models import DailyMetric
+from .schema import CANONICAL_METRICS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_size = 0
+
+
+def max_bytes():
+    return getattr(settings, 'HOT_TIER_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+
+def day_number(value):
+    """Days since 1970-01-01 of a date (or ISO date string)."""
+    return int((np.datetime64(value, 'D') - EPOCH).astype(np.int32))
+
+
+class Series:
+    """Daily metrics of one client and platform as date-sorted arrays."""
+
+    __slots__ = ('platform', 'days', 'campaign_codes', 'campaigns', 'metrics', 'version')
+
+    def __init__(self, platform, days, campaign_codes, campaigns, metrics, version=None):
+        self.platform = platform
+        self.days = days
+        self.campaign_codes = campaign_codes
+        self.campaigns = campaigns
+        self.metrics = metrics
+        self.version = version
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def nbytes(self):
+        return (
+            self.days.nbytes + self.campaign_codes.nbytes
+            + sum(values.nbytes for values in self.metrics.values())
+        )
+
+    def window(self, start=None, end=None):
+        """The rows from day number start to end, inclusive, without copying."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, start, side='left'))
+        hi = len(self.days) if end is None else int(np.searchsorted(self.days, end, side='right'))
+        return Series(
+            self.platform, self.days[lo:hi], self.campaign_codes[lo:hi], self.campaigns,
+            {name: values[lo:hi] for name, values in self.metrics.items()}, self.version,
+        )
+
+    def total(self, metric):
+        return float(self.metrics[metric].sum())
+
+    def frame(self):
+        """The rows as a metrics_frame-shaped DataFrame."""
+        frame = pd.DataFrame({
+            'platform': self.platform,
+            'date': (EPOCH + self.days.astype('timedelta64[D]')).astype(str),
+            'campaign': np.array(self.campaigns, dtype=object)[self.campaign_codes],
+        })
+        for name, values in self.metrics.items():
+            frame[name] = values
+        return frame
+
+
+def _load(client, platforms):
+    """Build the Series of platforms for client from the fact table."""
+    rows = pd.DataFrame.from_records(
+        DailyMetric.objects.filter(client=client, platform__in=platforms)
+        .order_by().values_list('platform', 'date', 'campaign', *CANONICAL_METRICS),
+        columns=['platform', 'date', 'campaign'] + CANONICAL_METRICS,
+    )
+    loaded = {}
+    for platform in platforms:
+        subset = rows[rows['platform'] == platform]
+        days = (
+            subset['date'].to_numpy(dtype='datetime64[D]') - EPOCH
+        ).astype(np.int32)
+        order = np.argsort(days, kind='stable')
+        codes, campaigns = pd.factorize(subset['campaign'].to_numpy()[order])
+        loaded[platform] = Series(
+            platform,
+            np.ascontiguousarray(days[order]),
+            codes.astype(np.int32),
+            tuple(campaigns),
+            {
+                name: np.ascontiguousarray(subset[name].to_numpy(dtype=np.float64)[order])
+                for name in CANONICAL_METRICS
+            },
+            client.data_version,
+        )
+    return loaded
+
+
+def _store(key, series):
+    global _size
+    limit = max_bytes()
+    if series.nbytes > limit:
+        return
+    with _lock:
+        previous = _entries.pop(key, None)
+        if previous is not None:
+            _size -= previous.nbytes
+        _entries[key] = series
+        _size += series.nbytes
+        while _size > limit:
+            _, evicted = _entries.popitem(last=False)
+            _size -= evicted.nbytes
+
+
+def client_series(client, platforms):
+    """Return {platform: Series} for client, loading stale or missing entries."""
+    found, missing = {}, []
+    with _lock:
+        for platform in platforms:
+            series = _entries.get((client.pk, platform))
+            if series is not None and series.version == client.data_version:
+                _entries.move_to_end((client.pk, platform))
+                found[platform] = series
+            else:
+                missing.append(platform)
+    if missing:
+        logger.debug(f"Hot tier loading {missing} for client {client.pk}")
+        for platform, series in _load(client, missing).items():
+            _store((client.pk, platform), series)
+            found[platform] = series
+    return {platform: found[platform] for platform in platforms}
+
+
+def clear():
+    """Drop every entry of this process."""
+    global _size
+    with _lock:
+        _entries.clear()
+        _size = 0
+
+
+def stats():
+    with _lock:
+        return {'entries': len(_entries), 'bytes': _size, 'max_bytes': max_bytes()}
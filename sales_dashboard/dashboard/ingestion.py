@@ -0,0 +1,286 @@
+"""
+Chunked ingestion of uploaded platform exports.
+
+Files are read in fixed-size chunks so that at most UPLOAD_CHUNK_SIZE rows
+are held at a time regardless of how large the export is. Each chunk is
+normalized and summed into the upload's (date, campaign) facts, which take
+memory per distinct day and campaign rather than per row, and is set
+aside in a scratch file. The facts that differ from the stored ones (see
+dedup) are then written to the DailyMetric fact table, and the rows behind
+them to the raw snapshot archive (see snapshot_store).
+
+Excel workbooks may hold one sheet per platform: every sheet is routed to
+the store matching its header signature, and sheets are parsed in parallel
+(see workbook).
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .cleaning import empty_report, merge_reports
+from .dedup import new_rows, store_new_facts
+from .facts import facts_frame, merge_facts
+from .models import PLATFORM_DATA_MODELS, UnifiedClientData
+from .profiling import empty_profile, finalize_profile, merge_profiles
+from .schema import detect_platform, normalize_frame
+from .snapshot_store import archive_snapshot
+from .summary import locked_summary
+from .workbook import iter_excel_chunks, iter_parsed_sheets
+
+logger = logging.getLogger(__name__)
+
+CSV_EXTENSIONS = ('.csv',)
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+SUPPORTED_EXTENSIONS = CSV_EXTENSIONS + EXCEL_EXTENSIONS
+
+KPI_COLUMNS = ['impressions', 'clicks', 'spend', 'revenue']
+
+
+def get_chunk_size():
+    """Number of rows read, normalized and written per chunk."""
+    return int(getattr(settings, 'UPLOAD_CHUNK_SIZE', 50000))
+
+
+def iter_csv_chunks(fileobj, chunk_size):
+    """Yield DataFrames of at most chunk_size rows from a CSV file."""
+    reader = pd.read_csv(fileobj, chunksize=chunk_size, skip_blank_lines=True)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def get_sheet_workers():
+    """Number of worker processes used to parse the sheets of a workbook."""
+    default = min(4, os.cpu_count() or 1)
+    return int(getattr(settings, 'UPLOAD_SHEET_WORKERS', default))
+
+
+def file_extension(filename):
+    """Return the lower-cased extension of filename, or raise ValueError."""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(
+            f"Unsupported file type '{extension}'. "
+            f"Upload one of: {', '.join(SUPPORTED_EXTENSIONS)}"
+        )
+    return extension
+
+
+def iter_upload_chunks(fileobj, filename, chunk_size=None):
+    """Dispatch to the chunked reader matching the file extension."""
+    chunk_size = chunk_size or get_chunk_size()
+    if file_extension(filename) in CSV_EXTENSIONS:
+        return iter_csv_chunks(fileobj, chunk_size)
+    return iter_excel_chunks(fileobj, chunk_size)
+
+
+def iter_csv_batches(fileobj, platform, chunk_size, report, profiles):
+    """Yield (platform, normalized chunk) pairs from a CSV export.
+
+    Without a platform, it is detected from the CSV header. The data
+    profile is collected in profiles under the platform.
+    """
+    for chunk in iter_csv_chunks(fileobj, chunk_size):
+        if platform is None:
+            platform = detect_platform(chunk.columns)
+            if platform is None:
+                raise ValueError(
+                    "Could not detect the platform from the file headers. "
+                    "Please select the platform of this export."
+                )
+        profile = profiles.setdefault(platform, empty_profile())
+        yield platform, normalize_chunk(chunk, platform, report, profile)
+
+
+def iter_workbook_batches(fileobj, extension, platform, chunk_size, report,
+                          profiles, sheets):
+    """Yield (platform, normalized chunk) pairs from every sheet of a workbook.
+
+    Each sheet's platform is detected from its header, falling back to
+    platform. Sheet profiles are merged into profiles per platform and
+    per-sheet outcomes are recorded in sheets.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, f'workbook{extension}')
+        with open(path, 'wb') as copy:
+            shutil.copyfileobj(fileobj, copy)
+        parsed_sheets = iter_parsed_sheets(
+            path, chunk_size, scratch, platform, get_sheet_workers()
+        )
+        for parsed in parsed_sheets:
+            merge_reports(report, parsed['cleaning'])
+            sheets[parsed['sheet']] = {
+                'platform': parsed['platform'],
+                'records': parsed['rows'],
+            }
+            if parsed['platform'] is None:
+                logger.warning(
+                    f"Skipped sheet '{parsed['sheet']}': unrecognized headers"
+                )
+            else:
+                merge_profiles(
+                    profiles.setdefault(parsed['platform'], empty_profile()),
+                    parsed['profile']
+                )
+            for part in parsed['parts']:
+                chunk = pd.read_pickle(part)
+                os.remove(part)
+                yield parsed['platform'], chunk
+
+
+def normalize_chunk(chunk, platform, report=None, profile=None):
+    """Map one chunk onto the canonical platform schema."""
+    return normalize_frame(chunk.dropna(how='all'), platform, report, profile)
+
+
+def summarize_chunk(chunk, summary):
+    """Fold the KPI totals and date range of a normalized chunk into summary."""
+    for column in KPI_COLUMNS:
+        summary['kpis'][column] += float(chunk[column].sum())
+    dates = chunk['date'].dropna()
+    if not dates.empty:
+        start, end = dates.min(), dates.max()
+        if summary['date_start'] is None or start < summary['date_start']:
+            summary['date_start'] = start
+        if summary['date_end'] is None or end > summary['date_end']:
+            summary['date_end'] = end
+
+
+def store_upload_rows(client, platform, facts, parts, summary):
+    """Store the new facts of one platform of an upload and archive their rows.
+
+    facts are the merged facts of the whole upload and parts the pickled
+    normalized chunks. The KPIs of the stored rows are folded into summary.
+    Returns the number of uploaded rows stored.
+    """
+    stored_rows = 0
+    # A failed upload leaves no fingerprints behind, so a retry stores it
+    with locked_summary(client):
+        new_facts = store_new_facts(client, platform, facts)
+        for part in parts:
+            chunk = new_rows(client, platform, pd.read_pickle(part), new_facts)
+            if chunk.empty:
+                continue
+            archive_snapshot(client, platform, chunk)
+            summarize_chunk(chunk, summary)
+            stored_rows += len(chunk)
+    return stored_rows
+
+
+def ingest_upload(upload, fileobj, platform=None, chunk_size=None):
+    """Stream an uploaded export into the platform data stores.
+
+    platform may be None to detect it from the headers; for workbooks it is
+    only the fallback for sheets whose headers match no platform.
+
+    The chunks are read, normalized and summed into facts first; then the
+    new facts of each platform are stored and their rows archived.
+    Progress is recorded on the UnifiedClientData row so the status can be
+    polled while the upload is still running: rows_parsed is updated after
+    each chunk is read, and total_records is incremented as each platform
+    is stored.
+    """
+    if platform is not None and platform not in PLATFORM_DATA_MODELS:
+        raise ValueError(f"Unknown platform '{platform}'")
+
+    UnifiedClientData.objects.filter(pk=upload.pk).update(
+        status='processing',
+        total_records=0,
+        rows_parsed=0,
+        error_message='',
+        platforms_included=[platform] if platform else [],
+        processing_started_at=timezone.now(),
+        processing_completed_at=None,
+    )
+    chunk_size = chunk_size or get_chunk_size()
+    summary = {
+        'kpis': {column: 0.0 for column in KPI_COLUMNS},
+        'date_start': None,
+        'date_end': None,
+        'cleaning': empty_report(),
+    }
+    profiles = {}
+    sheets = {}
+    platforms = []
+    rows_read = 0
+    total_records = 0
+    try:
+        extension = file_extension(upload.file_name)
+        if extension in CSV_EXTENSIONS:
+            batches = iter_csv_batches(
+                fileobj, platform, chunk_size, summary['cleaning'], profiles
+            )
+        else:
+            batches = iter_workbook_batches(
+                fileobj, extension, platform, chunk_size, summary['cleaning'],
+                profiles, sheets
+            )
+        with tempfile.TemporaryDirectory() as scratch:
+            # Facts are summed over the whole upload before any is stored, so
+            # rows of one day and campaign add up whichever chunks they are in
+            facts, parts = {}, {}
+            for chunk_platform, chunk in batches:
+                if chunk_platform not in platforms:
+                    platforms.append(chunk_platform)
+                if chunk.empty:
+                    continue
+                rows_read += len(chunk)
+                UnifiedClientData.objects.filter(pk=upload.pk).update(rows_parsed=rows_read)
+                chunk_facts = facts_frame(chunk)
+                if chunk_platform in facts:
+                    chunk_facts = merge_facts(facts[chunk_platform], chunk_facts)
+                facts[chunk_platform] = chunk_facts
+                part = os.path.join(scratch, f'part{rows_read}.pkl')
+                chunk.to_pickle(part)
+                parts.setdefault(chunk_platform, []).append(part)
+            for chunk_platform in parts:
+                stored = store_upload_rows(
+                    upload.client, chunk_platform, facts[chunk_platform],
+                    parts[chunk_platform], summary
+                )
+                total_records += stored
+                UnifiedClientData.objects.filter(pk=upload.pk).update(
+                    total_records=F('total_records') + stored
+                )
+    except Exception as e:
+        logger.error(f"Upload {upload.pk} failed after {total_records} rows: {e}")
+        UnifiedClientData.objects.filter(pk=upload.pk).update(
+            status='failed',
+            error_message=str(e),
+            processing_completed_at=timezone.now(),
+        )
+        raise
+
+    duplicates = rows_read - total_records
+    data_summary = {
+        **summary['kpis'],
+        'duplicates_skipped': duplicates,
+        'cleaning': summary['cleaning'],
+    }
+    if sheets:
+        data_summary['sheets'] = sheets
+    UnifiedClientData.objects.filter(pk=upload.pk).update(
+        status='synced',
+        total_records=total_records,
+        platforms_included=platforms,
+        date_range_start=summary['date_start'],
+        date_range_end=summary['date_end'],
+        data_summary=data_summary,
+        data_profile={
+            key: finalize_profile(profile) for key, profile in profiles.items()
+        },
+        processing_completed_at=timezone.now(),
+    )
+    upload.refresh_from_db()
+    logger.info(
+        f"Ingested {total_records} rows ({', '.join(platforms) or 'no platform'}) "
+        f"for upload {upload.pk} ({duplicates} duplicates skipped)"
+    )
+    return total_records
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.facts import upsert_daily_metrics
+from dashboard.models import Client, ParquetSnapshot, PLATFORM_DATA_MODELS
+from dashboard.schema import normalize_frame, snapshots_frame
+from dashboard.sharding import client_shard
+from dashboard.snapshot_store import PARQUET_AVAILABLE, read_parquet_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Fill the DailyMetric fact table from the archived raw snapshots.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client-id', type=int, help='Only backfill this client')
+
+    def handle(self, *args, **options):
+        clients = Client.objects.all()
+        if options.get('client_id'):
+            clients = clients.filter(id=options['client_id'])
+
+        for client in clients:
+            with client_shard(client):
+                total = self._backfill(client)
+            self.stdout.write(self.style.SUCCESS(
+                f'{client}: wrote {total} daily metric rows'
+            ))
+
+    def _backfill(self, client):
+        total = 0
+        for platform, model in PLATFORM_DATA_MODELS.items():
+            # Oldest first, so later fetches of the same day win
+            snapshots = model.objects.filter(client=client).order_by('fetched_at')
+            for snapshot in snapshots.iterator():
+                frame = snapshots_frame([snapshot], platform)
+                total += upsert_daily_metrics(client, platform, frame)
+            if not PARQUET_AVAILABLE:
+                continue
+            pointers = ParquetSnapshot.objects.filter(
+                client=client, platform=platform
+            ).order_by('fetched_at')
+            for pointer in pointers.iterator():
+                frame = normalize_frame(read_parquet_snapshots([pointer]), platform)
+                total += upsert_daily_metrics(client, platform, frame)
+        return total
@@ -0,0 +1,82 @@
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.analytics import STAT_METRICS, advanced_analytics, records_advanced_analytics
+from dashboard.hot_tier import Series, day_number
+from dashboard.models import PLATFORM_DATA_MODELS
+from dashboard.schema import frame_to_records
+
+
+def synthetic_series(rows, today, seed=0):
+    """{platform: Series} with rows random daily metrics over two years."""
+    rng = np.random.default_rng(seed)
+    platforms = list(PLATFORM_DATA_MODELS)
+    campaigns = tuple(f'Campaign {number}' for number in range(50))
+    series = {}
+    for platform, count in zip(platforms, np.array_split(np.arange(rows), len(platforms))):
+        size = len(count)
+        series[platform] = Series(
+            platform,
+            np.sort(rng.integers(today - 730, today + 1, size).astype(np.int32)),
+            rng.integers(0, len(campaigns), size).astype(np.int32),
+            campaigns,
+            {name: rng.gamma(2.0, 50.0, size) for name in STAT_METRICS},
+        )
+    return series
+
+
+def _timed(function, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        started = perf_counter()
+        result = function()
+        elapsed = perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _same(reference, columnar):
+    if [i['description'] for i in reference['insights']] != [i['description'] for i in columnar['insights']]:
+        return False
+    for platform, expected in reference['platform_stats'].items():
+        actual = columnar['platform_stats'][platform]
+        if expected['dates'] != actual['dates']:
+            return False
+        for name in STAT_METRICS + ['roi', 'ctr']:
+            if not np.isclose(expected[name], actual[name], rtol=1e-9):
+                return False
+    return reference['record_count'] == columnar['record_count']
+
+
+class Command(BaseCommand):
+    help = 'Time the columnar advanced analytics against the record-at-a-time implementation.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+        parser.add_argument('--repeat', type=int, default=3, help='Best of this many runs')
+
+    def handle(self, *args, **options):
+        today = day_number(pd.Timestamp.today().date())
+        for rows in options['rows']:
+            series = synthetic_series(rows, today)
+            kpis = {k: sum(s.total(k) for s in series.values()) for k in ('impressions', 'clicks', 'spend', 'revenue')}
+
+            def reference():
+                # What the view did before: build every record, then loop over them
+                frame = pd.concat([s.frame() for s in series.values()], ignore_index=True)
+                return records_advanced_analytics(frame_to_records(frame), kpis, today)
+
+            reference_time, expected = _timed(reference, options['repeat'])
+            columnar_time, actual = _timed(
+                lambda: advanced_analytics(series, kpis, today), options['repeat']
+            )
+            if not _same(expected, actual):
+                raise CommandError(f'Results differ at {rows} rows')
+            self.stdout.write(self.style.SUCCESS(
+                f'{rows:>9} rows: records {reference_time * 1000:9.1f} ms, '
+                f'columnar {columnar_time * 1000:8.1f} ms, '
+                f'{reference_time / columnar_time:6.1f}x faster'
+            ))
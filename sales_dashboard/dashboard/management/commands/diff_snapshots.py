@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.models import Client, PLATFORM_DATA_MODELS
+from dashboard.sharding import client_shard
+from dashboard.snapshot_store import diff_frames, load_snapshot_frame, snapshot_history
+
+
+class Command(BaseCommand):
+    help = 'Compare two archived fetches of one platform (by default the latest two).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client-id', type=int, required=True)
+        parser.add_argument('--platform', required=True, choices=sorted(PLATFORM_DATA_MODELS))
+        parser.add_argument('--newer', type=int, default=0,
+                            help='Position of the newer fetch in the history, 0 is the latest')
+        parser.add_argument('--older', type=int, default=1,
+                            help='Position of the older fetch in the history')
+
+    def handle(self, *args, **options):
+        try:
+            client = Client.objects.get(id=options['client_id'])
+        except Client.DoesNotExist:
+            raise CommandError(f"Client {options['client_id']} does not exist")
+        with client_shard(client):
+            self._diff(client, options)
+
+    def _diff(self, client, options):
+        platform = options['platform']
+        history = snapshot_history(client, platform)
+        if max(options['newer'], options['older']) >= len(history):
+            raise CommandError(f'{client} has only {len(history)} {platform} snapshots')
+
+        older = history[options['older']]
+        newer = history[options['newer']]
+        diff = diff_frames(
+            load_snapshot_frame(client, platform, older[0], older[1]),
+            load_snapshot_frame(client, platform, newer[0], newer[1]),
+        )
+        self.stdout.write(f'{platform} fetch of {older[2]} -> fetch of {newer[2]}')
+        for kind, rows in diff.items():
+            self.stdout.write(self.style.SUCCESS(f'{kind}: {len(rows)} rows'))
+            if not rows.empty:
+                self.stdout.write(rows.to_string(index=False))
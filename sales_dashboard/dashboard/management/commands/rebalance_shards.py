@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.models import Client
+from dashboard.sharding import (
+    ShardMoveInProgress, move_client, plan_rebalance, shard_aliases, shard_client_counts,
+    shard_for_client,
+)
+
+
+class Command(BaseCommand):
+    help = 'Move clients between shards, either one client or enough to even out the shards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client-id', type=int, help='Move only this client')
+        parser.add_argument('--to', help='Target shard of --client-id')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Print the planned moves without moving anything')
+
+    def handle(self, *args, **options):
+        if len(shard_aliases()) < 2:
+            raise CommandError('Sharding is not configured (SHARD_DATABASE_ALIASES)')
+
+        if options.get('client_id'):
+            if not options.get('to'):
+                raise CommandError('--client-id needs --to')
+            if not Client.objects.filter(id=options['client_id']).exists():
+                raise CommandError(f"Client {options['client_id']} does not exist")
+            moves = [(options['client_id'], shard_for_client(options['client_id']), options['to'])]
+        else:
+            moves = plan_rebalance()
+
+        for alias, count in shard_client_counts().items():
+            self.stdout.write(f'{alias}: {count} clients')
+        for client_id, source, target in moves:
+            self.stdout.write(f'client {client_id}: {source} -> {target}')
+            if options['dry_run']:
+                continue
+            try:
+                copied = move_client(client_id, target)
+            except (ShardMoveInProgress, ValueError) as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f'  moved, {copied} rows copied'))
+        if not moves:
+            self.stdout.write(self.style.SUCCESS('Shards are balanced'))
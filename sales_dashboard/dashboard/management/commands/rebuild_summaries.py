@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.models import Client
+from dashboard.rollups import rebuild_rollups
+from dashboard.sharding import client_shard
+from dashboard.tasks import aggregate_unified_data_for_client
+
+
+class Command(BaseCommand):
+    help = 'Recompute the UnifiedClientData summaries, rollups and monthly summaries from all daily metrics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client-id', type=int, help='Only rebuild this client')
+
+    def handle(self, *args, **options):
+        clients = Client.objects.all()
+        if options.get('client_id'):
+            clients = clients.filter(id=options['client_id'])
+
+        for client in clients:
+            summary = aggregate_unified_data_for_client(client)
+            with client_shard(client):
+                months = rebuild_rollups(client)
+            self.stdout.write(self.style.SUCCESS(
+                f'{client}: {summary.total_records} records summarized over {months} months'
+            ))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_unifiedclientdata'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='unifiedclientdata',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='unifiedclientdata',
+            name='file_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='unifiedclientdata',
+            name='source',
+            field=models.CharField(choices=[('sync', 'Platform Sync'), ('upload', 'File Upload')], default='sync', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ChatbotFeedback',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.TextField()),
+                ('answer', models.TextField()),
+                ('context', models.TextField()),
+                ('rating', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_unifiedclientdata_upload_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('row_hash', models.BigIntegerField()),
+                ('batch', models.CharField(db_index=True, max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='record_fingerprints', to='dashboard.client')),
+            ],
+            options={
+                'unique_together': {('client', 'platform', 'row_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_recordfingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unifiedclientdata',
+            name='source_file',
+            field=models.FileField(blank=True, null=True, upload_to='uploads/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_unifiedclientdata_source_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unifiedclientdata',
+            name='data_profile',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0011_unifiedclientdata_data_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkedUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=255)),
+                ('platform', models.CharField(blank=True, choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('total_parts', models.PositiveIntegerField()),
+                ('received_parts', models.PositiveIntegerField(default=0)),
+                ('bytes_received', models.BigIntegerField(default=0)),
+                ('part_checksums', models.JSONField(default=list)),
+                ('checksum', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('receiving', 'Receiving'), ('complete', 'Complete'), ('failed', 'Failed')], default='receiving', max_length=20)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunked_uploads', to='dashboard.client')),
+                ('upload', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='chunked_upload', to='dashboard.unifiedclientdata')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
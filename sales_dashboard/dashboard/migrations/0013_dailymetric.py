@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0012_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('date', models.DateField()),
+                ('campaign', models.CharField(blank=True, default='', max_length=255)),
+                ('impressions', models.FloatField(default=0)),
+                ('clicks', models.FloatField(default=0)),
+                ('spend', models.FloatField(default=0)),
+                ('conversions', models.FloatField(default=0)),
+                ('revenue', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to='dashboard.client')),
+            ],
+            options={
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['client', 'date'], name='dailymetric_client_date')],
+                'unique_together': {('client', 'platform', 'date', 'campaign')},
+            },
+        ),
+    ]
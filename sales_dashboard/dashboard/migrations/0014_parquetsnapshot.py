@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0013_dailymetric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParquetSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('fetched_at', models.DateTimeField()),
+                ('path', models.CharField(max_length=500)),
+                ('row_count', models.IntegerField(default=0)),
+                ('size_bytes', models.BigIntegerField(default=0)),
+                ('columns', models.JSONField(default=list)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parquet_snapshots', to='dashboard.client')),
+            ],
+            options={
+                'ordering': ['-fetched_at'],
+                'indexes': [models.Index(fields=['client', 'platform', 'fetched_at'], name='parquetsnap_client_platform')],
+            },
+        ),
+    ]
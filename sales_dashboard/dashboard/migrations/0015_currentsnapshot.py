@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0014_parquetsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrentSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('store', models.CharField(choices=[('db', 'Database'), ('parquet', 'Parquet')], default='db', max_length=10)),
+                ('snapshot_id', models.BigIntegerField()),
+                ('fetched_at', models.DateTimeField()),
+                ('row_count', models.IntegerField(default=0)),
+                ('checked_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='current_snapshots', to='dashboard.client')),
+            ],
+            options={
+                'unique_together': {('client', 'platform')},
+            },
+        ),
+    ]
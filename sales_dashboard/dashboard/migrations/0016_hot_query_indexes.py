@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0015_currentsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['client', 'platform', 'status', 'start_date'], name='campaign_client_filters'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['client', 'created_at'], name='campaign_client_created'),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['client', 'start_date'], name='campaign_client_active'),
+        ),
+        migrations.AddIndex(
+            model_name='campaignreport',
+            index=models.Index(fields=['campaign', 'generated_at'], name='report_campaign_generated'),
+        ),
+        migrations.AddIndex(
+            model_name='demandbasedata',
+            index=models.Index(fields=['client', 'fetched_at'], name='demandbasedata_client_fetched'),
+        ),
+        migrations.AddIndex(
+            model_name='googleadsdata',
+            index=models.Index(fields=['client', 'fetched_at'], name='googleadsdata_client_fetched'),
+        ),
+        migrations.AddIndex(
+            model_name='linkedinadsdata',
+            index=models.Index(fields=['client', 'fetched_at'], name='linkedinadsdata_client_fetched'),
+        ),
+        migrations.AddIndex(
+            model_name='mailchimpdata',
+            index=models.Index(fields=['client', 'fetched_at'], name='mailchimpdata_client_fetched'),
+        ),
+        migrations.AddIndex(
+            model_name='mlprediction',
+            index=models.Index(fields=['campaign', 'created_at'], name='mlprediction_campaign_created'),
+        ),
+        migrations.AddIndex(
+            model_name='mlprediction',
+            index=models.Index(fields=['client', 'created_at'], name='mlprediction_client_created'),
+        ),
+        migrations.AddIndex(
+            model_name='zohodata',
+            index=models.Index(fields=['client', 'fetched_at'], name='zohodata_client_fetched'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+"""
+Move the raw snapshot payloads and MonthlySummary.platform_data to
+CompressedJSONField.
+
+Changing a JSON column's type in place is not portable (Postgres has no
+jsonb -> bytea cast), so each column is renamed, a compressed column is
+added next to it, the rows are copied over in primary-key batches and the
+old column is dropped.
+"""
+
+from django.db import migrations, models
+
+import dashboard.fields
+
+BATCH_SIZE = 500
+
+COMPRESSED_FIELDS = [
+    ('googleadsdata', 'data', {}),
+    ('mailchimpdata', 'data', {}),
+    ('linkedinadsdata', 'data', {}),
+    ('zohodata', 'data', {}),
+    ('demandbasedata', 'data', {}),
+    ('monthlysummary', 'platform_data', {'default': dict}),
+]
+
+
+def _copy(apps, schema_editor, source, target):
+    db_alias = schema_editor.connection.alias
+    for model_name, field, _ in COMPRESSED_FIELDS:
+        model = apps.get_model('dashboard', model_name)
+        last_pk = 0
+        while True:
+            rows = list(
+                model.objects.using(db_alias).filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', f'{field}{source}')[:BATCH_SIZE]
+            )
+            if not rows:
+                break
+            for pk, value in rows:
+                value = dashboard.fields.load_json(value)
+                model.objects.using(db_alias).filter(pk=pk).update(**{f'{field}{target}': value})
+            last_pk = rows[-1][0]
+
+
+def compress(apps, schema_editor):
+    _copy(apps, schema_editor, '_json', '')
+
+
+def decompress(apps, schema_editor):
+    _copy(apps, schema_editor, '', '_json')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0017_retention'),
+    ]
+
+    operations = [
+        op
+        for model_name, field, _ in COMPRESSED_FIELDS
+        for op in (
+            migrations.RenameField(model_name, field, f'{field}_json'),
+            migrations.AlterField(model_name, f'{field}_json', models.JSONField(null=True)),
+            migrations.AddField(
+                model_name, field, dashboard.fields.CompressedJSONField(null=True)
+            ),
+        )
+    ] + [
+        migrations.RunPython(compress, decompress),
+    ] + [
+        op
+        for model_name, field, options in COMPRESSED_FIELDS
+        for op in (
+            migrations.RemoveField(model_name, f'{field}_json'),
+            migrations.AlterField(
+                model_name, field, dashboard.fields.CompressedJSONField(**options)
+            ),
+        )
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0019_shardassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
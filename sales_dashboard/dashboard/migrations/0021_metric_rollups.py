@@ -0,0 +1,80 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0020_client_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('period_start', models.DateField()),
+                ('rows', models.IntegerField(default=0)),
+                ('campaigns', models.IntegerField(default=0)),
+                ('impressions', models.FloatField(default=0)),
+                ('clicks', models.FloatField(default=0)),
+                ('spend', models.FloatField(default=0)),
+                ('conversions', models.FloatField(default=0)),
+                ('revenue', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='dashboard.client')),
+            ],
+            options={
+                'ordering': ['period_start'],
+                'abstract': False,
+                'unique_together': {('client', 'platform', 'period_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('period_start', models.DateField()),
+                ('rows', models.IntegerField(default=0)),
+                ('campaigns', models.IntegerField(default=0)),
+                ('impressions', models.FloatField(default=0)),
+                ('clicks', models.FloatField(default=0)),
+                ('spend', models.FloatField(default=0)),
+                ('conversions', models.FloatField(default=0)),
+                ('revenue', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='dashboard.client')),
+            ],
+            options={
+                'ordering': ['period_start'],
+                'abstract': False,
+                'unique_together': {('client', 'platform', 'period_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(choices=[('mailchimp', 'Mailchimp'), ('zoho', 'Zoho'), ('demandbase', 'Demandbase'), ('google_ads', 'Google Ads'), ('linkedin_ads', 'LinkedIn Ads')], max_length=20)),
+                ('period_start', models.DateField()),
+                ('rows', models.IntegerField(default=0)),
+                ('campaigns', models.IntegerField(default=0)),
+                ('impressions', models.FloatField(default=0)),
+                ('clicks', models.FloatField(default=0)),
+                ('spend', models.FloatField(default=0)),
+                ('conversions', models.FloatField(default=0)),
+                ('revenue', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='dashboard.client')),
+            ],
+            options={
+                'ordering': ['period_start'],
+                'abstract': False,
+                'unique_together': {('client', 'platform', 'period_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0021_metric_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unifiedclientdata',
+            name='rows_parsed',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from .fields import CompressedJSONField
+
 
 class Client(models.Model):
     """Client model for managing different clients"""
@@ -12,6 +14,8 @@ class Client(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Bumped whenever the client's daily metrics change; caches compare it
+    data_version = models.PositiveBigIntegerField(default=0)
 
     def __str__(self):
         return f"{self.name} - {self.company}"
@@ -73,6 +77,19 @@ class Campaign(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['client', 'platform', 'status', 'start_date'],
+                name='campaign_client_filters'
+            ),
+            models.Index(fields=['client', 'created_at'], name='campaign_client_created'),
+            # The dashboard counts and lists active campaigns on every load
+            models.Index(
+                fields=['client', 'start_date'],
+                name='campaign_client_active',
+                condition=models.Q(status='active')
+            ),
+        ]
 
 
 class CampaignReport(models.Model):
@@ -145,6 +162,9 @@ class CampaignReport(models.Model):
 
     class Meta:
         ordering = ['-generated_at']
+        indexes = [
+            models.Index(fields=['campaign', 'generated_at'], name='report_campaign_generated'),
+        ]
 
 
 class UserProfile(models.Model):
@@ -196,7 +216,7 @@ class MonthlySummary(models.Model):
     avg_cpm = models.DecimalField(max_digits=10, decimal_places=2, default=0)
 
     # Platform Breakdown
-    platform_data = models.JSONField(default=dict)
+    platform_data = CompressedJSONField(default=dict)
 
     # ML Insights
     ml_insights = models.JSONField(default=dict)
@@ -262,6 +282,10 @@ class MLPrediction(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['campaign', 'created_at'], name='mlprediction_campaign_created'),
+            models.Index(fields=['client', 'created_at'], name='mlprediction_client_created'),
+        ]
 
 
 class FutureForecast(models.Model):
@@ -434,62 +458,97 @@ class GoogleAdsData(models.Model):
     client = models.ForeignKey(
         Client, on_delete=models.CASCADE, related_name='google_ads_data'
     )
-    data = models.JSONField()
+    data = CompressedJSONField()
     fetched_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.client} - Google Ads Data"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['client', 'fetched_at'], name='googleadsdata_client_fetched'),
+        ]
+
 
 class MailchimpData(models.Model):
     client = models.ForeignKey(
         Client, on_delete=models.CASCADE, related_name='mailchimp_data'
     )
-    data = models.JSONField()
+    data = CompressedJSONField()
     fetched_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.client} - Mailchimp Data"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['client', 'fetched_at'], name='mailchimpdata_client_fetched'),
+        ]
+
 
 class LinkedInAdsData(models.Model):
     client = models.ForeignKey(
         Client, on_delete=models.CASCADE, related_name='linkedin_ads_data'
     )
-    data = models.JSONField()
+    data = CompressedJSONField()
     fetched_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.client} - LinkedIn Ads Data"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['client', 'fetched_at'], name='linkedinadsdata_client_fetched'),
+        ]
+
 
 class ZohoData(models.Model):
     client = models.ForeignKey(
         Client, on_delete=models.CASCADE, related_name='zoho_data'
     )
-    data = models.JSONField()
+    data = CompressedJSONField()
     fetched_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.client} - Zoho Data"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['client', 'fetched_at'], name='zohodata_client_fetched'),
+        ]
+
 
 class DemandbaseData(models.Model):
     client = models.ForeignKey(
         Client, on_delete=models.CASCADE, related_name='demandbase_data'
     )
-    data = models.JSONField()
+    data = CompressedJSONField()
     fetched_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"{self.client} - Demandbase Data"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['client', 'fetched_at'], name='demandbasedata_client_fetched'),
+        ]
+
 
 class UnifiedClientData(models.Model):
     """Aggregated unified data summary for each client"""
+    SOURCE_CHOICES = [
+        ('sync', 'Platform Sync'),
+        ('upload', 'File Upload'),
+    ]
+
     client = models.ForeignKey(
         Client, on_delete=models.CASCADE, related_name='unified_data'
     )
+    source = models.CharField(
+        max_length=10, choices=SOURCE_CHOICES, default='sync'
+    )
+    file_name = models.CharField(max_length=255, blank=True)
+    source_file = models.FileField(upload_to='uploads/', null=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(
         max_length=20,
@@ -501,10 +560,12 @@ class UnifiedClientData(models.Model):
         default='synced'
     )
     total_records = models.IntegerField(default=0)
+    rows_parsed = models.IntegerField(default=0)  # Upload rows read so far
     date_range_start = models.DateField(blank=True, null=True)
     date_range_end = models.DateField(blank=True, null=True)
     platforms_included = models.JSONField(default=list)
     data_summary = models.JSONField(default=dict)  # KPIs, totals, etc.
+    data_profile = models.JSONField(default=dict)  # Per-platform column quality stats
     error_message = models.TextField(blank=True)
     processing_started_at = models.DateTimeField(blank=True, null=True)
     processing_completed_at = models.DateTimeField(blank=True, null=True)
@@ -514,7 +575,242 @@ class UnifiedClientData(models.Model):
 
     class Meta:
         ordering = ['-uploaded_at']
-        unique_together = ['client', 'date_range_start', 'date_range_end']
+
+
+class ChunkedUpload(models.Model):
+    """Resumable upload of a large export, received as numbered parts"""
+    STATUS_CHOICES = [
+        ('receiving', 'Receiving'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name='chunked_uploads'
+    )
+    file_name = models.CharField(max_length=255)
+    platform = models.CharField(
+        max_length=20, choices=Campaign.PLATFORM_CHOICES, blank=True
+    )
+    total_parts = models.PositiveIntegerField()
+    received_parts = models.PositiveIntegerField(default=0)
+    bytes_received = models.BigIntegerField(default=0)
+    part_checksums = models.JSONField(default=list)
+    checksum = models.CharField(max_length=64)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='receiving'
+    )
+    error_message = models.TextField(blank=True)
+    upload = models.OneToOneField(
+        UnifiedClientData, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='chunked_upload'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.client} - {self.file_name} ({self.received_parts}/{self.total_parts})"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class RecordFingerprint(models.Model):
+    """Content hash of a stored row without a date, used to skip duplicates"""
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name='record_fingerprints'
+    )
+    platform = models.CharField(max_length=20, choices=Campaign.PLATFORM_CHOICES)
+    row_hash = models.BigIntegerField()
+    batch = models.CharField(max_length=32, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.client} - {self.platform} - {self.row_hash}"
+
+    class Meta:
+        unique_together = ['client', 'platform', 'row_hash']
+
+
+class ParquetSnapshot(models.Model):
+    """Pointer to a raw fetch or upload chunk stored as a Parquet file"""
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name='parquet_snapshots'
+    )
+    platform = models.CharField(max_length=20, choices=Campaign.PLATFORM_CHOICES)
+    fetched_at = models.DateTimeField()
+    path = models.CharField(max_length=500)
+    row_count = models.IntegerField(default=0)
+    size_bytes = models.BigIntegerField(default=0)
+    columns = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"{self.client} - {self.platform} - {self.fetched_at}"
+
+    class Meta:
+        ordering = ['-fetched_at']
+        indexes = [
+            models.Index(
+                fields=['client', 'platform', 'fetched_at'],
+                name='parquetsnap_client_platform'
+            ),
+        ]
+
+
+class CurrentSnapshot(models.Model):
+    """Pointer to the latest archived sync fetch per client and platform"""
+    STORE_CHOICES = [
+        ('db', 'Database'),
+        ('parquet', 'Parquet'),
+    ]
+
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name='current_snapshots'
+    )
+    platform = models.CharField(max_length=20, choices=Campaign.PLATFORM_CHOICES)
+    store = models.CharField(max_length=10, choices=STORE_CHOICES, default='db')
+    snapshot_id = models.BigIntegerField()
+    fetched_at = models.DateTimeField()
+    row_count = models.IntegerField(default=0)
+    checked_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.client} - {self.platform} - {self.fetched_at}"
+
+    class Meta:
+        unique_together = ['client', 'platform']
+
+
+class RetentionPolicy(models.Model):
+    """How long one client's raw snapshots are kept, for one or all platforms"""
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name='retention_policies'
+    )
+    platform = models.CharField(
+        max_length=20, choices=Campaign.PLATFORM_CHOICES, blank=True,
+        help_text='Leave blank to apply to every platform'
+    )
+    days = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.client} - {self.platform or 'all platforms'} - {self.days} days"
+
+    class Meta:
+        unique_together = ['client', 'platform']
+
+
+class RetentionRun(models.Model):
+    """Progress and totals of one run of the snapshot retention engine"""
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('complete', 'Complete'),
+        ('failed', 'Failed'),
+    ]
+
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default='running'
+    )
+    current_platform = models.CharField(max_length=20, blank=True)
+    batches = models.IntegerField(default=0)
+    rows_archived = models.IntegerField(default=0)
+    rows_deleted = models.IntegerField(default=0)
+    bytes_archived = models.BigIntegerField(default=0)
+    error_message = models.TextField(blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Retention run {self.pk} - {self.status}"
+
+    class Meta:
+        ordering = ['-started_at']
+
+
+class ShardAssignment(models.Model):
+    """Directory entry placing one client's data on a shard database"""
+    client = models.OneToOneField(
+        Client, on_delete=models.CASCADE, related_name='shard_assignment'
+    )
+    alias = models.CharField(max_length=50)
+    # Set while the client is being moved; its writes wait until cleared
+    locked = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.client} - {self.alias}"
+
+
+class DailyMetric(models.Model):
+    """Daily metrics per client, platform and campaign, filled by sync and upload"""
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name='daily_metrics'
+    )
+    platform = models.CharField(max_length=20, choices=Campaign.PLATFORM_CHOICES)
+    date = models.DateField()
+    campaign = models.CharField(max_length=255, blank=True, default='')
+    impressions = models.FloatField(default=0)
+    clicks = models.FloatField(default=0)
+    spend = models.FloatField(default=0)
+    conversions = models.FloatField(default=0)
+    revenue = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.client} - {self.platform} - {self.date} - {self.campaign}"
+
+    class Meta:
+        unique_together = ['client', 'platform', 'date', 'campaign']
+        indexes = [
+            models.Index(fields=['client', 'date'], name='dailymetric_client_date'),
+        ]
+        ordering = ['date']
+
+
+class MetricRollup(models.Model):
+    """Metric totals of one client and platform over a period, see dashboard.rollups"""
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name='%(class)ss'
+    )
+    platform = models.CharField(max_length=20, choices=Campaign.PLATFORM_CHOICES)
+    period_start = models.DateField()
+    rows = models.IntegerField(default=0)  # DailyMetric rows in the period
+    campaigns = models.IntegerField(default=0)  # Distinct campaigns in the period
+    impressions = models.FloatField(default=0)
+    clicks = models.FloatField(default=0)
+    spend = models.FloatField(default=0)
+    conversions = models.FloatField(default=0)
+    revenue = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.client} - {self.platform} - {self.period_start}"
+
+    class Meta:
+        abstract = True
+        unique_together = ['client', 'platform', 'period_start']
+        ordering = ['period_start']
+
+
+class DailyRollup(MetricRollup):
+    """Per-day totals"""
+
+
+class WeeklyRollup(MetricRollup):
+    """Per-week totals; weeks start on Monday"""
+
+
+class MonthlyRollup(MetricRollup):
+    """Per-month totals; MonthlySummary is derived from these"""
+
+
+# Raw data store for each connected platform, keyed like Campaign.platform
+PLATFORM_DATA_MODELS = {
+    'google_ads': GoogleAdsData,
+    'linkedin_ads': LinkedInAdsData,
+    'mailchimp': MailchimpData,
+    'zoho': ZohoData,
+    'demandbase': DemandbaseData,
+}
 
 
 class ChatbotFeedback(models.Model):
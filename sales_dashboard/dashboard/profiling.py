@@ -0,0 +1,118 @@
+"""
+Single-pass data quality profiling of ingested chunks.
+
+update_profile folds one normalized chunk into a running profile while it
+is being ingested, so the statistics cost one vectorized pass per chunk and
+never a second read of the upload. Profiles are mergeable (sheets parsed in
+worker processes are profiled there and merged afterwards), and
+finalize_profile turns one into the JSON stored on
+UnifiedClientData.data_profile.
+
+Per column the profile keeps null, parse-failure and outlier counts,
+numeric min/max and a distinct-count estimate from a K-minimum-values
+sketch of 64-bit value hashes. Outliers use Tukey fences (1.5 IQR beyond
+the quartiles) computed per chunk, which is exact for uploads smaller than
+UPLOAD_CHUNK_SIZE and a close approximation above it.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Number of minimum hashes kept per column for the distinct estimate
+SKETCH_SIZE = 1024
+# Tukey fence multiplier for outlier counts
+OUTLIER_IQR_FACTOR = 1.5
+
+
+def empty_profile():
+    """Return a profile with no rows."""
+    return {'rows': 0, 'columns': {}}
+
+
+def _empty_column():
+    return {
+        'nulls': 0,
+        'parse_failures': 0,
+        'outliers': 0,
+        'min': None,
+        'max': None,
+        'sketch': np.empty(0, dtype='uint64'),
+    }
+
+
+def _merge_sketch(sketch, hashes):
+    return np.union1d(sketch, hashes)[:SKETCH_SIZE]
+
+
+def _profile_values(stats, values):
+    present = values.dropna()
+    stats['nulls'] += len(values) - len(present)
+    if present.empty:
+        return
+    hashes = pd.util.hash_pandas_object(present, index=False).to_numpy()
+    stats['sketch'] = _merge_sketch(stats['sketch'], np.unique(hashes)[:SKETCH_SIZE])
+
+    if not pd.api.types.is_numeric_dtype(present) or pd.api.types.is_bool_dtype(present):
+        return
+    numbers = present.to_numpy(dtype='float64')
+    low, high = float(numbers.min()), float(numbers.max())
+    stats['min'] = low if stats['min'] is None else min(stats['min'], low)
+    stats['max'] = high if stats['max'] is None else max(stats['max'], high)
+    q1, q3 = np.percentile(numbers, [25, 75])
+    fence = OUTLIER_IQR_FACTOR * (q3 - q1)
+    stats['outliers'] += int(np.count_nonzero((numbers < q1 - fence) | (numbers > q3 + fence)))
+
+
+def update_profile(profile, frame, cleaning=None):
+    """Fold the columns of frame into profile (in place) and return it.
+
+    cleaning is the cleaning report of the same chunk; its per-column
+    rejected counts become the parse failures.
+    """
+    profile['rows'] += len(frame)
+    for column in frame.columns:
+        stats = profile['columns'].setdefault(column, _empty_column())
+        _profile_values(stats, frame[column])
+    if cleaning:
+        for column, counts in cleaning['columns'].items():
+            stats = profile['columns'].setdefault(column, _empty_column())
+            stats['parse_failures'] += counts['rejected']
+    return profile
+
+
+def merge_profiles(profile, other):
+    """Add the statistics of other into profile (in place) and return it."""
+    profile['rows'] += other['rows']
+    for column, theirs in other['columns'].items():
+        ours = profile['columns'].setdefault(column, _empty_column())
+        for key in ('nulls', 'parse_failures', 'outliers'):
+            ours[key] += theirs[key]
+        for key, pick in (('min', min), ('max', max)):
+            if theirs[key] is not None:
+                ours[key] = theirs[key] if ours[key] is None else pick(ours[key], theirs[key])
+        ours['sketch'] = _merge_sketch(ours['sketch'], theirs['sketch'])
+    return profile
+
+
+def estimate_distinct(sketch):
+    """Estimate the number of distinct values from a KMV sketch."""
+    if len(sketch) < SKETCH_SIZE:
+        return len(sketch)
+    kth_smallest = float(sketch[SKETCH_SIZE - 1]) / float(2 ** 64)
+    return int(round((SKETCH_SIZE - 1) / kth_smallest))
+
+
+def finalize_profile(profile):
+    """Return the JSON-serializable form of profile."""
+    rows = profile['rows']
+    columns = {}
+    for column, stats in profile['columns'].items():
+        columns[column] = {
+            'null_rate': round(stats['nulls'] / rows, 4) if rows else 0.0,
+            'min': stats['min'],
+            'max': stats['max'],
+            'distinct': estimate_distinct(stats['sketch']),
+            'outliers': stats['outliers'],
+            'parse_failures': stats['parse_failures'],
+        }
+    return {'rows': rows, 'columns': columns}
@@ -0,0 +1,208 @@
+"""
+Snapshot retention engine.
+
+Raw snapshots older than their retention period are archived to files and
+then removed from the database in bounded primary-key batches, so no run
+holds a long transaction or loads a whole table into memory:
+
+- JSON snapshots (*Data rows) are written batch by batch to gzipped JSON
+  lines files under RETENTION_ARCHIVE_DIR/<client>/<platform>/, then
+  deleted with a single DELETE ... WHERE id IN (...) per batch. The *Data
+  tables have no dependent rows, so Django's cascade collector is skipped.
+- Parquet snapshots are already compressed; their files are moved into the
+  archive directory and the pointer rows deleted the same way.
+
+A batch is archived before it is deleted, so an interrupted run at worst
+archives a batch twice and never loses rows. Snapshots a CurrentSnapshot
+points at are always kept.
+
+Retention defaults to DATA_RETENTION_DAYS, can be set per platform in
+DATA_RETENTION_PLATFORM_DAYS and per client (optionally per platform) with
+RetentionPolicy rows; the most specific setting wins. Each run is recorded
+as a RetentionRun whose counters are updated after every batch.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from .fields import load_json
+from .sharding import for_each_shard
+from .models import PLATFORM_DATA_MODELS, ParquetSnapshot, RetentionPolicy, RetentionRun
+from .snapshot_store import current_snapshot_ids
+
+logger = logging.getLogger(__name__)
+
+
+def get_batch_size():
+    """Number of snapshots archived and deleted per statement."""
+    return int(getattr(settings, 'RETENTION_BATCH_SIZE', 1000))
+
+
+def default_retention_days(platform):
+    """Retention of a platform's snapshots for clients without a policy."""
+    platform_days = getattr(settings, 'DATA_RETENTION_PLATFORM_DAYS', {})
+    return int(platform_days.get(platform, getattr(settings, 'DATA_RETENTION_DAYS', 90)))
+
+
+def client_retention_days(platform):
+    """Map client id to retention days for clients with a RetentionPolicy.
+
+    A policy for the platform beats a client-wide (blank platform) one.
+    """
+    overrides = {}
+    policies = RetentionPolicy.objects.filter(platform__in=['', platform])
+    # Blank platform sorts first, so platform-specific policies overwrite it
+    for client_id, days in policies.order_by('platform').values_list('client_id', 'days'):
+        overrides[client_id] = days
+    return overrides
+
+
+def archive_dir(client_id, platform):
+    """Directory the archived snapshots of one client and platform go to."""
+    return os.path.join(settings.RETENTION_ARCHIVE_DIR, str(client_id), platform)
+
+
+def _record_batch(run, archived, deleted, size):
+    RetentionRun.objects.filter(pk=run.pk).update(
+        batches=F('batches') + 1,
+        rows_archived=F('rows_archived') + archived,
+        rows_deleted=F('rows_deleted') + deleted,
+        bytes_archived=F('bytes_archived') + size,
+    )
+
+
+def _write_archive(rows, platform):
+    """Write one batch of JSON snapshots to per-client gzipped JSON lines files."""
+    by_client = {}
+    for row in rows:
+        by_client.setdefault(row['client_id'], []).append(row)
+    size = 0
+    for client_id, client_rows in by_client.items():
+        directory = archive_dir(client_id, platform)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{client_rows[0]['id']}-{client_rows[-1]['id']}.jsonl.gz")
+        with gzip.open(path, 'wt', encoding='utf-8') as archive:
+            for row in client_rows:
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+        size += os.path.getsize(path)
+    return size
+
+
+def _archive_json_snapshots(run, platform, queryset, batch_size):
+    model = queryset.model
+    last_pk = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk')
+            .values('id', 'client_id', 'fetched_at', 'data')[:batch_size]
+        )
+        if not rows:
+            return
+        for row in rows:
+            row['data'] = load_json(row['data'])
+        size = _write_archive(rows, platform)
+        pks = [row['id'] for row in rows]
+        deleted = model.objects.filter(pk__in=pks)._raw_delete(queryset.db)
+        _record_batch(run, len(rows), deleted, size)
+        last_pk = pks[-1]
+
+
+def _archive_parquet_snapshots(run, platform, queryset, batch_size):
+    last_pk = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk')
+            .values_list('id', 'client_id', 'path')[:batch_size]
+        )
+        if not rows:
+            return
+        size, moved = 0, 0
+        for _, client_id, path in rows:
+            directory = archive_dir(client_id, platform)
+            os.makedirs(directory, exist_ok=True)
+            target = os.path.join(directory, os.path.basename(path))
+            try:
+                shutil.move(path, target)
+            except FileNotFoundError:
+                logger.warning(f"Parquet snapshot {path} is missing; dropping its pointer")
+                continue
+            size += os.path.getsize(target)
+            moved += 1
+        pks = [row[0] for row in rows]
+        deleted = ParquetSnapshot.objects.filter(pk__in=pks)._raw_delete(queryset.db)
+        _record_batch(run, moved, deleted, size)
+        last_pk = pks[-1]
+
+
+def expired_snapshots(platform, now=None):
+    """Yield (kind, queryset) pairs of the expired snapshots of one platform.
+
+    kind is 'db' for the platform's *Data rows and 'parquet' for its
+    ParquetSnapshot pointers.
+    """
+    now = now or timezone.now()
+    overrides = client_retention_days(platform)
+    groups = [(None, default_retention_days(platform))] + list(overrides.items())
+    for client_id, days in groups:
+        cutoff = now - timedelta(days=days)
+        for kind, queryset in (
+            ('db', PLATFORM_DATA_MODELS[platform].objects.all()),
+            ('parquet', ParquetSnapshot.objects.filter(platform=platform)),
+        ):
+            queryset = queryset.filter(fetched_at__lt=cutoff).exclude(
+                pk__in=current_snapshot_ids(kind, platform)
+            )
+            if client_id is None:
+                queryset = queryset.exclude(client_id__in=list(overrides))
+            else:
+                queryset = queryset.filter(client_id=client_id)
+            yield kind, queryset
+
+
+def run_retention(platforms=None, batch_size=None):
+    """Archive and delete every expired raw snapshot.
+
+    Returns the RetentionRun with the final counters.
+    """
+    batch_size = batch_size or get_batch_size()
+    run = RetentionRun.objects.create()
+    try:
+        for platform in platforms or PLATFORM_DATA_MODELS:
+            RetentionRun.objects.filter(pk=run.pk).update(current_platform=platform)
+            for _ in for_each_shard():
+                for kind, queryset in expired_snapshots(platform):
+                    if kind == 'db':
+                        _archive_json_snapshots(run, platform, queryset, batch_size)
+                    else:
+                        _archive_parquet_snapshots(run, platform, queryset, batch_size)
+    except Exception as e:
+        RetentionRun.objects.filter(pk=run.pk).update(
+            status='failed', error_message=str(e), finished_at=timezone.now()
+        )
+        raise
+    RetentionRun.objects.filter(pk=run.pk).update(
+        status='complete', current_platform='', finished_at=timezone.now()
+    )
+    run.refresh_from_db()
+    logger.info(
+        f"Retention run {run.pk}: archived {run.rows_archived} and deleted "
+        f"{run.rows_deleted} snapshots in {run.batches} batches "
+        f"({run.bytes_archived} bytes archived)"
+    )
+    return run
+
+
+def read_archive(path):
+    """Yield the snapshots stored in one JSON lines archive file."""
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        for line in archive:
+            yield json.loads(line)
@@ -0,0 +1,163 @@
+"""
+Day, week and month rollups of the daily metrics.
+
+DailyRollup, WeeklyRollup and MonthlyRollup hold one row per client,
+platform and period with the summed metrics, the number of DailyMetric
+rows and the number of distinct campaigns. Weeks start on Monday and
+months on the 1st.
+
+upsert_daily_metrics calls refresh_rollups with the dates it wrote. Only
+the periods those dates fall in are recomputed, from the facts of those
+periods alone, so the cost follows the write and not the client's
+history. The MonthlySummary rows of the touched months are then derived
+from the month rollups of all platforms, so monthly pages read one
+precomputed row per month.
+"""
+
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+import pandas as pd
+from django.db.models import Min, Max
+from django.utils import timezone
+
+from .bulk_load import bulk_load
+from .models import DailyMetric, DailyRollup, MonthlyRollup, MonthlySummary, WeeklyRollup
+from .schema import CANONICAL_METRICS
+
+logger = logging.getLogger(__name__)
+
+GRAINS = {'day': DailyRollup, 'week': WeeklyRollup, 'month': MonthlyRollup}
+ROLLUP_FIELDS = ['rows', 'campaigns'] + CANONICAL_METRICS
+
+
+def period_start(value, grain):
+    """First day of the grain period containing the date value."""
+    if grain == 'week':
+        return value - timedelta(days=value.weekday())
+    if grain == 'month':
+        return value.replace(day=1)
+    return value
+
+
+def period_end(value, grain):
+    """Last day of the grain period containing the date value."""
+    if grain == 'week':
+        return period_start(value, grain) + timedelta(days=6)
+    if grain == 'month':
+        return (value.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return value
+
+
+def _period_starts(dates, grain):
+    if grain == 'week':
+        return dates - pd.to_timedelta(dates.dt.weekday, unit='D')
+    if grain == 'month':
+        return dates.dt.to_period('M').dt.start_time
+    return dates
+
+
+def rollup_frame(facts, grain):
+    """Group facts (date, campaign and metric columns) into grain periods."""
+    facts = facts.assign(period_start=_period_starts(pd.to_datetime(facts['date']), grain).dt.date)
+    grouped = facts.groupby('period_start')
+    frame = grouped[CANONICAL_METRICS].sum()
+    frame['rows'] = grouped.size()
+    frame['campaigns'] = grouped['campaign'].nunique()
+    return frame.reset_index()
+
+
+def refresh_rollups(client, platform, first_date, last_date):
+    """Recompute the rollups of every period touched by first_date..last_date.
+
+    Returns the months whose rollups changed.
+    """
+    start = min(period_start(first_date, grain) for grain in GRAINS)
+    end = max(period_end(last_date, grain) for grain in GRAINS)
+    facts = pd.DataFrame.from_records(
+        DailyMetric.objects.filter(client=client, platform=platform, date__range=(start, end))
+        .order_by().values_list('date', 'campaign', *CANONICAL_METRICS),
+        columns=['date', 'campaign'] + CANONICAL_METRICS,
+    )
+    if facts.empty:
+        return []
+    months = []
+    for grain, model in GRAINS.items():
+        frame = rollup_frame(facts, grain)
+        # Periods at the edges of the span may be only partly loaded
+        touched = frame['period_start'].between(
+            period_start(first_date, grain), period_start(last_date, grain)
+        )
+        frame = frame[touched]
+        frame.insert(0, 'client_id', client.pk)
+        frame.insert(1, 'platform', platform)
+        bulk_load(
+            model, frame,
+            unique_fields=['client', 'platform', 'period_start'],
+            update_fields=ROLLUP_FIELDS + ['updated_at'],
+        )
+        if grain == 'month':
+            months = frame['period_start'].tolist()
+    return months
+
+
+def _decimal(value, places, max_digits):
+    """value as a Decimal that fits a DecimalField(max_digits, places)."""
+    limit = 10 ** (max_digits - places) - Decimal(1).scaleb(-places)
+    value = Decimal(str(round(value, places)))
+    return max(min(value, limit), -limit)
+
+
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator else 0.0
+
+
+def refresh_monthly_summaries(client, months):
+    """Derive the MonthlySummary rows of months from the month rollups."""
+    rollups = MonthlyRollup.objects.filter(client=client, period_start__in=months)
+    by_month = {}
+    for rollup in rollups:
+        by_month.setdefault(rollup.period_start, []).append(rollup)
+    for month, platform_rollups in by_month.items():
+        totals = {
+            name: sum(getattr(rollup, name) for rollup in platform_rollups)
+            for name in ROLLUP_FIELDS
+        }
+        MonthlySummary.objects.update_or_create(
+            client=client,
+            month=month,
+            defaults={
+                'total_campaigns': totals['campaigns'],
+                'total_spend': _decimal(totals['spend'], 2, 12),
+                'total_revenue': _decimal(totals['revenue'], 2, 12),
+                'total_impressions': int(totals['impressions']),
+                'total_clicks': int(totals['clicks']),
+                'total_conversions': int(totals['conversions']),
+                'overall_roas': _decimal(_ratio(totals['revenue'], totals['spend']), 2, 5),
+                'overall_ctr': _decimal(_ratio(totals['clicks'], totals['impressions']), 4, 5),
+                'overall_conversion_rate': _decimal(
+                    _ratio(totals['conversions'], totals['clicks']), 4, 5
+                ),
+                'avg_cpc': _decimal(_ratio(totals['spend'], totals['clicks']), 2, 10),
+                'avg_cpm': _decimal(_ratio(totals['spend'], totals['impressions']) * 1000, 2, 10),
+                'platform_data': {
+                    rollup.platform: {name: getattr(rollup, name) for name in ROLLUP_FIELDS}
+                    for rollup in platform_rollups
+                },
+                'is_generated': True,
+                'generated_at': timezone.now(),
+            },
+        )
+
+
+def rebuild_rollups(client):
+    """Recompute every rollup and MonthlySummary of client from its facts."""
+    spans = DailyMetric.objects.filter(client=client).values('platform').annotate(
+        first=Min('date'), last=Max('date')
+    ).order_by()
+    months = set()
+    for span in spans:
+        months.update(refresh_rollups(client, span['platform'], span['first'], span['last']))
+    refresh_monthly_summaries(client, sorted(months))
+    return len(months)
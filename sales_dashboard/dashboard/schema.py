@@ -0,0 +1,224 @@
+"""
+Canonical schema for platform exports.
+
+Every platform names its columns differently (Cost vs Spend, Campaign vs
+Campaign_Name, Leads vs Conversions, ...). PLATFORM_SCHEMAS declares, per
+platform, how raw columns map onto the canonical ones and which headers
+identify an export of that platform (its signature, taken from the techflow
+sample exports). normalize_frame applies the mapping to a whole DataFrame at
+once so that read paths can rely on the canonical column names instead of
+probing every record.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import clean_frame, merge_reports
+from .profiling import update_profile
+
+CANONICAL_METRICS = ['impressions', 'clicks', 'spend', 'conversions', 'revenue']
+CANONICAL_COLUMNS = ['platform', 'date', 'campaign'] + CANONICAL_METRICS
+
+# Aliases shared by every platform (keys are snake_case column names)
+COMMON_ALIASES = {
+    'day': 'date',
+    'segments_date': 'date',
+    'campaign_name': 'campaign',
+    'cost': 'spend',
+    'amount_spent': 'spend',
+}
+
+PLATFORM_SCHEMAS = {
+    'google_ads': {
+        'signature': ['campaign', 'cost'],
+        'aliases': {
+            'conversion_value': 'revenue',
+        },
+        'numeric': ['ctr', 'cpc', 'conversion_rate', 'roas'],
+    },
+    'linkedin_ads': {
+        'signature': ['campaign_name', 'spend', 'leads', 'lead_rate'],
+        'aliases': {
+            'leads': 'conversions',
+            'total_spent': 'spend',
+        },
+        'numeric': ['ctr', 'cpc', 'lead_rate', 'roas'],
+    },
+    'mailchimp': {
+        'signature': ['sent', 'delivered', 'opened', 'clicked'],
+        'aliases': {
+            'delivered': 'impressions',
+            'clicked': 'clicks',
+        },
+        'numeric': [
+            'sent', 'opened', 'unsubscribed', 'open_rate', 'click_rate',
+            'unsubscribe_rate',
+        ],
+    },
+    'zoho': {
+        'signature': ['new_leads', 'qualified_leads', 'opportunities'],
+        'aliases': {
+            'closed_won': 'conversions',
+            'deal_value': 'revenue',
+            'lead_name': 'campaign',
+        },
+        'numeric': [
+            'new_leads', 'qualified_leads', 'opportunities',
+            'qualification_rate', 'conversion_rate', 'win_rate',
+            'average_deal_size',
+        ],
+    },
+    'demandbase': {
+        'signature': ['target_accounts', 'engaged_accounts', 'pipeline_value'],
+        'aliases': {
+            'closed_won': 'conversions',
+            'account_name': 'campaign',
+        },
+        'numeric': [
+            'target_accounts', 'engaged_accounts', 'pipeline_value',
+            'engagement_rate', 'win_rate', 'average_deal_size',
+        ],
+    },
+}
+
+
+def snake_case(name):
+    """Convert an export column header to its snake_case form."""
+    return str(name).strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def get_schema(platform):
+    """Return the column mapping for platform, or raise ValueError."""
+    try:
+        return PLATFORM_SCHEMAS[platform]
+    except KeyError:
+        raise ValueError(f"Unknown platform '{platform}'")
+
+
+def detect_platform(columns):
+    """Return the platform whose header signature columns match, or None.
+
+    When several signatures match, the most specific (longest) one wins.
+    """
+    present = {snake_case(column) for column in columns}
+    matches = [
+        (len(schema['signature']), platform)
+        for platform, schema in PLATFORM_SCHEMAS.items()
+        if present.issuperset(schema['signature'])
+    ]
+    return max(matches)[1] if matches else None
+
+
+def parse_dates(values):
+    """Parse a column of dates into a datetime64 Series (NaT if invalid).
+
+    Daily exports repeat each date once per campaign, so every distinct
+    value is parsed once and the results are broadcast back by code. ISO
+    'YYYY-MM-DD' strings take an exact-format fast path; anything else
+    falls back to pandas' format inference.
+    """
+    values = pd.Series(values, copy=False)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    parsed = pd.to_datetime(uniques, format='%Y-%m-%d', errors='coerce')
+    retry = parsed.isna() & uniques.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(uniques[retry].astype(str), errors='coerce')
+    result = pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(result, index=values.index)
+
+
+def date_range(dates):
+    """Return the (first, last) datetime.date of parsed dates, or (None, None)."""
+    valid = dates.dropna()
+    if valid.empty:
+        return None, None
+    return valid.min().date(), valid.max().date()
+
+
+def _column_mapping(columns, schema):
+    """Map snake_case columns to canonical names without clobbering."""
+    aliases = {**COMMON_ALIASES, **schema['aliases']}
+    present = set(columns)
+    mapping = {}
+    for column in columns:
+        target = aliases.get(column)
+        if target and target not in present and target not in mapping.values():
+            mapping[column] = target
+    return mapping
+
+
+def normalize_frame(frame, platform, report=None, profile=None):
+    """Rename, cast and derive the canonical columns of one DataFrame.
+
+    The result always has CANONICAL_COLUMNS first (metrics as float64, date
+    as an ISO 'YYYY-MM-DD' string or None, campaign as a string) followed by
+    any platform-specific columns. Normalizing an already normalized frame
+    is a no-op, so stored records can be passed through again safely.
+
+    Numeric columns go through the cleaning engine; pass a report dict
+    (see cleaning.empty_report) to collect its coerced/rejected counts.
+    Unparseable dates are counted as rejected too. Pass a profile dict (see
+    profiling.empty_profile) to profile the cleaned values before missing
+    metrics are filled with zeros.
+    """
+    schema = get_schema(platform)
+    frame = frame.copy()
+    frame.columns = [snake_case(column) for column in frame.columns]
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+    frame = frame.rename(columns=_column_mapping(frame.columns, schema))
+
+    cleaning = clean_frame(frame, CANONICAL_METRICS + schema['numeric'])
+    if 'date' in frame.columns:
+        dates = parse_dates(frame['date'])
+        rejected = int((frame['date'].notna() & dates.isna()).sum())
+        cleaning['columns']['date'] = {'coerced': 0, 'rejected': rejected}
+        cleaning['rejected'] += rejected
+        frame['date'] = dates.dt.strftime('%Y-%m-%d').where(dates.notna(), None)
+    else:
+        frame['date'] = None
+    if report is not None:
+        merge_reports(report, cleaning)
+    if profile is not None:
+        update_profile(profile, frame, cleaning)
+
+    for column in CANONICAL_METRICS:
+        if column in frame.columns:
+            frame[column] = frame[column].fillna(0.0)
+        else:
+            frame[column] = np.zeros(len(frame), dtype='float64')
+    if 'campaign' in frame.columns:
+        frame['campaign'] = frame['campaign'].fillna('').astype(str)
+    else:
+        frame['campaign'] = ''
+    frame['platform'] = platform
+
+    extras = [column for column in frame.columns if column not in CANONICAL_COLUMNS]
+    return frame[CANONICAL_COLUMNS + extras]
+
+
+def frame_to_records(frame):
+    """Convert a DataFrame into JSON-serializable records (NaN -> None)."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient='records')
+
+
+def snapshot_records(data):
+    """Return the list of records stored in a *Data.data payload."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return [data]
+    return []
+
+
+def snapshots_frame(entries, platform, report=None, profile=None):
+    """Build one normalized DataFrame from a sequence of *Data snapshots."""
+    records = []
+    for entry in entries:
+        records.extend(snapshot_records(entry.data))
+    return normalize_frame(
+        pd.DataFrame.from_records(records), platform, report, profile
+    )
@@ -12,6 +12,10 @@ from sklearn.metrics import mean_squared_error
 import warnings
 warnings.filterwarnings('ignore')
 
+# Above this many training rows, outlier quantiles are estimated from a
+# random sample of rows instead of sorting every column in full
+OUTLIER_SAMPLE_SIZE = 100000
+
 # Add the parent directory to the path to import ML modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
@@ -46,14 +50,19 @@ class MLPredictionService:
         """Automatically train ML models when new data is available."""
         try:
             from dashboard.models import Campaign
+            from dashboard.sharding import for_each_shard, shard_for_client, use_shard
 
-            # Get campaign data
+            # Get campaign data from the client's shard, or from every shard
             if client_id:
-                campaigns = Campaign.objects.filter(client_id=client_id)
+                with use_shard(shard_for_client(client_id)):
+                    campaigns = list(Campaign.objects.filter(client_id=client_id))
             else:
-                campaigns = Campaign.objects.all()
+                campaigns = [
+                    campaign for _ in for_each_shard()
+                    for campaign in Campaign.objects.all()
+                ]
 
-            if campaigns.count() < 10:
+            if len(campaigns) < 10:
                 print("Not enough data for training. Need at least 10 campaigns.")
                 return False
 
@@ -143,26 +152,44 @@ class MLPredictionService:
         # Handle missing values
         df = df.fillna(0)
 
-        # Remove outliers
-        df = self._remove_outliers(df)
-
-        return (
-            df.values, np.array(ctr_targets),
-            np.array(roi_targets), np.array(conversion_targets)
+        # Remove outliers from features and targets together
+        return self._remove_outliers(
+            df, ctr_targets, roi_targets, conversion_targets
         )
 
-    def _remove_outliers(self, df, threshold=3):
-        """Remove outliers using IQR method."""
-        for column in df.select_dtypes(include=[np.number]).columns:
-            Q1 = df[column].quantile(0.25)
-            Q3 = df[column].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - threshold * IQR
-            upper_bound = Q3 + threshold * IQR
-            df = df[
-                (df[column] >= lower_bound) & (df[column] <= upper_bound)
-            ]
-        return df
+    def _outlier_mask(self, X, threshold=3):
+        """Boolean mask of rows whose features all lie within the IQR fences.
+
+        The quartiles of every column are computed in one call (on a row
+        sample for large sets) and the mask is accumulated column by column,
+        so no filtered copy of X is ever made.
+        """
+        sample = X
+        if len(X) > OUTLIER_SAMPLE_SIZE:
+            rng = np.random.default_rng(42)
+            sample = X[rng.choice(len(X), OUTLIER_SAMPLE_SIZE, replace=False)]
+        Q1, Q3 = np.quantile(sample, [0.25, 0.75], axis=0)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - threshold * IQR
+        upper_bound = Q3 + threshold * IQR
+
+        mask = np.ones(len(X), dtype=bool)
+        for column in range(X.shape[1]):
+            values = X[:, column]
+            mask &= (values >= lower_bound[column]) & (values <= upper_bound[column])
+        return mask
+
+    def _remove_outliers(self, df, *targets, threshold=3):
+        """Remove outlier rows using the IQR method.
+
+        Returns the feature matrix followed by each target array, all
+        filtered with the same row mask so features and targets stay aligned.
+        """
+        X = df.select_dtypes(include=[np.number]).to_numpy(dtype=np.float64)
+        mask = self._outlier_mask(X, threshold)
+        return (X[mask],) + tuple(
+            np.asarray(target, dtype=np.float64)[mask] for target in targets
+        )
 
     def _train_ctr_model(self, X, y):
         """Train CTR prediction model."""
@@ -429,10 +456,11 @@ class MLPredictionService:
     def generate_monthly_forecast(self, client_id: int, months: int = 6) -> Dict[str, Any]:
         """Generate monthly forecast for a client."""
         try:
-            from dashboard.models import Campaign, Client
+            from dashboard.models import Client
 
             client = Client.objects.get(id=client_id)
-            campaigns = Campaign.objects.filter(client=client)
+            # The related manager reads from the client's shard
+            campaigns = client.campaigns.all()
 
             if campaigns.count() < 5:
                 return {
@@ -503,3 +531,7 @@ class MLPredictionService:
 
 
 
+
+
+# Shared instance used by the views and management commands
+ml_service = MLPredictionService()
@@ -0,0 +1,432 @@
+"""
+Client-keyed sharding of per-client data.
+
+SHARD_DATABASE_ALIASES lists the databases that hold per-client data
+(SHARDED_MODELS: campaigns and their reports, predictions, monthly
+summaries, raw snapshots, daily metrics and their rollups). Each client's
+rows all live on one of them. The ShardAssignment directory on the
+default database maps clients to shards; new clients are placed on the
+shard with the fewest clients, and clients without an entry live on
+'default'. With a single alias (the default) sharding is off and nothing
+here issues queries.
+
+ShardRouter resolves the shard without callers naming it:
+
+- from the instance hint, when Django passes one (saving an object,
+  related managers such as client.campaigns);
+- otherwise from the current client context, which ClientShardMiddleware
+  sets per request from the user's profile and client_shard() sets in
+  Celery tasks and commands.
+
+Queries across all clients must go through each shard (see for_each_shard).
+Shards carry a copy of the Client row so foreign keys hold there; the copy
+is only kept for integrity and the default database stays authoritative.
+
+move_client rebalances online. It copies the client's rows to the target
+shard while the client keeps working, then locks the client and copies
+what changed meanwhile. It then flips the directory and deletes the rows
+from the source. While the client is locked, client_shard() raises
+ShardMoveInProgress so that syncs and uploads retry later, and so does
+ShardRouter for any write to the client's sharded rows, whether it comes
+from a client context or an instance (e.g. an admin save). Requests
+whose writes are refused get a 503 from ClientShardMiddleware.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+from django.db.models.constants import OnConflict
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils import timezone
+
+from .models import (
+    Campaign, CampaignReport, Client, ClientPrediction, CurrentSnapshot, DailyMetric,
+    DailyRollup, DemandbaseData, FutureForecast, GoogleAdsData, LinkedInAdsData,
+    MailchimpData, MLPrediction, MonthlyRollup, MonthlySummary, ParquetSnapshot,
+    RecordFingerprint, ShardAssignment, UserProfile, WeeklyRollup, ZohoData,
+)
+
+logger = logging.getLogger(__name__)
+
+# Parents before children, so rows can be copied in this order
+SHARDED_MODELS = [
+    Campaign, CampaignReport, MLPrediction, FutureForecast, ClientPrediction,
+    MonthlySummary, GoogleAdsData, MailchimpData, LinkedInAdsData, ZohoData,
+    DemandbaseData, DailyMetric, RecordFingerprint, ParquetSnapshot, CurrentSnapshot,
+    DailyRollup, WeeklyRollup, MonthlyRollup,
+]
+# Rows of these are only ever inserted or deleted, never updated
+APPEND_ONLY_MODELS = {
+    GoogleAdsData, MailchimpData, LinkedInAdsData, ZohoData, DemandbaseData,
+    RecordFingerprint, ParquetSnapshot,
+}
+MOVE_BATCH_SIZE = 1000
+# Retry-After of requests refused during a move, in seconds
+MOVE_RETRY_AFTER = 30
+
+_current_shard = ContextVar('dashboard_current_shard', default=None)
+_current_client = ContextVar('dashboard_current_client', default=None)
+_directory_cache = {}
+
+
+class ShardMoveInProgress(Exception):
+    """The client is being moved between shards; retry its writes later."""
+
+
+def shard_aliases():
+    """Database aliases that hold per-client data."""
+    aliases = getattr(settings, 'SHARD_DATABASE_ALIASES', [DEFAULT_DB_ALIAS])
+    return [alias for alias in aliases if alias in settings.DATABASES] or [DEFAULT_DB_ALIAS]
+
+
+def sharding_enabled():
+    return len(shard_aliases()) > 1
+
+
+def client_filter(model, client_id):
+    """Q selecting the rows of model that belong to client_id."""
+    if model is CampaignReport:
+        return Q(campaign__client_id=client_id)
+    if model is MLPrediction:
+        return Q(client_id=client_id) | Q(campaign__client_id=client_id)
+    return Q(client_id=client_id)
+
+
+def _lookup(client_id):
+    """Return (alias, locked) from the directory, cached for a few seconds."""
+    ttl = getattr(settings, 'SHARD_DIRECTORY_TTL', 5)
+    cached = _directory_cache.get(client_id)
+    if cached and cached[2] > time.monotonic():
+        return cached[:2]
+    entry = ShardAssignment.objects.using(DEFAULT_DB_ALIAS).filter(
+        client_id=client_id
+    ).values_list('alias', 'locked').first()
+    alias, locked = entry or (DEFAULT_DB_ALIAS, False)
+    _directory_cache[client_id] = (alias, locked, time.monotonic() + ttl)
+    return alias, locked
+
+
+def shard_for_client(client_id):
+    """Alias of the database holding client_id's data."""
+    if not sharding_enabled():
+        return DEFAULT_DB_ALIAS
+    return _lookup(client_id)[0]
+
+
+@contextmanager
+def use_shard(alias, client_id=None):
+    """Run the enclosed queries on sharded models against alias.
+
+    With client_id, writes are refused while that client is locked.
+    """
+    token = _current_shard.set(alias)
+    client_token = _current_client.set(client_id)
+    try:
+        yield alias
+    finally:
+        _current_client.reset(client_token)
+        _current_shard.reset(token)
+
+
+def _check_unlocked(client_id):
+    if _lookup(client_id)[1]:
+        raise ShardMoveInProgress(f'Client {client_id} is being moved to another shard')
+
+
+@contextmanager
+def client_shard(client):
+    """Run the enclosed queries on the shard of client (or a client id).
+
+    Raises ShardMoveInProgress while the client is locked for a move.
+    """
+    client_id = getattr(client, 'pk', client)
+    if not sharding_enabled():
+        yield DEFAULT_DB_ALIAS
+        return
+    alias, locked = _lookup(client_id)
+    if locked:
+        raise ShardMoveInProgress(f'Client {client_id} is being moved to another shard')
+    with use_shard(alias, client_id):
+        yield alias
+
+
+def for_each_shard():
+    """Yield every shard alias with the shard context set to it."""
+    for alias in shard_aliases():
+        with use_shard(alias):
+            yield alias
+
+
+def _instance_client_id(instance):
+    """Id of the client a model instance belongs to, if it can be told."""
+    if isinstance(instance, Client):
+        return instance.pk
+    if getattr(instance, 'client_id', None):
+        return instance.client_id
+    campaign = instance._state.fields_cache.get('campaign')
+    return getattr(campaign, 'client_id', None)
+
+
+class ShardRouter:
+    """Route sharded models to the shard of the client they belong to.
+
+    Writes to a client that is locked for a move raise ShardMoveInProgress.
+    """
+
+    def _shard(self, model, **hints):
+        if model not in SHARDED_MODELS or not sharding_enabled():
+            return None
+        instance = hints.get('instance')
+        if isinstance(instance, Client):
+            return shard_for_client(instance.pk)
+        if instance is not None:
+            if getattr(instance, 'client_id', None):
+                return shard_for_client(instance.client_id)
+            # Reports and predictions belong to the shard of their campaign
+            campaign = instance._state.fields_cache.get('campaign')
+            if campaign is not None and campaign._state.db:
+                return campaign._state.db
+            if instance._state.db:
+                return instance._state.db
+        return _current_shard.get()
+
+    db_for_read = _shard
+
+    def db_for_write(self, model, **hints):
+        alias = self._shard(model, **hints)
+        if alias is None:
+            return None
+        instance = hints.get('instance')
+        client_id = _current_client.get() if instance is None else _instance_client_id(instance)
+        if client_id is not None:
+            _check_unlocked(client_id)
+        return alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if sharding_enabled() and {type(obj1), type(obj2)} & set(SHARDED_MODELS):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Shards get the full schema, so sharded tables can keep their
+        # foreign keys to the copied Client rows
+        if db in shard_aliases():
+            return True
+        return None
+
+
+class ClientShardMiddleware:
+    """Set the shard context of each request from the user's client.
+
+    Requests whose writes are refused during a move get a 503.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not sharding_enabled() or not request.user.is_authenticated:
+            return self.get_response(request)
+        client_id = UserProfile.objects.using(DEFAULT_DB_ALIAS).filter(
+            user=request.user
+        ).values_list('client_id', flat=True).first()
+        if client_id is None:
+            return self.get_response(request)
+        with use_shard(shard_for_client(client_id), client_id):
+            return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, ShardMoveInProgress):
+            response = HttpResponse(
+                'Your data is being moved. Please try again shortly.', status=503
+            )
+            response['Retry-After'] = str(MOVE_RETRY_AFTER)
+            return response
+        return None
+
+
+def _copy_client_row(client_id, alias):
+    """Make sure alias has a copy of the Client row of client_id."""
+    if alias == DEFAULT_DB_ALIAS or Client.objects.using(alias).filter(pk=client_id).exists():
+        return
+    client = Client.objects.using(DEFAULT_DB_ALIAS).get(pk=client_id)
+    Client.objects.using(alias).bulk_create([client])
+
+
+def _least_loaded_shard():
+    counts = shard_client_counts()
+    # The client being placed is still counted on default
+    counts[DEFAULT_DB_ALIAS] -= 1
+    return min(counts, key=counts.get)
+
+
+@receiver(post_save, sender=Client)
+def assign_new_client(sender, instance, created, raw=False, using=None, **kwargs):
+    """Place a newly created client on the least loaded shard."""
+    if not created or raw or using != DEFAULT_DB_ALIAS or not sharding_enabled():
+        return
+    alias = _least_loaded_shard()
+    _copy_client_row(instance.pk, alias)
+    ShardAssignment.objects.using(DEFAULT_DB_ALIAS).create(client=instance, alias=alias)
+
+
+@receiver(pre_delete, sender=Client)
+def remember_client_shard(sender, instance, using=None, **kwargs):
+    # The directory entry is deleted along with the client
+    if using == DEFAULT_DB_ALIAS and sharding_enabled():
+        _directory_cache.pop(instance.pk, None)
+        instance._shard_alias = shard_for_client(instance.pk)
+
+
+@receiver(post_delete, sender=Client)
+def delete_client_shard_rows(sender, instance, using=None, **kwargs):
+    """Remove a deleted client's rows (and Client copy) from its shard."""
+    alias = getattr(instance, '_shard_alias', DEFAULT_DB_ALIAS)
+    if using != DEFAULT_DB_ALIAS or alias == DEFAULT_DB_ALIAS:
+        return
+    delete_client_rows(instance.pk, alias)
+    Client.objects.using(alias).filter(pk=instance.pk)._raw_delete(alias)
+
+
+def _client_rows(model, client_id, alias):
+    return model._base_manager.using(alias).filter(client_filter(model, client_id))
+
+
+def _insert(model, objects, alias, upsert=False):
+    """Insert objects into alias as they are, keeping primary keys and timestamps."""
+    fields = [field for field in model._meta.concrete_fields]
+    options = {}
+    if upsert:
+        options = {
+            'on_conflict': OnConflict.UPDATE,
+            'unique_fields': [model._meta.pk],
+            'update_fields': [field for field in fields if not field.primary_key],
+        }
+    model._base_manager._insert(objects, fields, raw=True, using=alias, **options)
+
+
+def _copy_rows(model, queryset, target, batch_size, upsert=False):
+    """Copy the rows of queryset to target in primary-key batches."""
+    last_pk, copied = 0, 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+        if not batch:
+            return copied
+        _insert(model, batch, target, upsert)
+        copied += len(batch)
+        last_pk = batch[-1].pk
+
+
+def delete_client_rows(client_id, alias, batch_size=MOVE_BATCH_SIZE):
+    """Delete every sharded row of client_id from alias, children first."""
+    for model in reversed(SHARDED_MODELS):
+        queryset = _client_rows(model, client_id, alias)
+        while True:
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            model._base_manager.using(alias).filter(pk__in=pks)._raw_delete(alias)
+
+
+def _set_assignment(client_id, **values):
+    ShardAssignment.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+        client_id=client_id, defaults=values
+    )
+    _directory_cache.pop(client_id, None)
+
+
+def move_client(client_id, target, batch_size=MOVE_BATCH_SIZE):
+    """Move every sharded row of client_id to the target shard, online.
+
+    Returns the number of rows copied.
+    """
+    if target not in shard_aliases():
+        raise ValueError(f'{target} is not a shard database')
+    _directory_cache.pop(client_id, None)
+    source, locked = _lookup(client_id)
+    if locked:
+        raise ShardMoveInProgress(f'Client {client_id} is already being moved')
+    if source == target:
+        return 0
+    _copy_client_row(client_id, target)
+    started = timezone.now()
+
+    # Bulk copy while the client keeps syncing against the source
+    watermarks, copied = {}, 0
+    for model in SHARDED_MODELS:
+        rows = _client_rows(model, client_id, source)
+        watermarks[model] = rows.order_by('-pk').values_list('pk', flat=True).first() or 0
+        copied += _copy_rows(model, rows.filter(pk__lte=watermarks[model]), target, batch_size)
+
+    # Lock, wait until every process has seen the lock, then copy the changes
+    ttl = getattr(settings, 'SHARD_DIRECTORY_TTL', 5)
+    _set_assignment(client_id, alias=source, locked=True)
+    time.sleep(ttl)
+    try:
+        with transaction.atomic(using=target):
+            for model in reversed(SHARDED_MODELS):
+                source_pks = set(_client_rows(model, client_id, source).values_list('pk', flat=True))
+                target_pks = set(_client_rows(model, client_id, target).values_list('pk', flat=True))
+                stale = sorted(target_pks - source_pks)
+                for start in range(0, len(stale), batch_size):
+                    chunk = stale[start:start + batch_size]
+                    model._base_manager.using(target).filter(pk__in=chunk)._raw_delete(target)
+            for model in SHARDED_MODELS:
+                changed = _client_rows(model, client_id, source).filter(pk__gt=watermarks[model])
+                if model not in APPEND_ONLY_MODELS:
+                    auto_now = [
+                        field.name for field in model._meta.concrete_fields
+                        if getattr(field, 'auto_now', False)
+                    ]
+                    if auto_now:
+                        since = Q(pk__gt=watermarks[model]) | Q(**{f'{auto_now[0]}__gte': started})
+                        changed = _client_rows(model, client_id, source).filter(since)
+                    else:
+                        changed = _client_rows(model, client_id, source)
+                copied += _copy_rows(model, changed, target, batch_size, upsert=True)
+        _set_assignment(client_id, alias=target, locked=True)
+        time.sleep(ttl)
+    finally:
+        _set_assignment(client_id, locked=False)
+
+    delete_client_rows(client_id, source, batch_size)
+    logger.info(f"Moved client {client_id} from {source} to {target}: {copied} rows copied")
+    return copied
+
+
+def shard_client_counts():
+    """Number of clients placed on each shard."""
+    counts = dict.fromkeys(shard_aliases(), 0)
+    assigned = set()
+    for alias, client_id in ShardAssignment.objects.using(DEFAULT_DB_ALIAS).values_list('alias', 'client_id'):
+        counts[alias] = counts.get(alias, 0) + 1
+        assigned.add(client_id)
+    # Clients without a directory entry live on the default database
+    unassigned = Client.objects.using(DEFAULT_DB_ALIAS).exclude(pk__in=assigned).count()
+    counts[DEFAULT_DB_ALIAS] = counts.get(DEFAULT_DB_ALIAS, 0) + unassigned
+    return counts
+
+
+def plan_rebalance():
+    """Return (client_id, source, target) moves that even out client counts."""
+    counts = shard_client_counts()
+    placement = {}
+    for client_id in Client.objects.using(DEFAULT_DB_ALIAS).order_by('pk').values_list('pk', flat=True):
+        placement.setdefault(shard_for_client(client_id), []).append(client_id)
+    moves = []
+    while True:
+        fullest = max(counts, key=counts.get)
+        emptiest = min(counts, key=counts.get)
+        if counts[fullest] - counts[emptiest] <= 1 or not placement.get(fullest):
+            return moves
+        client_id = placement[fullest].pop()
+        moves.append((client_id, fullest, emptiest))
+        counts[fullest] -= 1
+        counts[emptiest] += 1
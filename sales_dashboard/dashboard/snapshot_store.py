@@ -0,0 +1,207 @@
+"""
+Raw snapshot archive.
+
+Every synced fetch and uploaded chunk can be archived as it arrived, next
+to the DailyMetric facts. SNAPSHOT_STORE selects where:
+
+- 'db' (default): a JSON row in the platform's *Data table.
+- 'parquet': a zstd-compressed Parquet file under SNAPSHOT_STORE_DIR, laid
+  out as <client>/<platform>/<fetch time>.parquet, with only a
+  ParquetSnapshot pointer row in the database. Reads are memory-mapped and
+  load just the requested columns.
+
+pyarrow is optional; without it the 'parquet' setting falls back to the
+database store.
+
+Each sync archives the complete fetch and moves the (client, platform)
+CurrentSnapshot pointer to it. The latest state itself is read from the
+DailyMetric facts; the pointer marks which fetch retention must keep.
+Older snapshots stay in the archive for diffing.
+"""
+
+import logging
+import os
+
+import pandas as pd
+from django.conf import settings
+from django.utils import timezone
+
+from .models import PLATFORM_DATA_MODELS, CurrentSnapshot, ParquetSnapshot
+from .schema import CANONICAL_METRICS, frame_to_records, snapshots_frame
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+PARQUET_COMPRESSION = 'zstd'
+DIFF_KEY = ['date', 'campaign']
+
+
+def store_raw_snapshots():
+    """Whether fetched/uploaded rows are archived as raw snapshots at all."""
+    return getattr(settings, 'STORE_RAW_SNAPSHOTS', True)
+
+
+def use_parquet_store():
+    """Whether raw snapshots are written as Parquet files."""
+    if getattr(settings, 'SNAPSHOT_STORE', 'db') != 'parquet':
+        return False
+    if not PARQUET_AVAILABLE:
+        logger.warning("SNAPSHOT_STORE is 'parquet' but pyarrow is not installed; using the database")
+        return False
+    return True
+
+
+def snapshot_path(client, platform, fetched_at):
+    """Absolute path of the Parquet file for one fetch."""
+    return os.path.join(
+        settings.SNAPSHOT_STORE_DIR, str(client.pk), platform,
+        f"{fetched_at.strftime('%Y%m%dT%H%M%S%f')}.parquet"
+    )
+
+
+def write_parquet_snapshot(client, platform, frame, fetched_at=None):
+    """Write frame as a Parquet file and record its pointer row."""
+    fetched_at = fetched_at or timezone.now()
+    path = snapshot_path(client, platform, fetched_at)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    pq.write_table(table, path, compression=PARQUET_COMPRESSION)
+    return ParquetSnapshot.objects.create(
+        client=client,
+        platform=platform,
+        fetched_at=fetched_at,
+        path=path,
+        row_count=table.num_rows,
+        size_bytes=os.path.getsize(path),
+        columns=table.column_names,
+    )
+
+
+def archive_snapshot(client, platform, frame, fetched_at=None):
+    """Archive a normalized frame in the configured raw snapshot store.
+
+    Does nothing when raw snapshots are disabled.
+    """
+    if not store_raw_snapshots():
+        return None
+    if use_parquet_store():
+        return write_parquet_snapshot(client, platform, frame, fetched_at)
+    return PLATFORM_DATA_MODELS[platform].objects.create(
+        client=client,
+        data=frame_to_records(frame),
+        fetched_at=fetched_at or timezone.now(),
+    )
+
+
+def read_parquet_snapshots(snapshots, columns=None):
+    """Read the files behind ParquetSnapshot rows into one DataFrame.
+
+    Only the requested columns are read (columns a file lacks are
+    skipped), through memory-mapped Arrow reads.
+    """
+    tables = []
+    for snapshot in snapshots:
+        wanted = None
+        if columns is not None:
+            wanted = [column for column in columns if column in snapshot.columns]
+        tables.append(pq.read_table(snapshot.path, columns=wanted, memory_map=True))
+    if not tables:
+        return pd.DataFrame(columns=columns or [])
+    return pa.concat_tables(tables, promote_options='default').to_pandas()
+
+
+def set_current_snapshot(client, platform, snapshot):
+    """Point the (client, platform) current snapshot at an archived snapshot."""
+    pointer, _ = CurrentSnapshot.objects.update_or_create(
+        client=client,
+        platform=platform,
+        defaults={
+            'store': 'parquet' if isinstance(snapshot, ParquetSnapshot) else 'db',
+            'snapshot_id': snapshot.pk,
+            'fetched_at': snapshot.fetched_at,
+            'row_count': (
+                snapshot.row_count if isinstance(snapshot, ParquetSnapshot)
+                else len(snapshot.data)
+            ),
+        },
+    )
+    return pointer
+
+
+def current_snapshot_ids(store, platform=None):
+    """Primary keys of the snapshots some CurrentSnapshot points at."""
+    pointers = CurrentSnapshot.objects.filter(store=store)
+    if platform:
+        pointers = pointers.filter(platform=platform)
+    return pointers.values_list('snapshot_id', flat=True)
+
+
+def snapshot_history(client, platform):
+    """Every archived fetch of one platform, newest first.
+
+    Returns (store, snapshot id, fetched_at) tuples from both stores.
+    """
+    history = [
+        ('db', pk, fetched_at)
+        for pk, fetched_at in PLATFORM_DATA_MODELS[platform].objects.filter(
+            client=client
+        ).values_list('pk', 'fetched_at')
+    ]
+    history += [
+        ('parquet', pk, fetched_at)
+        for pk, fetched_at in ParquetSnapshot.objects.filter(
+            client=client, platform=platform
+        ).values_list('pk', 'fetched_at')
+    ]
+    return sorted(history, key=lambda entry: entry[2], reverse=True)
+
+
+def load_snapshot_frame(client, platform, store, snapshot_id, columns=None):
+    """Load one archived snapshot as a normalized DataFrame."""
+    if store == 'parquet':
+        snapshot = ParquetSnapshot.objects.get(
+            pk=snapshot_id, client=client, platform=platform
+        )
+        return read_parquet_snapshots([snapshot], columns)
+    snapshot = PLATFORM_DATA_MODELS[platform].objects.get(pk=snapshot_id, client=client)
+    frame = snapshots_frame([snapshot], platform)
+    if columns is not None:
+        frame = frame[[column for column in columns if column in frame.columns]]
+    return frame
+
+
+def diff_frames(old, new):
+    """Compare two snapshots of one platform by (date, campaign).
+
+    Metrics are summed per key first. Returns a dict of 'added', 'removed'
+    and 'changed' DataFrames; 'changed' has <metric>_old and <metric>_new
+    columns for every metric that differs on at least one changed key.
+    """
+    metrics = [column for column in CANONICAL_METRICS if column in new.columns]
+
+    def by_key(frame):
+        frame = frame.reindex(columns=DIFF_KEY + metrics)
+        return frame.groupby(DIFF_KEY, dropna=False)[metrics].sum()
+
+    old, new = by_key(old), by_key(new)
+    added = new.loc[new.index.difference(old.index)]
+    removed = old.loc[old.index.difference(new.index)]
+    common = old.index.intersection(new.index)
+    before, after = old.loc[common], new.loc[common]
+    differs = ~before.eq(after)
+    rows = differs.any(axis=1)
+    changed_metrics = [column for column in metrics if differs[column].any()]
+    changed = before.loc[rows, changed_metrics].join(
+        after.loc[rows, changed_metrics], lsuffix='_old', rsuffix='_new'
+    )
+    return {
+        'added': added.reset_index(),
+        'removed': removed.reset_index(),
+        'changed': changed.reset_index(),
+    }
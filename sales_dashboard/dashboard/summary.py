@@ -0,0 +1,136 @@
+"""
+Running totals of each client's daily metrics.
+
+The UnifiedClientData row with source='sync' summarizes all of a client's
+DailyMetric facts: total_records, the date bounds, platforms_included and
+data_summary, which holds the KPI totals and per-platform totals:
+
+    {'impressions': ..., 'clicks': ..., 'spend': ..., 'revenue': ...,
+     'platforms': {'google_ads': {'rows': ..., 'impressions': ..., ...}}}
+
+upsert_daily_metrics applies each write's delta (its new rows, minus the
+stored rows it replaces) to that row, so keeping it current costs as much
+as the written data and never rescans the client's history. Facts are
+never deleted, so the date bounds only widen.
+
+Every write of a client's facts runs in locked_summary, which locks the
+row before the stored facts are read. Concurrent writers of one client
+(an upload and a sync, say) therefore compute and apply their deltas one
+after another instead of both against the same old state.
+
+rebuild_summary recomputes the row from every fact. It also refreshes
+data_profile, which deltas cannot maintain, and runs only on request
+(rebuild_summaries command) or when a write finds no running totals to
+update.
+"""
+
+import logging
+from contextlib import contextmanager
+
+from django.db import router, transaction
+from django.utils import timezone
+
+from .facts import metrics_frame
+from .models import PLATFORM_DATA_MODELS, DailyMetric, UnifiedClientData
+from .profiling import empty_profile, finalize_profile, update_profile
+from .schema import CANONICAL_METRICS, date_range, parse_dates
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SOURCE = 'sync'
+KPI_METRICS = ['impressions', 'clicks', 'spend', 'revenue']
+
+
+def platform_label(platform):
+    """Name used in platforms_included, e.g. 'GoogleAds'."""
+    return PLATFORM_DATA_MODELS[platform].__name__.replace('Data', '')
+
+
+def _platforms_included(platforms):
+    return [platform_label(platform) for platform in PLATFORM_DATA_MODELS if platform in platforms]
+
+
+def rebuild_summary(client):
+    """Recompute the client's summary row from all of its facts."""
+    data = metrics_frame(client)
+    totals = data.groupby('platform')[CANONICAL_METRICS].sum()
+    rows = data.groupby('platform').size()
+    data_summary = {name: float(data[name].sum()) for name in KPI_METRICS}
+    data_summary['platforms'] = {
+        platform: {'rows': int(rows[platform]), **{
+            name: float(totals.at[platform, name]) for name in CANONICAL_METRICS
+        }}
+        for platform in totals.index
+    }
+    profiles = {
+        platform: update_profile(empty_profile(), platform_rows.drop(columns='platform'))
+        for platform, platform_rows in data.groupby('platform')
+    }
+    date_start, date_end = date_range(parse_dates(data['date']))
+    summary, _ = UnifiedClientData.objects.update_or_create(
+        client=client,
+        source=SUMMARY_SOURCE,
+        defaults={
+            'status': 'synced',
+            'total_records': len(data),
+            'date_range_start': date_start,
+            'date_range_end': date_end,
+            'platforms_included': _platforms_included(set(totals.index)),
+            'data_summary': data_summary,
+            'data_profile': {
+                key: finalize_profile(profile) for key, profile in profiles.items()
+            },
+            'processing_started_at': timezone.now(),
+            'processing_completed_at': timezone.now(),
+        }
+    )
+    return summary
+
+
+@contextmanager
+def locked_summary(client):
+    """Transaction for writing the client's facts, with its summary row locked.
+
+    Yields the locked row, or None if the client has none yet. The
+    transaction spans the summary's and the facts' databases.
+    """
+    with transaction.atomic(using=router.db_for_write(UnifiedClientData)), \
+            transaction.atomic(using=router.db_for_write(DailyMetric)):
+        yield UnifiedClientData.objects.select_for_update().filter(
+            client=client, source=SUMMARY_SOURCE
+        ).first()
+
+
+def apply_delta(summary, client, platform, new_rows, metrics, first_date, last_date):
+    """Add one write's delta to the client's summary row.
+
+    summary is the row locked_summary yielded. new_rows and metrics come
+    from facts.fact_delta, computed under that lock; first_date and
+    last_date span the written rows.
+    """
+    if summary is None or 'platforms' not in summary.data_summary:
+        # No running totals yet (new client, or a row from before they existed)
+        logger.info(f"Building the summary of client {client.pk} from its facts")
+        rebuild_summary(client)
+        return
+    data_summary = summary.data_summary
+    for name in KPI_METRICS:
+        data_summary[name] = data_summary.get(name, 0) + metrics[name]
+    totals = data_summary.setdefault('platforms', {}).setdefault(
+        platform, dict.fromkeys(['rows'] + CANONICAL_METRICS, 0)
+    )
+    totals['rows'] += new_rows
+    for name in CANONICAL_METRICS:
+        totals[name] += metrics[name]
+    summary.total_records += new_rows
+    if summary.date_range_start is None or first_date < summary.date_range_start:
+        summary.date_range_start = first_date
+    if summary.date_range_end is None or last_date > summary.date_range_end:
+        summary.date_range_end = last_date
+    summary.platforms_included = _platforms_included(set(data_summary['platforms']))
+    summary.status = 'synced'
+    summary.processing_completed_at = timezone.now()
+    summary.save(update_fields=[
+        'data_summary', 'total_records', 'date_range_start', 'date_range_end',
+        'platforms_included', 'status', 'processing_completed_at',
+    ])
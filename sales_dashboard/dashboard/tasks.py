@@ -7,14 +7,15 @@ from celery import shared_task
 from django.utils import timezone
 from .models import (
     Client, GoogleAdsCredential, LinkedInAdsCredential, ZohoCredential,
-    GoogleAdsData, LinkedInAdsData, MailchimpData, ZohoData, 
-    DemandbaseData, UnifiedClientData
+    UnifiedClientData
 )
-from api_integrations.google_ads import fetch_google_ads_data
-from api_integrations.linkedin_ads import fetch_linkedin_ads_data
-from api_integrations.mailchimp import fetch_mailchimp_data
-from api_integrations.zoho import fetch_zoho_data
-from api_integrations.demandbase import fetch_demandbase_data
+from .cleaning import empty_report
+from .dedup import new_rows, store_new_facts
+from .facts import facts_frame
+from .schema import normalize_frame
+from .sharding import ShardMoveInProgress, client_shard
+from .snapshot_store import archive_snapshot, set_current_snapshot
+from .summary import locked_summary, rebuild_summary
 # from dashboard.rag_pipeline import update_rag_index_from_db
 
 # RAG update task is disabled for low-memory deployment.
@@ -22,67 +23,72 @@ from api_integrations.demandbase import fetch_demandbase_data
 
 logger = logging.getLogger(__name__)
 
+# How long uploads wait before retrying while their client changes shards
+SHARD_MOVE_RETRY_SECONDS = 30
+
+# Platform API clients are optional so that upload processing keeps working
+# on workers where the platform SDKs are not installed
+try:
+    from api_integrations.google_ads import fetch_google_ads_data
+    from api_integrations.linkedin_ads import fetch_linkedin_ads_data
+    from api_integrations.mailchimp import fetch_mailchimp_data
+    from api_integrations.zoho import fetch_zoho_data
+    from api_integrations.demandbase import fetch_demandbase_data
+    API_INTEGRATIONS_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Could not import API integrations: {e}")
+    API_INTEGRATIONS_AVAILABLE = False
+
+
+def store_sync_snapshot(client, platform, df):
+    """Normalize a fetched DataFrame and store the facts that changed.
+
+    New or changed (date, campaign) facts are upserted into the DailyMetric
+    fact table. When there are any, or new rows without a date, the whole
+    fetch is archived and becomes the platform's current snapshot. Returns
+    the number of fetched rows behind them; nothing is written when the
+    fetch changes nothing.
+    """
+    report = empty_report()
+    frame = normalize_frame(df, platform, report)
+    if report['rejected']:
+        logger.warning(
+            f"{platform} sync for client {client.company}: "
+            f"{report['rejected']} unparseable values dropped, "
+            f"{report['coerced']} formatted values coerced"
+        )
+    # A failed write leaves no fingerprints behind, so the next sync stores the rows
+    with client_shard(client), locked_summary(client):
+        new_facts = store_new_facts(client, platform, facts_frame(frame))
+        stored = new_rows(client, platform, frame, new_facts)
+        if stored.empty:
+            logger.info(
+                f"{platform} sync for client {client.company}: no new rows"
+            )
+            return 0
+        snapshot = archive_snapshot(client, platform, frame)
+        if snapshot is not None:
+            set_current_snapshot(client, platform, snapshot)
+    return len(stored)
+
 
 def aggregate_unified_data_for_client(client):
-    """Aggregate latest data from all tools and update UnifiedClientData summary for the client."""
-    import datetime
-    tool_models = [
-        GoogleAdsData, LinkedInAdsData, MailchimpData, ZohoData, DemandbaseData
-    ]
-    all_data = []
-    platforms = []
-    date_start, date_end = None, None
-    total_records = 0
-    for model in tool_models:
-        tool_data = model.objects.filter(client=client).order_by('-fetched_at')
-        if tool_data.exists():
-            platforms.append(model.__name__.replace('Data', ''))
-            for entry in tool_data:
-                entry_data = (
-                    entry.data if isinstance(entry.data, list)
-                    else [entry.data] if isinstance(entry.data, dict)
-                    else []
-                )
-                all_data.extend(entry_data)
-                for record in entry_data:
-                    date_val = record.get('date') or record.get('Date')
-                    if date_val:
-                        try:
-                            d = datetime.datetime.strptime(
-                                str(date_val), '%Y-%m-%d'
-                            ).date()
-                            if not date_start or d < date_start:
-                                date_start = d
-                            if not date_end or d > date_end:
-                                date_end = d
-                        except Exception:
-                            continue
-    total_records = len(all_data)
-    kpis = {'impressions': 0, 'clicks': 0, 'spend': 0, 'revenue': 0}
-    for record in all_data:
-        for k in kpis:
-            try:
-                kpis[k] += float(record.get(k, 0) or 0)
-            except Exception:
-                continue
-    UnifiedClientData.objects.update_or_create(
-        client=client,
-        defaults={
-            'status': 'synced',
-            'total_records': total_records,
-            'date_range_start': date_start,
-            'date_range_end': date_end,
-            'platforms_included': platforms,
-            'data_summary': kpis,
-            'processing_started_at': timezone.now(),
-            'processing_completed_at': timezone.now(),
-        }
-    )
+    """Rebuild the client's UnifiedClientData summary from all of its daily metrics.
+
+    Syncs keep the summary current incrementally (see summary.apply_delta);
+    this full rebuild is only needed on request.
+    """
+    with client_shard(client):
+        return rebuild_summary(client)
 
 
 @shared_task
 def sync_google_ads_data():
     """Background task to sync Google Ads data for all connected clients."""
+    if not API_INTEGRATIONS_AVAILABLE:
+        logger.error("API integrations unavailable, skipping Google Ads sync")
+        return "Google Ads sync skipped"
+
     try:
         # Get all clients with Google Ads credentials
         clients = Client.objects.filter(
@@ -99,13 +105,7 @@ def sync_google_ads_data():
                 df = fetch_google_ads_data(client)
 
                 # Save to database
-                GoogleAdsData.objects.create(
-                    client=client,
-                    data=df.to_dict(orient='records'),
-                    fetched_at=timezone.now()
-                )
-                # AGGREGATE unified data
-                aggregate_unified_data_for_client(client)
+                store_sync_snapshot(client, 'google_ads', df)
 
                 logger.info(
                     f"Successfully synced Google Ads data for client: {client.company}"
@@ -127,6 +127,10 @@ def sync_google_ads_data():
 @shared_task
 def sync_linkedin_ads_data():
     """Background task to sync LinkedIn Ads data for all connected clients."""
+    if not API_INTEGRATIONS_AVAILABLE:
+        logger.error("API integrations unavailable, skipping LinkedIn Ads sync")
+        return "LinkedIn Ads sync skipped"
+
     try:
         # Get all clients with LinkedIn Ads credentials
         clients = Client.objects.filter(
@@ -143,12 +147,7 @@ def sync_linkedin_ads_data():
                 df = fetch_linkedin_ads_data(client)
 
                 # Save to database
-                LinkedInAdsData.objects.create(
-                    client=client,
-                    data=df.to_dict(orient='records'),
-                    fetched_at=timezone.now()
-                )
-                aggregate_unified_data_for_client(client)
+                store_sync_snapshot(client, 'linkedin_ads', df)
 
                 logger.info(
                     f"Successfully synced LinkedIn Ads data for client: {client.company}"
@@ -170,6 +169,10 @@ def sync_linkedin_ads_data():
 @shared_task
 def sync_mailchimp_data():
     """Background task to sync Mailchimp data for all connected clients."""
+    if not API_INTEGRATIONS_AVAILABLE:
+        logger.error("API integrations unavailable, skipping Mailchimp sync")
+        return "Mailchimp sync skipped"
+
     try:
         # Get all clients with Mailchimp credentials
         clients = Client.objects.filter(
@@ -186,12 +189,7 @@ def sync_mailchimp_data():
                 df = fetch_mailchimp_data(client)
 
                 # Save to database
-                MailchimpData.objects.create(
-                    client=client,
-                    data=df.to_dict(orient='records'),
-                    fetched_at=timezone.now()
-                )
-                aggregate_unified_data_for_client(client)
+                store_sync_snapshot(client, 'mailchimp', df)
 
                 logger.info(
                     f"Successfully synced Mailchimp data for client: {client.company}"
@@ -213,6 +211,10 @@ def sync_mailchimp_data():
 @shared_task
 def sync_zoho_data():
     """Background task to sync Zoho data for all connected clients."""
+    if not API_INTEGRATIONS_AVAILABLE:
+        logger.error("API integrations unavailable, skipping Zoho sync")
+        return "Zoho sync skipped"
+
     try:
         # Get all clients with Zoho credentials
         clients = Client.objects.filter(
@@ -227,12 +229,7 @@ def sync_zoho_data():
                 df = fetch_zoho_data(client)
 
                 # Save to database
-                ZohoData.objects.create(
-                    client=client,
-                    data=df.to_dict(orient='records'),
-                    fetched_at=timezone.now()
-                )
-                aggregate_unified_data_for_client(client)
+                store_sync_snapshot(client, 'zoho', df)
 
                 logger.info(
                     f"Successfully synced Zoho data for client: {client.company}"
@@ -254,6 +251,10 @@ def sync_zoho_data():
 @shared_task
 def sync_demandbase_data():
     """Background task to sync Demandbase data for all connected clients."""
+    if not API_INTEGRATIONS_AVAILABLE:
+        logger.error("API integrations unavailable, skipping Demandbase sync")
+        return "Demandbase sync skipped"
+
     try:
         # Get all clients with Demandbase credentials
         clients = Client.objects.filter(
@@ -270,12 +271,7 @@ def sync_demandbase_data():
                 df = fetch_demandbase_data(client)
 
                 # Save to database
-                DemandbaseData.objects.create(
-                    client=client,
-                    data=df.to_dict(orient='records'),
-                    fetched_at=timezone.now()
-                )
-                aggregate_unified_data_for_client(client)
+                store_sync_snapshot(client, 'demandbase', df)
 
                 logger.info(
                     f"Successfully synced Demandbase data for client: {client.company}"
@@ -294,6 +290,46 @@ def sync_demandbase_data():
         raise
 
 
+@shared_task(bind=True, max_retries=None)
+def process_unified_upload(self, upload_id):
+    """Background task to ingest a stored unified data upload."""
+    from .ingestion import ingest_upload
+
+    try:
+        upload = UnifiedClientData.objects.select_related('client').get(pk=upload_id)
+    except UnifiedClientData.DoesNotExist:
+        logger.error(f"Upload {upload_id} no longer exists")
+        return "Upload not found"
+
+    # The platform chosen at upload time; None means detect from headers
+    platform = upload.platforms_included[0] if upload.platforms_included else None
+    if not upload.source_file:
+        UnifiedClientData.objects.filter(pk=upload_id).update(
+            status='failed',
+            error_message='Uploaded file is missing.',
+            processing_completed_at=timezone.now(),
+        )
+        return "Upload missing file"
+
+    try:
+        with client_shard(upload.client), upload.source_file.open('rb') as fileobj:
+            total_records = ingest_upload(upload, fileobj, platform)
+    except ShardMoveInProgress as e:
+        logger.info(f"Upload {upload_id} deferred: {str(e)}")
+        raise self.retry(exc=e, countdown=SHARD_MOVE_RETRY_SECONDS)
+    except Exception as e:
+        # ingest_upload records its own failures; this covers unreadable files
+        UnifiedClientData.objects.filter(pk=upload_id, status='processing').update(
+            status='failed',
+            error_message=str(e),
+            processing_completed_at=timezone.now(),
+        )
+        logger.error(f"Processing upload {upload_id} failed: {str(e)}")
+        return f"Upload {upload_id} failed"
+
+    return f"Imported {total_records} records for upload {upload_id}"
+
+
 @shared_task
 def sync_all_platform_data():
     """Background task to sync data from all platforms for all connected clients."""
@@ -332,28 +368,15 @@ def sync_all_platform_data():
 
 @shared_task
 def cleanup_old_data():
-    """Background task to clean up old data records."""
-    try:
-        from datetime import timedelta
+    """Background task to archive and delete expired raw snapshots."""
+    from .retention import run_retention
 
-        # Delete data older than 90 days
-        cutoff_date = timezone.now() - timedelta(days=90)
-
-        # Clean up old data from all platforms
-        platforms = [
-            GoogleAdsData, LinkedInAdsData, MailchimpData, ZohoData, DemandbaseData
-        ]
-
-        total_deleted = 0
-        for platform in platforms:
-            deleted_count = platform.objects.filter(
-                fetched_at__lt=cutoff_date
-            ).delete()[0]
-            total_deleted += deleted_count
-            logger.info(f"Deleted {deleted_count} old {platform.__name__} records")
-
-        logger.info(f"Cleanup completed. Total deleted: {total_deleted}")
-        return f"Deleted {total_deleted} old records"
+    try:
+        run = run_retention()
+        return (
+            f"Archived {run.rows_archived} and deleted {run.rows_deleted} "
+            f"old records"
+        )
 
     except Exception as e:
         logger.error(f"Data cleanup task failed: {str(e)}")
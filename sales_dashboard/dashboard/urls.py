@@ -35,6 +35,31 @@ urlpatterns = [
 
     # Unified Data Upload and Predictions
     path('unified-data/', views.unified_data_list, name='unified_data_list'),
+    path(
+        'unified-data/upload/',
+        views.unified_data_upload,
+        name='unified_data_upload'
+    ),
+    path(
+        'unified-data/upload/<int:upload_id>/progress/',
+        views.unified_data_upload_progress,
+        name='unified_data_upload_progress'
+    ),
+    path(
+        'unified-data/upload/chunked/',
+        views.chunked_upload_start,
+        name='chunked_upload_start'
+    ),
+    path(
+        'unified-data/upload/chunked/<int:chunked_id>/',
+        views.chunked_upload_status,
+        name='chunked_upload_status'
+    ),
+    path(
+        'unified-data/upload/chunked/<int:chunked_id>/parts/<int:part>/',
+        views.chunked_upload_part,
+        name='chunked_upload_part'
+    ),
     path(
         'generate-prediction/<int:data_id>/',
         views.generate_prediction,
@@ -1,21 +1,29 @@
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
 from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import Sum, Avg
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_http_methods, require_POST
 from datetime import datetime
+import pandas as pd
 import requests
 from .models import (
     Campaign, CampaignReport, Client, UserProfile,
     MLPrediction, MonthlySummary, ClientPrediction,
-    GoogleAdsData, LinkedInAdsData, MailchimpData, ZohoData, 
-    DemandbaseData, ChatbotFeedback
+    ChatbotFeedback, PLATFORM_DATA_MODELS
 )
-from .forms import CampaignFilterForm
+from .db_routing import replica_reads, stick_to_primary
+from .analytics import GRANULARITIES, advanced_analytics, bucketed_metrics
+from .data_cache import cached
+from .hot_tier import client_series, day_number
+from .schema import CANONICAL_METRICS, frame_to_records
+from .sharding import for_each_shard
+from .forms import CampaignFilterForm, UnifiedDataUploadForm
 import json
 # from dashboard.rag_pipeline import rag_answer
 from django.core.cache import cache
@@ -36,6 +44,7 @@ def landing_page(request):
 
 
 @login_required
+@replica_reads
 def client_portal(request):
     """Client portal view - shows only campaigns for the user's client"""
     try:
@@ -162,6 +171,7 @@ def campaign_detail(request, campaign_id):
 
 
 @login_required
+@replica_reads
 def report_list(request):
     """Report list view"""
     try:
@@ -215,6 +225,7 @@ def logout_view(request):
 
 
 @login_required
+@replica_reads
 def admin_dashboard(request):
     """Admin dashboard view"""
     if not request.user.is_staff:
@@ -222,9 +233,11 @@ def admin_dashboard(request):
         return redirect('client_portal')
 
     clients = Client.objects.all()
-    total_campaigns = Campaign.objects.count()
-    total_reports = CampaignReport.objects.count()
-    total_predictions = MLPrediction.objects.count()
+    total_campaigns, total_reports, total_predictions = 0, 0, 0
+    for _ in for_each_shard():
+        total_campaigns += Campaign.objects.count()
+        total_reports += CampaignReport.objects.count()
+        total_predictions += MLPrediction.objects.count()
 
     context = {
         'clients': clients,
@@ -277,21 +290,134 @@ def unified_data_upload(request):
         return redirect('client_portal')
 
     if request.method == 'POST':
-        # Handle file upload
-        uploaded_file = request.FILES.get('data_file')
-        if uploaded_file:
-            # Process the uploaded file
-            messages.success(request, 'Data uploaded successfully!')
-            return redirect('unified_data_list')
+        form = UnifiedDataUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            from .models import UnifiedClientData
+            from .tasks import process_unified_upload
+            uploaded_file = form.cleaned_data['data_file']
+            platform = form.cleaned_data['platform']
+            upload = UnifiedClientData.objects.create(
+                client=client,
+                source='upload',
+                file_name=uploaded_file.name,
+                source_file=uploaded_file,
+                status='processing',
+                platforms_included=[platform] if platform else [],
+            )
+            transaction.on_commit(lambda: process_unified_upload.delay(upload.pk))
+            messages.info(request, f'{uploaded_file.name} is being imported.')
+            return redirect(f"{reverse('unified_data_upload')}?upload={upload.pk}")
         else:
-            messages.error(request, 'Please select a file to upload.')
+            messages.error(request, 'Please select a CSV or Excel file to upload.')
+    else:
+        form = UnifiedDataUploadForm()
 
+    from .chunked_upload import get_part_size
+    upload_id = request.GET.get('upload')
     context = {
         'client': client,
+        'form': form,
+        'upload_id': int(upload_id) if upload_id and upload_id.isdigit() else None,
+        'chunked_part_size': get_part_size(),
     }
     return render(request, 'dashboard/unified_data_upload.html', context)
 
 
+def _request_client(request):
+    """Client of the logged-in user, or None"""
+    try:
+        return request.user.profile.client
+    except UserProfile.DoesNotExist:
+        return None
+
+
+def _no_client_response():
+    return JsonResponse(
+        {'status': 'error', 'message': 'No client associated with your account.'},
+        status=403
+    )
+
+
+@login_required
+def unified_data_upload_progress(request, upload_id):
+    """Upload progress as JSON, for polling while the import runs"""
+    from .models import UnifiedClientData
+    client = _request_client(request)
+    if not client:
+        return _no_client_response()
+
+    progress = UnifiedClientData.objects.filter(
+        pk=upload_id, client=client, source='upload'
+    ).values(
+        'status', 'rows_parsed', 'total_records', 'error_message',
+        'processing_started_at', 'processing_completed_at'
+    ).first()
+    if progress is None:
+        return JsonResponse(
+            {'status': 'error', 'message': 'Upload not found.'}, status=404
+        )
+    return JsonResponse(progress)
+
+
+@login_required
+@require_POST
+def chunked_upload_start(request):
+    """Start a resumable upload from a JSON description of the file"""
+    from .chunked_upload import ChunkedUploadError, chunked_status, start_chunked_upload
+    client = _request_client(request)
+    if not client:
+        return _no_client_response()
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid JSON.'}, status=400)
+
+    platform = data.get('platform') or ''
+    if platform and platform not in dict(Campaign.PLATFORM_CHOICES):
+        return JsonResponse(
+            {'status': 'error', 'message': f"Unknown platform '{platform}'."}, status=400
+        )
+    try:
+        chunked = start_chunked_upload(
+            client, data.get('file_name', ''), data.get('total_parts'),
+            data.get('checksum'), platform
+        )
+    except ChunkedUploadError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=e.status)
+    return JsonResponse(chunked_status(chunked), status=201)
+
+
+@login_required
+def chunked_upload_status(request, chunked_id):
+    """State of a resumable upload, so an interrupted client can resume"""
+    from .chunked_upload import chunked_status
+    from .models import ChunkedUpload
+    client = _request_client(request)
+    if not client:
+        return _no_client_response()
+    chunked = ChunkedUpload.objects.filter(pk=chunked_id, client=client).first()
+    if chunked is None:
+        return JsonResponse({'status': 'error', 'message': 'Upload not found.'}, status=404)
+    return JsonResponse(chunked_status(chunked))
+
+
+@login_required
+@require_http_methods(['PUT', 'POST'])
+def chunked_upload_part(request, chunked_id, part):
+    """Receive one numbered part of a resumable upload as the raw request body"""
+    from .chunked_upload import ChunkedUploadError, chunked_status, receive_part
+    client = _request_client(request)
+    if not client:
+        return _no_client_response()
+    try:
+        chunked = receive_part(
+            client, chunked_id, part, request, request.headers.get('X-Content-SHA256')
+        )
+    except ChunkedUploadError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=e.status)
+    return JsonResponse(chunked_status(chunked))
+
+
 @login_required
 def generate_prediction(request, data_id):
     """Generate prediction view"""
@@ -927,6 +1053,8 @@ def sync_all_data(request):
         messages.error(request, 'No client associated with your account.')
         return redirect('client_portal')
     if request.method == 'POST':
+        # Read the synced rows back from the primary until the replica catches up
+        stick_to_primary(request)
         # Call real sync logic for each integration
         sync_results = sync_all_integrations_for_client(client)  # Implement this for real integrations
         return JsonResponse({
@@ -939,9 +1067,75 @@ def sync_all_data(request):
     return redirect('client_portal')
 
 
+DASHBOARD_QUERY_PARAMS = ('start', 'end', 'granularity', 'platform', 'fields')
+
+
+def _query_list(request, name, allowed):
+    values = [
+        value.strip() for param in request.GET.getlist(name)
+        for value in param.split(',') if value.strip()
+    ]
+    unknown = [value for value in values if value not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown {name}: {', '.join(unknown)}. Choose from {', '.join(allowed)}.")
+    return values or list(allowed)
+
+
+def _query_date(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{name} must be a YYYY-MM-DD date.')
+
+
+def dashboard_query(request):
+    """Validated dashboard_data_api query; raises ValueError on bad parameters."""
+    granularity = request.GET.get('granularity') or 'day'
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}.")
+    start, end = _query_date(request, 'start'), _query_date(request, 'end')
+    if start and end and start > end:
+        raise ValueError('start must not be after end.')
+    return {
+        'start': start,
+        'end': end,
+        'granularity': granularity,
+        'platforms': _query_list(request, 'platform', list(PLATFORM_DATA_MODELS)),
+        'fields': _query_list(request, 'fields', CANONICAL_METRICS),
+    }
+
+
+def get_dashboard_series(client, query):
+    """Chart data for a dashboard_query: totals and per-period sums."""
+    series = client_series(client, query['platforms'])
+    data = bucketed_metrics(
+        series, query['fields'], query['granularity'],
+        day_number(query['start']) if query['start'] else None,
+        day_number(query['end']) if query['end'] else None,
+    )
+    return {
+        **data,
+        'granularity': query['granularity'],
+        'start': query['start'].isoformat() if query['start'] else None,
+        'end': query['end'].isoformat() if query['end'] else None,
+        'platforms': query['platforms'],
+        'fields': query['fields'],
+    }
+
+
 @login_required
+@replica_reads
 def dashboard_data_api(request):
-    """Dashboard data API endpoint"""
+    """Dashboard data API endpoint
+
+    With any of start/end (YYYY-MM-DD), granularity (day, week or month),
+    platform and fields (comma-separated or repeated), the data is
+    aggregated server-side into per-period sums of the requested metrics.
+    Without them every daily record is returned.
+    """
     try:
         profile = request.user.profile
         client = profile.client
@@ -954,8 +1148,21 @@ def dashboard_data_api(request):
             {'status': 'error', 'message': 'No client associated with your account.'},
             status=400
         )
-    # Only real dashboard data from integrations
-    dashboard_data = get_real_dashboard_data(client)  # Implement this to fetch real data
+    if any(param in request.GET for param in DASHBOARD_QUERY_PARAMS):
+        try:
+            query = dashboard_query(request)
+        except ValueError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        name = 'dashboard_series:' + ':'.join(
+            str(value) if not isinstance(value, list) else ','.join(value)
+            for value in query.values()
+        )
+        return JsonResponse({
+            'status': 'success',
+            'data': cached(client, name, get_dashboard_series, query),
+        })
+    # Only real dashboard data from integrations, recomputed after each sync
+    dashboard_data = cached(client, 'dashboard_data', get_real_dashboard_data)
     if not dashboard_data:
         return JsonResponse(
             {'status': 'success', 'data': None, 'message': 'No data available from connected tools.'}
@@ -1138,114 +1345,28 @@ def train_ml_models(request):
 
 
 # --- Real Data Aggregation Functions ---
+def _series_kpis(series):
+    kpis = {'impressions': 0, 'clicks': 0, 'spend': 0, 'revenue': 0}
+    for k in kpis:
+        kpis[k] = sum(platform_series.total(k) for platform_series in series.values())
+    return kpis
+
+
 def get_real_dashboard_data(client):
     """Aggregate dashboard data only from Google Ads, LinkedIn, Mailchimp, Zoho, and Demandbase for the given client."""
-    all_data = []
-    for model in [GoogleAdsData, LinkedInAdsData, MailchimpData, ZohoData, DemandbaseData]:
-        tool_data = model.objects.filter(client=client).order_by('-fetched_at')
-        for entry in tool_data:
-            entry_data = entry.data if isinstance(entry.data, list) else [entry.data] if isinstance(entry.data, dict) else []
-            all_data.extend(entry_data)
-    # Aggregate KPIs
-    kpis = {'impressions': 0, 'clicks': 0, 'spend': 0, 'revenue': 0}
-    for record in all_data:
-        for k in kpis:
-            try:
-                kpis[k] += float(record.get(k, 0) or 0)
-            except Exception:
-                continue
-    return {'kpis': kpis, 'records': all_data}
+    series = client_series(client, list(PLATFORM_DATA_MODELS))
+    kpis = _series_kpis(series)
+    data = pd.concat([platform_series.frame() for platform_series in series.values()], ignore_index=True)
+    return {'kpis': kpis, 'records': frame_to_records(data)}
 
 
 def get_real_advanced_analytics(client):
     """Perform advanced analytics only on data from the five tools for the given client, and return actionable insights."""
-    dashboard_data = get_real_dashboard_data(client)
-    records = dashboard_data['records']
-    kpis = dashboard_data['kpis']
-    insights = []
-    if not records:
-        return {
-            'summary': kpis,
-            'record_count': 0,
-            'insights': [],
-        }
-    # --- Compute trends ---
-    # Group by platform
-    from collections import defaultdict
-    platform_stats = defaultdict(lambda: {
-        'impressions': 0, 'clicks': 0, 'spend': 0, 'revenue': 0,
-        'conversions': 0, 'dates': [], 'roi': 0, 'ctr': 0
-    })
-    for r in records:
-        platform = r.get('platform', 'unknown')
-        platform_stats[platform]['impressions'] += float(r.get('impressions', 0) or 0)
-        platform_stats[platform]['clicks'] += float(r.get('clicks', 0) or 0)
-        platform_stats[platform]['spend'] += float(r.get('spend', 0) or 0)
-        platform_stats[platform]['revenue'] += float(r.get('revenue', 0) or 0)
-        platform_stats[platform]['conversions'] += float(r.get('conversions', 0) or 0)
-        if r.get('date'):
-            platform_stats[platform]['dates'].append(r['date'])
-    # Calculate derived metrics
-    for p, stats in platform_stats.items():
-        stats['ctr'] = (stats['clicks'] / stats['impressions']) if stats['impressions'] > 0 else 0
-        stats['roi'] = (stats['revenue'] / stats['spend']) if stats['spend'] > 0 else 0
-    # Best/worst performing platform
-    best_platform = max(
-        platform_stats.items(),
-        key=lambda x: x[1]['roi'] if x[1]['spend'] > 0 else -1,
-        default=(None, None)
-    )[0]
-    worst_platform = min(
-        platform_stats.items(),
-        key=lambda x: x[1]['roi'] if x[1]['spend'] > 0 else float('inf'),
-        default=(None, None)
-    )[0]
-    # Spend efficiency
-    if best_platform:
-        insights.append({
-            'type': 'opportunity',
-            'title': f'Best Performing Platform: {best_platform}',
-            'description': f'{best_platform} has the highest ROI of {platform_stats[best_platform]["roi"]:.2f}. Consider increasing budget allocation.',
-            'priority': 'high',
-        })
-    if worst_platform and platform_stats[worst_platform]['spend'] > 0:
-        insights.append({
-            'type': 'warning',
-            'title': f'Least Efficient Platform: {worst_platform}',
-            'description': f'{worst_platform} has the lowest ROI of {platform_stats[worst_platform]["roi"]:.2f}. Review campaign strategy or reduce spend.',
-            'priority': 'medium',
-        })
-    # Conversion rate
-    total_conversions = sum(stats['conversions'] for stats in platform_stats.values())
-    total_clicks = sum(stats['clicks'] for stats in platform_stats.values())
-    conversion_rate = (total_conversions / total_clicks) if total_clicks > 0 else 0
-    insights.append({
-        'type': 'metric',
-        'title': 'Overall Conversion Rate',
-        'description': f'Your overall conversion rate is {conversion_rate:.2%}.',
-        'priority': 'info',
-    })
-    # Spend trend (last 30 days vs previous 30 days)
-    today = datetime.today().date()
-    last_30 = [
-        r for r in records if r.get('date') and
-        (today - datetime.strptime(r['date'], '%Y-%m-%d').date()).days <= 30
-    ]
-    prev_30 = [
-        r for r in records if r.get('date') and
-        30 < (today - datetime.strptime(r['date'], '%Y-%m-%d').date()).days <= 60
-    ]
-    spend_last_30 = sum(float(r.get('spend', 0) or 0) for r in last_30)
-    spend_prev_30 = sum(float(r.get('spend', 0) or 0) for r in prev_30)
-    if spend_prev_30 > 0:
-        spend_trend = (spend_last_30 - spend_prev_30) / spend_prev_30
-        trend_desc = 'increased' if spend_trend > 0 else 'decreased'
-        insights.append({
-            'type': 'trend',
-            'title': 'Spend Trend',
-            'description': f'Your spend has {trend_desc} by {abs(spend_trend):.2%} compared to the previous month.',
-            'priority': 'info',
-        })
+    # Columnar over the hot tier series, without building per-record dicts
+    series = client_series(client, list(PLATFORM_DATA_MODELS))
+    analytics = advanced_analytics(series, _series_kpis(series), day_number(datetime.today().date()))
+    if not analytics['record_count']:
+        return analytics
     # ML predictions (if available)
     from .models import Campaign
     from .services import ml_service
@@ -1270,10 +1391,7 @@ def get_real_advanced_analytics(client):
                 'insights': ml_result.get('insights'),
             })
     return {
-        'summary': kpis,
-        'record_count': len(records),
-        'insights': insights,
-        'platform_stats': dict(platform_stats),
+        **analytics,
         'ml_insights': ml_insights,
     }
 
@@ -1331,6 +1449,7 @@ def advanced_analytics_view(request):
 
 @login_required
 @require_POST
+@replica_reads
 def advanced_analytics_api(request):
     """Advanced analytics API endpoint"""
     try:
@@ -0,0 +1,164 @@
+"""
+Streaming and parallel parsing of Excel workbooks.
+
+Client workbooks often carry one sheet per platform. Each sheet is read in
+openpyxl read-only mode, its platform is detected from the header row (see
+schema.detect_platform) and its rows are normalized chunk by chunk. Sheets
+are parsed in a pool of worker processes, so a workbook takes roughly as
+long as its largest sheet rather than the sum of all sheets.
+
+Workers write normalized chunks to pickle files in a scratch directory and
+return only their paths; storing the rows stays in the calling process,
+which owns the database connection. This module does not import Django so
+that spawned workers start quickly.
+
+Celery's prefork pool runs tasks in daemonic processes, which the
+standard library does not let start children. There the pool comes from
+billiard, Celery's fork of multiprocessing, which has no such limit. Only
+when billiard is missing are the sheets of a daemonic process parsed one
+after another, and a warning says so.
+"""
+
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import current_process, get_context
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from .cleaning import empty_report
+from .profiling import empty_profile
+from .schema import detect_platform, normalize_frame
+
+logger = logging.getLogger(__name__)
+
+try:
+    import billiard
+    BILLIARD_AVAILABLE = True
+except ImportError:
+    BILLIARD_AVAILABLE = False
+
+
+def iter_excel_chunks(fileobj, chunk_size, sheet_name=None):
+    """Yield DataFrames of at most chunk_size rows from one worksheet.
+
+    The workbook is opened in read-only mode so openpyxl streams rows from
+    the underlying XML instead of building the whole sheet in memory.
+    """
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(name) if name is not None else f'column_{i}'
+            for i, name in enumerate(header)
+        ]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns)
+    finally:
+        workbook.close()
+
+
+def sheet_names(path):
+    """Return the worksheet names of the workbook at path."""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def parse_sheet(path, sheet_name, chunk_size, out_dir, fallback_platform=None):
+    """Normalize one worksheet into pickled chunks under out_dir.
+
+    The platform is detected from the sheet's header; fallback_platform is
+    used when no signature matches. Returns a dict with the sheet name, the
+    platform (None if the sheet was skipped), the chunk file paths, the row
+    count, the cleaning report and the data profile.
+    """
+    result = {
+        'sheet': sheet_name,
+        'platform': None,
+        'parts': [],
+        'rows': 0,
+        'cleaning': empty_report(),
+        'profile': empty_profile(),
+    }
+    for index, chunk in enumerate(iter_excel_chunks(path, chunk_size, sheet_name)):
+        if index == 0:
+            result['platform'] = detect_platform(chunk.columns) or fallback_platform
+            if result['platform'] is None:
+                break
+        chunk = normalize_frame(
+            chunk.dropna(how='all'), result['platform'],
+            result['cleaning'], result['profile']
+        )
+        if chunk.empty:
+            continue
+        handle, part = tempfile.mkstemp(suffix='.pkl', dir=out_dir)
+        os.close(handle)
+        chunk.to_pickle(part)
+        result['parts'].append(part)
+        result['rows'] += len(chunk)
+    return result
+
+
+def iter_parsed_sheets(path, chunk_size, out_dir, fallback_platform=None, max_workers=1):
+    """Parse every sheet of a workbook, yielding parse_sheet results.
+
+    With more than one sheet and max_workers > 1 the sheets are parsed in a
+    spawned process pool and yielded as they finish; otherwise they are
+    parsed one after another in this process.
+    """
+    names = sheet_names(path)
+    workers = min(max_workers, len(names))
+    if workers > 1 and current_process().daemon:
+        if BILLIARD_AVAILABLE:
+            yield from _parse_in_billiard_pool(
+                path, names, chunk_size, out_dir, fallback_platform, workers
+            )
+            return
+        logger.warning(
+            f"billiard is not installed; parsing {len(names)} sheets one after "
+            f"another in this daemonic process"
+        )
+        workers = 1
+    if workers <= 1:
+        for name in names:
+            yield parse_sheet(path, name, chunk_size, out_dir, fallback_platform)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        futures = [
+            pool.submit(parse_sheet, path, name, chunk_size, out_dir, fallback_platform)
+            for name in names
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _parse_sheet_args(args):
+    return parse_sheet(*args)
+
+
+def _parse_in_billiard_pool(path, names, chunk_size, out_dir, fallback_platform, workers):
+    """Yield parse_sheet results from a billiard pool, which daemonic processes may start."""
+    pool = billiard.get_context('spawn').Pool(workers)
+    try:
+        yield from pool.imap_unordered(_parse_sheet_args, [
+            (path, name, chunk_size, out_dir, fallback_platform) for name in names
+        ])
+    finally:
+        pool.terminate()
+        pool.join()
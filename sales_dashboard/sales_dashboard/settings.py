@@ -63,6 +63,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'dashboard.sharding.ClientShardMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -97,6 +98,52 @@ DATABASES = {
     }
 }
 
+# Optional read replica for the heavy dashboard/analytics reads (see
+# dashboard.db_routing). Point REPLICA_SQLITE_PATH at a copy of db.sqlite3
+# to try it locally.
+if os.environ.get('REPLICA_SQLITE_PATH'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['REPLICA_SQLITE_PATH'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Client-keyed shards for per-client data (see dashboard.sharding). Set
+# SHARD_SQLITE_PATHS to a comma-separated list of database files to try it
+# locally; each becomes shard_1, shard_2, ... next to 'default'.
+SHARD_DATABASE_ALIASES = ['default']
+for number, path in enumerate(filter(None, os.environ.get('SHARD_SQLITE_PATHS', '').split(',')), 1):
+    DATABASES[f'shard_{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+    }
+    SHARD_DATABASE_ALIASES.append(f'shard_{number}')
+# Seconds a process may use a cached client -> shard entry
+SHARD_DIRECTORY_TTL = int(os.environ.get('SHARD_DIRECTORY_TTL', 5))
+
+DATABASE_ROUTERS = ['dashboard.sharding.ShardRouter', 'dashboard.db_routing.ReplicaRouter']
+
+# Local memory cache in development; production uses Redis
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sales-dashboard',
+    }
+}
+# Cache of computed dashboard data, keyed by client data version (see
+# dashboard.data_cache)
+DASHBOARD_CACHE_ALIAS = 'default'
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', 3600))
+# Log the process's cache hit rate every this many lookups (0 disables)
+DASHBOARD_CACHE_STATS_EVERY = int(os.environ.get('DASHBOARD_CACHE_STATS_EVERY', 1000))
+
+# Memory budget of each process's in-memory daily metric series (see
+# dashboard.hot_tier)
+HOT_TIER_MAX_BYTES = int(os.environ.get('HOT_TIER_MAX_BYTES', 64 * 1024 * 1024))
+REPLICA_DATABASE_ALIAS = 'replica'
+# How long a user's replica-routed views read from the primary after a sync
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 30))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,6 +192,29 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Unified data uploads are read and written this many rows at a time
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 50000))
+
+# Keep each fetch/upload chunk as a JSON snapshot in the *Data tables as well
+# as in the DailyMetric fact table
+STORE_RAW_SNAPSHOTS = os.environ.get('STORE_RAW_SNAPSHOTS', 'True') == 'True'
+# Where raw snapshots go: 'db' (JSON rows in the *Data tables) or 'parquet'
+# (compressed files under SNAPSHOT_STORE_DIR, requires pyarrow)
+SNAPSHOT_STORE = os.environ.get('SNAPSHOT_STORE', 'db')
+SNAPSHOT_STORE_DIR = os.environ.get('SNAPSHOT_STORE_DIR', str(BASE_DIR / 'snapshot_store'))
+
+# Raw snapshot retention: days kept by default and per platform (clients can
+# override both with RetentionPolicy rows). Expired snapshots are archived
+# under RETENTION_ARCHIVE_DIR and deleted RETENTION_BATCH_SIZE rows at a time.
+DATA_RETENTION_DAYS = int(os.environ.get('DATA_RETENTION_DAYS', 90))
+DATA_RETENTION_PLATFORM_DAYS = {}
+RETENTION_ARCHIVE_DIR = os.environ.get('RETENTION_ARCHIVE_DIR', str(BASE_DIR / 'retention_archive'))
+RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', 1000))
+
+# Largest part accepted by the resumable upload endpoint (keep below the
+# nginx client_max_body_size)
+CHUNKED_UPLOAD_PART_SIZE = int(os.environ.get('CHUNKED_UPLOAD_PART_SIZE', 8 * 1024 * 1024))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -201,13 +271,15 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 #     }
 # }
 
-# Celery Configuration (commented out - not installed)
-# CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
-# CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
-# CELERY_ACCEPT_CONTENT = ['json']
-# CELERY_TASK_SERIALIZER = 'json'
-# CELERY_RESULT_SERIALIZER = 'json'
-# CELERY_TIMEZONE = 'UTC'
+# Celery Configuration
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_TIMEZONE = 'UTC'
+# Without a broker in local development, tasks run inline when enqueued
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'True') == 'True'
 
 # Celery Beat Settings (commented out - not installed)
 # CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
@@ -46,6 +46,7 @@ except ImportError:
         'django.middleware.common.CommonMiddleware',
         'django.middleware.csrf.CsrfViewMiddleware',
         'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'dashboard.sharding.ClientShardMiddleware',
         'django.contrib.messages.middleware.MessageMiddleware',
         'django.middleware.clickjacking.XFrameOptionsMiddleware',
     ]
@@ -93,6 +94,16 @@ try:
             default=config('DATABASE_URL', default='sqlite:///db.sqlite3')
         )
     }
+    replica_url = config('REPLICA_DATABASE_URL', default='')
+    if replica_url:
+        DATABASES['replica'] = dj_database_url.parse(replica_url)
+        DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    # Comma-separated URLs of the client shards, aliased shard_1, shard_2, ...
+    shard_urls = config('SHARD_DATABASE_URLS', default='')
+    SHARD_DATABASE_ALIASES = ['default']
+    for number, shard_url in enumerate(filter(None, shard_urls.split(',')), 1):
+        DATABASES[f'shard_{number}'] = dj_database_url.parse(shard_url)
+        SHARD_DATABASE_ALIASES.append(f'shard_{number}')
 except ImportError:
     # Fallback to SQLite if dj-database-url is not available
     DATABASES = {
@@ -140,6 +151,7 @@ DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@yourdomain.co
 REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL)
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default=REDIS_URL)
+CELERY_TASK_ALWAYS_EAGER = False
 
 # Logging configuration
 LOGGING = {
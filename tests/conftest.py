@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from dashboard import data_cache, hot_tier
+from dashboard.facts import upsert_daily_metrics
+from dashboard.models import Client, UserProfile
+from dashboard.schema import normalize_frame
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'shards: place clients on the SHARD_SQLITE_PATHS databases')
+
+
+@pytest.fixture(autouse=True)
+def single_shard(request, settings):
+    # Like the replica's TEST MIRROR: with SHARD_SQLITE_PATHS set, only tests
+    # marked shards spread clients over the shard databases
+    if request.node.get_closest_marker('shards') is None:
+        settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS]
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    # Client ids and data versions repeat across tests, so cached entries
+    # could outlive their data
+    cache.clear()
+    hot_tier.clear()
+    data_cache.reset_stats()
+    yield
+    hot_tier.clear()
+
+
+@pytest.fixture
+def acme(db):
+    # Not named client: that is pytest-django's test client
+    return Client.objects.create(name='Acme', email='acme@example.com', company='Acme')
+
+
+@pytest.fixture
+def portal_user(acme, client, settings, tmp_path):
+    """Log the test client in as a user of acme, with uploads under tmp_path."""
+    settings.MEDIA_ROOT = tmp_path
+    user = User.objects.create_user(username='acme', password='testpass')
+    UserProfile.objects.create(user=user, client=acme)
+    client.force_login(user)
+    return acme
+
+
+@pytest.fixture
+def google_rows():
+    """Build a raw Google Ads export from [date, campaign, clicks, cost] rows."""
+    def build(rows):
+        return pd.DataFrame(rows, columns=['Date', 'Campaign', 'Clicks', 'Cost'])
+    return build
+
+
+@pytest.fixture
+def write_facts():
+    """Normalize raw export rows of a platform and upsert them as daily facts."""
+    def write(client, platform, rows, columns=None):
+        frame = pd.DataFrame(rows, columns=columns)
+        return upsert_daily_metrics(client, platform, normalize_frame(frame, platform))
+    return write
@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from dashboard import hot_tier
+from dashboard.analytics import advanced_analytics, records_advanced_analytics
+from dashboard.management.commands.benchmark_analytics import synthetic_series
+from dashboard.views import get_real_advanced_analytics, get_real_dashboard_data
+
+
+def test_spend_trend_compares_last_30_days_with_previous_30(acme, write_facts):
+    rows = pd.DataFrame([
+        {
+            'Date': (date.today() - timedelta(days=days_ago)).isoformat(),
+            'Campaign': 'Brand',
+            'Cost': 10 if days_ago <= 30 else 5,
+        }
+        for days_ago in range(90)
+    ])
+    write_facts(acme, 'google_ads', rows)
+
+    insights = get_real_advanced_analytics(acme)['insights']
+    trend = next(insight for insight in insights if insight['type'] == 'trend')
+    # 31 days at 10 vs 30 days at 5
+    assert '106.67%' in trend['description']
+    assert 'increased' in trend['description']
+
+
+def test_columnar_analytics_match_the_record_loop():
+    today = hot_tier.day_number(date.today())
+    series = synthetic_series(5000, today)
+    kpis = {'spend': 1.0}
+    frame = pd.concat([s.frame() for s in series.values()], ignore_index=True)
+    expected = records_advanced_analytics(frame.to_dict(orient='records'), kpis, today)
+    actual = advanced_analytics(series, kpis, today)
+
+    assert actual['record_count'] == expected['record_count'] == 5000
+    assert actual['insights'] == expected['insights']
+    assert list(actual['platform_stats']) == list(expected['platform_stats'])
+    for platform, stats in expected['platform_stats'].items():
+        assert list(actual['platform_stats'][platform]) == list(stats)
+        assert actual['platform_stats'][platform] == pytest.approx(stats, rel=1e-9)
+
+
+def test_view_analytics_match_the_dashboard_records(acme, write_facts):
+    rows = pd.DataFrame([
+        {'Date': '2025-01-01', 'Campaign': 'Brand', 'Impressions': 100, 'Clicks': 5, 'Cost': 10, 'Revenue': 30},
+        {'Date': '2025-01-02', 'Campaign': 'Brand', 'Impressions': 50, 'Clicks': 2, 'Cost': 5, 'Revenue': 5},
+    ])
+    write_facts(acme, 'google_ads', rows)
+    write_facts(acme, 'zoho', rows)
+
+    dashboard = get_real_dashboard_data(acme)
+    expected = records_advanced_analytics(
+        dashboard['records'], dashboard['kpis'], hot_tier.day_number(date.today())
+    )
+    actual = get_real_advanced_analytics(acme)
+    assert actual.pop('ml_insights') == []
+    assert actual == expected
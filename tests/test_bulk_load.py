@@ -0,0 +1,44 @@
+from datetime import date
+
+import pandas as pd
+
+from dashboard.bulk_load import _conflict_clause, _load_fields, bulk_load, csv_buffer
+from dashboard.models import DailyMetric, RecordFingerprint
+
+
+def test_csv_buffer_keeps_empty_strings_apart_from_nulls():
+    frame = pd.DataFrame({'clicks': [1.5, None], 'campaign': ['', 'Brand, EU'], 'date': [date(2025, 1, 1)] * 2})
+    assert csv_buffer(frame).getvalue() == '1.5,,2025-01-01\n\\N,"Brand, EU",2025-01-01\n'
+
+
+def test_missing_fields_get_defaults_and_timestamps():
+    fields, frame = _load_fields(DailyMetric, pd.DataFrame({
+        'client_id': [1], 'platform': ['google_ads'], 'date': [date(2025, 1, 1)], 'clicks': [3.0],
+    }))
+    assert [field.attname for field in fields] == list(frame.columns)
+    row = frame.iloc[0]
+    assert (row['campaign'], row['spend'], row['clicks']) == ('', 0, 3.0)
+    assert row['updated_at'] is not None
+
+
+def test_conflict_clause_upserts_on_unique_columns():
+    quote = '"{}"'.format
+    clause = _conflict_clause(DailyMetric, quote, ['client', 'date'], ['clicks'], False)
+    assert clause == ' ON CONFLICT ("client_id", "date") DO UPDATE SET "clicks" = EXCLUDED."clicks"'
+    assert _conflict_clause(RecordFingerprint, quote, None, None, True) == ' ON CONFLICT DO NOTHING'
+
+
+def test_fallback_upserts_and_ignores_conflicts(acme):
+    rows = pd.DataFrame({
+        'client_id': acme.pk, 'platform': 'google_ads',
+        'date': [date(2025, 1, 1), date(2025, 1, 2)], 'clicks': [1.0, 2.0],
+    })
+    unique = ['client', 'platform', 'date', 'campaign']
+    assert bulk_load(DailyMetric, rows, unique_fields=unique, update_fields=['clicks']) == 2
+    rows['clicks'] = [5.0, 6.0]
+    bulk_load(DailyMetric, rows, unique_fields=unique, update_fields=['clicks'])
+    assert sorted(DailyMetric.objects.values_list('clicks', flat=True)) == [5.0, 6.0]
+
+    fingerprints = pd.DataFrame({'client_id': acme.pk, 'platform': 'google_ads', 'row_hash': [1, 1, 2], 'batch': 'x'})
+    bulk_load(RecordFingerprint, fingerprints, ignore_conflicts=True)
+    assert RecordFingerprint.objects.count() == 2
@@ -0,0 +1,134 @@
+import hashlib
+import io
+import os
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from dashboard.chunked_upload import PARTIAL_DIR, receive_part
+from dashboard.models import ChunkedUpload, Client, GoogleAdsData, UnifiedClientData
+
+CSV = (
+    b"Date,Campaign,Impressions,Clicks,Cost\n"
+    + b"".join(
+        f"2025-01-{day:02d},Brand,{1000 + day},{10 + day},{day}.5\n".encode()
+        for day in range(1, 21)
+    )
+)
+PART_SIZE = 128
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def split(data):
+    return [data[i:i + PART_SIZE] for i in range(0, len(data), PART_SIZE)]
+
+
+@pytest.fixture(autouse=True)
+def small_parts(settings):
+    settings.CHUNKED_UPLOAD_PART_SIZE = PART_SIZE
+
+
+def start(client, parts, checksum=None):
+    response = client.post(reverse('chunked_upload_start'), {
+        'file_name': 'export.csv',
+        'platform': 'google_ads',
+        'total_parts': len(parts),
+        'checksum': checksum or sha256(''.join(sha256(p) for p in parts).encode()),
+    }, content_type='application/json')
+    assert response.status_code == 201
+    return response.json()['id']
+
+
+def put_part(client, chunked_id, number, data, digest=None):
+    return client.put(
+        reverse('chunked_upload_part', args=[chunked_id, number]), data,
+        content_type='application/octet-stream',
+        HTTP_X_CONTENT_SHA256=digest or sha256(data),
+    )
+
+
+def test_parts_are_assembled_verified_and_ingested(portal_user, client,
+                                                   django_capture_on_commit_callbacks):
+    parts = split(CSV)
+    assert len(parts) > 3
+    chunked_id = start(client, parts)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for number, data in enumerate(parts):
+            response = put_part(client, chunked_id, number, data)
+            assert response.status_code == 200
+
+    state = response.json()
+    assert state['status'] == 'complete'
+    assert state['bytes_received'] == len(CSV)
+    upload = UnifiedClientData.objects.get(pk=state['upload_id'])
+    assert upload.status == 'synced'
+    assert upload.total_records == 20
+    assert upload.source_file.read() == CSV
+    assert GoogleAdsData.objects.filter(client=portal_user).exists()
+
+
+def test_interrupted_upload_resumes_from_last_good_part(portal_user, client):
+    parts = split(CSV)
+    chunked_id = start(client, parts)
+    assert put_part(client, chunked_id, 0, parts[0]).status_code == 200
+
+    # A corrupted part is rejected and leaves nothing behind
+    response = put_part(client, chunked_id, 1, parts[1][:-5], digest=sha256(parts[1]))
+    assert response.status_code == 400
+    # Parts must arrive in order
+    assert put_part(client, chunked_id, 2, parts[2]).status_code == 409
+    # Re-sending a stored part is acknowledged
+    assert put_part(client, chunked_id, 0, parts[0]).status_code == 200
+
+    state = client.get(reverse('chunked_upload_status', args=[chunked_id])).json()
+    assert state['received_parts'] == 1
+    assert state['bytes_received'] == len(parts[0])
+
+
+def test_whole_file_checksum_mismatch_fails_upload(portal_user, client):
+    parts = split(CSV)[:2]
+    chunked_id = start(client, parts, checksum=sha256(b'something else'))
+    assert put_part(client, chunked_id, 0, parts[0]).status_code == 200
+    response = put_part(client, chunked_id, 1, parts[1])
+
+    assert response.status_code == 400
+    chunked = ChunkedUpload.objects.get(pk=chunked_id)
+    assert chunked.status == 'failed'
+    assert chunked.upload is None
+    assert not UnifiedClientData.objects.filter(client=portal_user).exists()
+
+
+def test_oversized_parts_are_rejected(portal_user, client):
+    data = b'x' * (PART_SIZE + 1)
+    chunked_id = start(client, [data])
+    assert put_part(client, chunked_id, 0, data).status_code == 413
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parts_are_read_before_the_upload_is_locked(portal_user, client, settings):
+    class Body(io.BytesIO):
+        def read(self, size=-1):
+            # A slow client must not keep the upload row locked
+            assert not connection.in_atomic_block
+            return super().read(size)
+
+    data = CSV[:PART_SIZE]
+    chunked_id = start(client, [data, CSV[PART_SIZE:2 * PART_SIZE]])
+    chunked = receive_part(portal_user, chunked_id, 0, Body(data), sha256(data))
+
+    assert chunked.received_parts == 1
+    assert os.listdir(os.path.join(settings.MEDIA_ROOT, PARTIAL_DIR)) == [f'{chunked_id}.part']
+
+
+def test_uploads_are_scoped_to_the_users_client(portal_user, client):
+    other = Client.objects.create(name='Other', email='o@example.com', company='Other')
+    chunked = ChunkedUpload.objects.create(
+        client=other, file_name='x.csv', total_parts=1, checksum='0' * 64
+    )
+    assert client.get(reverse('chunked_upload_status', args=[chunked.pk])).status_code == 404
+    assert put_part(client, chunked.pk, 0, b'data').status_code == 404
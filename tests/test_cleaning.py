@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from dashboard.cleaning import clean_frame, clean_numeric
+from dashboard.schema import normalize_frame
+
+
+def test_formatted_strings_are_parsed_column_wise():
+    values, counts = clean_numeric(
+        ['$125,000', '3.6x', '15.34%', '2,500', '(1,200)', '42', 42.5, None, 'N/A']
+    )
+    expected = [125000, 3.6, 15.34, 2500, -1200, 42, 42.5, np.nan, np.nan]
+    np.testing.assert_array_equal(values, np.array(expected, dtype='float64'))
+    assert counts == {'coerced': 5, 'rejected': 0}
+
+
+def test_unparseable_values_are_counted_as_rejected():
+    values, counts = clean_numeric(['12', 'twelve', '1.2.3', ''])
+    assert values[0] == 12
+    assert np.isnan(values[1:]).all()
+    assert counts == {'coerced': 0, 'rejected': 2}
+
+
+def test_numeric_columns_pass_through_untouched():
+    values, counts = clean_numeric(pd.Series([1, 2, 3]))
+    assert values.dtype == np.float64
+    assert counts == {'coerced': 0, 'rejected': 0}
+
+
+def test_summary_report_metrics():
+    path = settings.BASE_DIR / 'sample_data' / 'techflow_summary_report.json'
+    with open(path) as f:
+        report = json.load(f)
+    frame = pd.DataFrame([report['total_metrics']])
+    cleaning = clean_frame(frame, list(frame.columns))
+    assert frame.loc[0, 'total_spend'] == 125000
+    assert frame.loc[0, 'overall_roas'] == 3.6
+    assert cleaning['coerced'] == 5
+    assert cleaning['columns']['total_leads'] == {'coerced': 1, 'rejected': 0}
+
+
+def test_normalize_frame_reports_cleaning_counts():
+    raw = pd.DataFrame({
+        'Date': ['2025-01-06', '2025-01-07'],
+        'Cost': ['$1,000.50', 'oops'],
+        'Revenue': ['2,000', '10'],
+    })
+    report = {'coerced': 0, 'rejected': 0, 'columns': {}}
+    frame = normalize_frame(raw, 'google_ads', report)
+    assert frame['spend'].tolist() == [1000.5, 0.0]
+    assert frame['revenue'].tolist() == [2000.0, 10.0]
+    assert report['coerced'] == 2
+    assert report['columns']['spend']['rejected'] == 1
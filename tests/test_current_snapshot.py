@@ -0,0 +1,81 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from dashboard.models import CurrentSnapshot, GoogleAdsData
+from dashboard.schema import normalize_frame
+from dashboard.snapshot_store import diff_frames, load_snapshot_frame, snapshot_history
+from dashboard import tasks
+from dashboard.tasks import cleanup_old_data, store_sync_snapshot
+
+
+def test_sync_moves_pointer_to_the_latest_full_fetch(acme, google_rows):
+    assert not CurrentSnapshot.objects.filter(client=acme).exists()
+
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-01', 'Brand', 10, 5.0]]))
+    store_sync_snapshot(acme, 'google_ads', google_rows([
+        ['2025-01-01', 'Brand', 10, 5.0],
+        ['2025-01-02', 'Brand', 7, 3.0],
+    ]))
+    pointer = CurrentSnapshot.objects.get(client=acme, platform='google_ads')
+    assert pointer.row_count == 2
+
+    current = load_snapshot_frame(
+        acme, 'google_ads', pointer.store, pointer.snapshot_id, columns=['date', 'clicks']
+    )
+    assert list(current.columns) == ['date', 'clicks']
+    assert current['clicks'].tolist() == [10.0, 7.0]
+
+    # An unchanged fetch archives nothing and keeps the pointer
+    assert store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-02', 'Brand', 7, 3.0]])) == 0
+    assert len(snapshot_history(acme, 'google_ads')) == 2
+    pointer.refresh_from_db()
+    assert pointer.row_count == 2
+
+
+def test_cleanup_keeps_current_snapshot(acme, settings, tmp_path, google_rows):
+    settings.RETENTION_ARCHIVE_DIR = str(tmp_path)
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-01', 'Brand', 10, 5.0]]))
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-02', 'Brand', 7, 3.0]]))
+    GoogleAdsData.objects.update(fetched_at=timezone.now() - timedelta(days=120))
+
+    cleanup_old_data()
+
+    pointer = CurrentSnapshot.objects.get(client=acme, platform='google_ads')
+    assert list(GoogleAdsData.objects.values_list('pk', flat=True)) == [pointer.snapshot_id]
+
+
+def test_diff_frames_reports_added_removed_and_changed_keys(google_rows):
+    old = normalize_frame(google_rows([
+        ['2025-01-01', 'Brand', 10, 5.0],
+        ['2025-01-02', 'Brand', 7, 3.0],
+    ]), 'google_ads')
+    new = normalize_frame(google_rows([
+        ['2025-01-02', 'Brand', 9, 3.0],
+        ['2025-01-03', 'Brand', 1, 1.0],
+    ]), 'google_ads')
+
+    diff = diff_frames(old, new)
+    assert diff['added']['date'].tolist() == ['2025-01-03']
+    assert diff['removed']['date'].tolist() == ['2025-01-01']
+    changed = diff['changed']
+    assert list(changed.columns) == ['date', 'campaign', 'clicks_old', 'clicks_new']
+    assert changed[['clicks_old', 'clicks_new']].values.tolist() == [[7.0, 9.0]]
+
+
+def test_diff_snapshots_command_compares_latest_two_fetches(acme, google_rows):
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-01', 'Brand', 10, 5.0]]))
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-01', 'Brand', 12, 5.0]]))
+
+    out = io.StringIO()
+    call_command('diff_snapshots', client_id=acme.pk, platform='google_ads', stdout=out)
+    assert 'changed: 1 rows' in out.getvalue()
+    assert 'added: 0 rows' in out.getvalue()
+
+
+def test_sync_without_integrations_is_logged_as_an_error(monkeypatch, caplog):
+    monkeypatch.setattr(tasks, 'API_INTEGRATIONS_AVAILABLE', False)
+    assert tasks.sync_google_ads_data() == 'Google Ads sync skipped'
+    assert [record.levelname for record in caplog.records] == ['ERROR']
@@ -0,0 +1,99 @@
+import json
+
+import pandas as pd
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from dashboard import data_cache
+from dashboard.analytics import bucketed_metrics
+from dashboard.hot_tier import day_number
+from dashboard.management.commands.benchmark_analytics import synthetic_series
+from dashboard.models import UserProfile
+
+pytestmark = pytest.mark.django_db(transaction=True, databases='__all__')
+
+
+@pytest.fixture
+def account(acme, write_facts, google_rows):
+    # 2024-12-30 and 2025-01-06 are Mondays
+    write_facts(acme, 'google_ads', google_rows([
+        ['2024-12-31', 'Brand', 10, 5.0],
+        ['2025-01-01', 'Brand', 20, 10.0],
+        ['2025-01-06', 'Search', 40, 20.0],
+    ]))
+    write_facts(acme, 'linkedin_ads', google_rows([['2025-01-01', 'Ads', 30, 30.0]]))
+    return acme
+
+
+@pytest.fixture
+def logged_in(client, account):
+    user = User.objects.create_user('analyst', password='secret')
+    UserProfile.objects.create(user=user, client=account)
+    client.force_login(user)
+    return client
+
+
+def query(client, **params):
+    return client.get(reverse('dashboard_data_api'), params)
+
+
+def test_week_buckets_of_projected_fields(logged_in):
+    data = query(logged_in, granularity='week', fields='clicks,spend').json()['data']
+    assert data['kpis'] == {'clicks': 100.0, 'spend': 65.0}
+    assert data['series'] == [
+        {'period': '2024-12-30', 'clicks': 60.0, 'spend': 45.0},
+        {'period': '2025-01-06', 'clicks': 40.0, 'spend': 20.0},
+    ]
+    assert data['granularity'] == 'week'
+
+
+def test_month_buckets_within_a_window_for_one_platform(logged_in):
+    data = query(
+        logged_in, granularity='month', platform='google_ads',
+        start='2025-01-01', end='2025-01-31', fields='spend',
+    ).json()['data']
+    assert data['series'] == [{'period': '2025-01-01', 'spend': 30.0}]
+    assert data['platforms'] == ['google_ads']
+    assert (data['start'], data['end']) == ('2025-01-01', '2025-01-31')
+
+
+def test_days_are_summed_across_platforms(logged_in):
+    data = query(logged_in, start='2025-01-01', end='2025-01-01', fields='clicks').json()['data']
+    assert data['series'] == [{'period': '2025-01-01', 'clicks': 50.0}]
+
+
+@pytest.mark.parametrize('params', [
+    {'granularity': 'year'},
+    {'platform': 'myspace'},
+    {'fields': 'clicks,likes'},
+    {'start': '01/02/2025'},
+    {'start': '2025-02-01', 'end': '2025-01-01'},
+])
+def test_bad_queries_are_rejected(logged_in, params):
+    response = query(logged_in, **params)
+    assert response.status_code == 400
+    assert response.json()['status'] == 'error'
+
+
+def test_no_parameters_keep_the_records_response(logged_in):
+    data = query(logged_in).json()['data']
+    assert len(data['records']) == 4
+
+
+def test_queries_are_cached_until_the_next_sync(logged_in, account, write_facts, google_rows):
+    data_cache.reset_stats()
+    assert query(logged_in, fields='spend').json()['data']['kpis'] == {'spend': 65.0}
+    assert query(logged_in, fields='spend').json()['data']['kpis'] == {'spend': 65.0}
+    assert data_cache.stats() == {'hits': 1, 'misses': 1}
+    write_facts(account, 'google_ads', google_rows([['2025-01-07', 'Brand', 1, 1.0]]))
+    assert query(logged_in, fields='spend').json()['data']['kpis'] == {'spend': 66.0}
+
+
+def test_bucketed_payload_is_a_fraction_of_the_records():
+    today = day_number(pd.Timestamp('2025-06-30').date())
+    series = synthetic_series(20000, today)
+    records = pd.concat([s.frame() for s in series.values()], ignore_index=True)
+    raw = json.dumps(records.astype({'date': str}).to_dict('records'))
+    monthly = json.dumps(bucketed_metrics(series, ['spend'], 'month'))
+    assert len(monthly) * 1000 < len(raw)
@@ -0,0 +1,60 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from dashboard import data_cache
+from dashboard.models import UserProfile
+
+
+@pytest.fixture
+def logged_in(client, acme):
+    user = User.objects.create_user('analyst', password='secret')
+    UserProfile.objects.create(user=user, client=acme)
+    client.force_login(user)
+    return client
+
+
+def test_hits_are_served_until_the_next_sync(acme, write_facts):
+    calls = []
+
+    def compute(client):
+        calls.append(client.data_version)
+        return {'version': client.data_version}
+
+    first = data_cache.cached(acme, 'probe', compute)
+    assert data_cache.cached(acme, 'probe', compute) == first
+    assert len(calls) == 1
+
+    write_facts(acme, 'google_ads', [{'Date': '2025-01-01', 'Campaign': 'Brand', 'Cost': 10}])
+    assert data_cache.cached(acme, 'probe', compute) == {'version': acme.data_version}
+    assert len(calls) == 2
+    assert data_cache.stats() == {'hits': 1, 'misses': 2}
+
+
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_dashboard_api_hits_cost_one_cache_get(logged_in, acme, monkeypatch, write_facts):
+    write_facts(acme, 'google_ads', [{'Date': '2025-01-01', 'Campaign': 'Brand', 'Cost': 10}])
+    url = reverse('dashboard_data_api')
+    assert logged_in.get(url).json()['data']['kpis']['spend'] == 10.0
+
+    gets = []
+    real_get = cache.get
+    monkeypatch.setattr(cache, 'get', lambda *args, **kwargs: gets.append(args) or real_get(*args, **kwargs))
+    assert logged_in.get(url).json()['data']['kpis']['spend'] == 10.0
+    assert [args[0] for args in gets] == [data_cache.cache_key(acme, 'dashboard_data')]
+    monkeypatch.undo()
+
+    write_facts(acme, 'google_ads', [{'Date': '2025-01-01', 'Campaign': 'Brand', 'Cost': 25}])
+    assert logged_in.get(url).json()['data']['kpis']['spend'] == 25.0
+    assert data_cache.stats() == {'hits': 1, 'misses': 2}
+
+
+def test_hit_rate_is_logged_every_n_lookups(acme, settings, caplog):
+    settings.DASHBOARD_CACHE_STATS_EVERY = 4
+    with caplog.at_level('INFO', logger='dashboard.data_cache'):
+        for _ in range(3):
+            data_cache.cached(acme, 'probe', lambda client: 1)
+        assert not caplog.records
+        data_cache.cached(acme, 'probe', lambda client: 1)
+    assert caplog.messages == ['Dashboard cache: 3 hits, 1 misses (75% hit rate) in this process']
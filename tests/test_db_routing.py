@@ -0,0 +1,78 @@
+from time import time
+
+import pytest
+from django.conf import settings as django_settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dashboard.db_routing import PRIMARY_UNTIL_SESSION_KEY, replica_reads, stick_to_primary
+from dashboard.models import Campaign, UserProfile
+
+
+pytestmark = pytest.mark.filterwarnings('ignore:Overriding setting DATABASES')
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASES = {**settings.DATABASES, 'replica': {'ENGINE': 'django.db.backends.sqlite3'}}
+
+
+def make_request():
+    request = RequestFactory().get('/')
+    request.session = SessionStore()
+    return request
+
+
+@replica_reads
+def routing_view(request):
+    return router.db_for_read(Campaign), router.db_for_write(Campaign)
+
+
+def test_decorated_views_read_from_replica_and_write_to_primary(replica):
+    assert routing_view(make_request()) == ('replica', DEFAULT_DB_ALIAS)
+    # Outside the view everything stays on the primary
+    assert router.db_for_read(Campaign) in (None, DEFAULT_DB_ALIAS)
+
+
+def test_reads_stay_on_primary_after_a_sync(replica, settings):
+    request = make_request()
+    stick_to_primary(request)
+    assert routing_view(request)[0] in (None, DEFAULT_DB_ALIAS)
+
+    settings.REPLICA_STICKY_SECONDS = -1
+    stick_to_primary(request)
+    assert routing_view(request)[0] == 'replica'
+
+
+def test_without_replica_reads_use_default(settings):
+    settings.REPLICA_DATABASE_ALIAS = 'missing'
+    assert routing_view(make_request())[0] in (None, DEFAULT_DB_ALIAS)
+
+
+def test_sync_all_data_pins_the_session_to_primary(client, acme):
+    user = User.objects.create_user('analyst', password='secret')
+    UserProfile.objects.create(user=user, client=acme)
+    client.force_login(user)
+
+    response = client.post(reverse('sync_all_data'))
+    assert response.status_code == 200
+    assert client.session[PRIMARY_UNTIL_SESSION_KEY] > time()
+
+
+@pytest.mark.skipif(
+    'replica' not in django_settings.DATABASES,
+    reason='set REPLICA_SQLITE_PATH to run against a replica database'
+)
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_dashboard_queries_run_on_the_replica(client, acme):
+    user = User.objects.create_user('analyst', password='secret')
+    UserProfile.objects.create(user=user, client=acme)
+    client.force_login(user)
+
+    with CaptureQueriesContext(connections['replica']) as replica_queries:
+        assert client.get(reverse('client_portal')).status_code == 200
+    assert any('dashboard_campaign' in query['sql'] for query in replica_queries)
@@ -0,0 +1,127 @@
+import io
+
+import pandas as pd
+import pytest
+
+from dashboard.dedup import row_hashes
+from dashboard.ingestion import ingest_upload
+from dashboard.models import DailyMetric, GoogleAdsData, RecordFingerprint, UnifiedClientData
+from dashboard.schema import normalize_frame
+
+CSV = (
+    "Date,Campaign,Impressions,Clicks,Cost\n"
+    "2025-01-01,Brand,1000,10,5.5\n"
+    "2025-01-02,Brand,1200,12,6.0\n"
+    "2025-01-02,Brand,1200,12,6.0\n"
+)
+
+
+def make_frame(rows):
+    return normalize_frame(
+        pd.DataFrame(rows, columns=['Date', 'Campaign', 'Impressions']), 'google_ads'
+    )
+
+
+def test_row_hash_depends_on_client_and_content():
+    frame = make_frame([['2025-01-01', 'Brand', 100], ['2025-01-01', 'Brand', 101]])
+    hashes = row_hashes(frame, 1, 'google_ads')
+    assert hashes.dtype == 'int64'
+    assert hashes[0] != hashes[1]
+    assert (row_hashes(frame, 1, 'google_ads') == hashes).all()
+    assert (row_hashes(frame, 2, 'google_ads') != hashes).all()
+
+
+@pytest.mark.django_db
+def test_reuploading_a_file_stores_nothing_new(acme):
+    def upload():
+        record = UnifiedClientData.objects.create(
+            client=acme, source='upload', file_name='export.csv'
+        )
+        ingest_upload(record, io.BytesIO(CSV.encode()), 'google_ads')
+        return record
+
+    first = upload()
+    # Both 2025-01-02 rows add up to one fact
+    assert first.total_records == 3
+    assert first.data_summary['duplicates_skipped'] == 0
+    assert DailyMetric.objects.get(client=acme, date='2025-01-02').clicks == 24.0
+
+    second = upload()
+    assert second.status == 'synced'
+    assert second.total_records == 0
+    assert second.data_summary['duplicates_skipped'] == 3
+    assert GoogleAdsData.objects.filter(client=acme).count() == 1
+
+
+@pytest.mark.django_db
+def test_failed_writes_leave_no_fingerprints_behind(acme, monkeypatch):
+    from dashboard import dedup
+
+    record = UnifiedClientData.objects.create(client=acme, source='upload', file_name='export.csv')
+    real_upsert = dedup.upsert_facts
+
+    def fail_once(*args):
+        monkeypatch.setattr(dedup, 'upsert_facts', real_upsert)
+        raise RuntimeError('database went away')
+
+    # The dateless row is fingerprinted, the others are kept as facts
+    csv = CSV + ",Brand,900,9,4.5\n"
+    monkeypatch.setattr(dedup, 'upsert_facts', fail_once)
+    with pytest.raises(RuntimeError):
+        ingest_upload(record, io.BytesIO(csv.encode()), 'google_ads')
+    assert not RecordFingerprint.objects.filter(client=acme).exists()
+
+    assert ingest_upload(record, io.BytesIO(csv.encode()), 'google_ads') == 4
+    assert DailyMetric.objects.filter(client=acme).count() == 2
+    assert RecordFingerprint.objects.filter(client=acme).count() == 1
+
+
+def upload_rows(client, rows, chunk_size=None):
+    csv = "Date,Campaign,Cost\n" + ''.join(f"{day},{campaign},{cost}\n" for day, campaign, cost in rows)
+    record = UnifiedClientData.objects.create(client=client, source='upload', file_name='export.csv')
+    ingest_upload(record, io.BytesIO(csv.encode()), 'google_ads', chunk_size=chunk_size)
+    return record
+
+
+def stored_spend(client):
+    return dict(DailyMetric.objects.filter(client=client).values_list('campaign', 'spend'))
+
+
+@pytest.mark.django_db
+def test_rows_of_one_fact_add_up_across_chunks(acme):
+    upload_rows(acme, [
+        ['2025-01-01', 'Brand', 5],
+        ['2025-01-01', 'Search', 1],
+        ['2025-01-01', 'Brand', 7],
+    ], chunk_size=1)
+    assert stored_spend(acme) == {'Brand': 12.0, 'Search': 1.0}
+
+
+@pytest.mark.django_db
+def test_corrected_export_replaces_the_facts_it_changes(acme):
+    upload_rows(acme, [
+        ['2025-01-01', 'Brand', 5],
+        ['2025-01-01', 'Brand', 7],
+        ['2025-01-01', 'Search', 1],
+    ])
+    # One Brand row is corrected; its unchanged sibling still counts
+    corrected = upload_rows(acme, [
+        ['2025-01-01', 'Brand', 5],
+        ['2025-01-01', 'Brand', 8],
+        ['2025-01-01', 'Search', 1],
+    ], chunk_size=2)
+
+    assert stored_spend(acme) == {'Brand': 13.0, 'Search': 1.0}
+    assert corrected.total_records == 2
+    assert corrected.data_summary['duplicates_skipped'] == 1
+    assert corrected.data_summary['spend'] == 13.0
+
+
+@pytest.mark.django_db
+def test_reverted_correction_is_stored_again(acme):
+    for cost in (10, 20, 10):
+        record = upload_rows(acme, [['2025-01-01', 'Brand', cost]])
+        assert record.total_records == 1
+
+    assert stored_spend(acme) == {'Brand': 10.0}
+    assert record.data_summary['spend'] == 10.0
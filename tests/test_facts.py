@@ -0,0 +1,87 @@
+import io
+from datetime import date
+
+from django.core.management import call_command
+
+from dashboard.facts import metrics_frame, upsert_daily_metrics
+from dashboard.ingestion import ingest_upload
+from dashboard.models import DailyMetric, GoogleAdsData, UnifiedClientData
+from dashboard.schema import normalize_frame
+from dashboard.tasks import aggregate_unified_data_for_client, store_sync_snapshot
+
+
+def test_rows_are_summed_per_day_and_campaign_then_upserted(acme, google_rows):
+    frame = normalize_frame(google_rows([
+        ['2025-01-01', 'Brand', 10, 5.0],
+        ['2025-01-01', 'Brand', 5, 2.5],
+        ['2025-01-01', 'Display', 1, 1.0],
+        [None, 'Brand', 100, 100.0],
+    ]), 'google_ads')
+    assert upsert_daily_metrics(acme, 'google_ads', frame) == 2
+
+    brand = DailyMetric.objects.get(client=acme, campaign='Brand')
+    assert (brand.date, brand.clicks, brand.spend) == (date(2025, 1, 1), 15.0, 7.5)
+
+    # A later fetch of the same day replaces its numbers
+    corrected = normalize_frame(google_rows([['2025-01-01', 'Brand', 20, 9.0]]), 'google_ads')
+    upsert_daily_metrics(acme, 'google_ads', corrected)
+    brand.refresh_from_db()
+    assert (brand.clicks, brand.spend) == (20.0, 9.0)
+    assert DailyMetric.objects.filter(client=acme).count() == 2
+
+
+def test_sync_stores_the_complete_numbers_of_changed_facts(acme, google_rows):
+    store_sync_snapshot(acme, 'google_ads', google_rows([
+        ['2025-01-01', 'Brand', 10, 5.0],
+        ['2025-01-01', 'Brand', 10, 7.0],
+    ]))
+    assert store_sync_snapshot(acme, 'google_ads', google_rows([
+        ['2025-01-01', 'Brand', 10, 5.0],
+        ['2025-01-01', 'Brand', 10, 8.0],
+    ])) == 2
+    brand = DailyMetric.objects.get(client=acme)
+    assert (brand.clicks, brand.spend) == (20.0, 13.0)
+
+
+def test_metrics_frame_filters_by_platform_and_dates(acme, google_rows):
+    upsert_daily_metrics(acme, 'google_ads', normalize_frame(google_rows([
+        ['2025-01-01', 'Brand', 1, 1.0],
+        ['2025-01-05', 'Brand', 2, 2.0],
+    ]), 'google_ads'))
+    upsert_daily_metrics(acme, 'linkedin_ads', normalize_frame(google_rows([
+        ['2025-01-03', 'B2B', 3, 3.0],
+    ]), 'linkedin_ads'))
+
+    frame = metrics_frame(acme, start=date(2025, 1, 2))
+    assert sorted(frame['date']) == ['2025-01-03', '2025-01-05']
+    assert metrics_frame(acme, platforms=['linkedin_ads'])['clicks'].tolist() == [3.0]
+    assert metrics_frame(acme, end=date(2024, 12, 31)).empty
+
+
+def test_sync_and_upload_fill_facts_and_raw_archive_is_optional(acme, settings, google_rows):
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-01', 'Brand', 10, 5.0]]))
+    assert GoogleAdsData.objects.filter(client=acme).count() == 1
+
+    settings.STORE_RAW_SNAPSHOTS = False
+    upload = UnifiedClientData.objects.create(client=acme, source='upload', file_name='x.csv')
+    csv = "Date,Campaign,Clicks,Cost\n2025-01-02,Brand,4,2.0\n"
+    ingest_upload(upload, io.BytesIO(csv.encode()), 'google_ads')
+
+    assert GoogleAdsData.objects.filter(client=acme).count() == 1
+    assert DailyMetric.objects.filter(client=acme).count() == 2
+
+    aggregate_unified_data_for_client(acme)
+    summary = UnifiedClientData.objects.get(client=acme, source='sync')
+    assert summary.total_records == 2
+    assert summary.data_summary['clicks'] == 14.0
+    assert summary.platforms_included == ['GoogleAds']
+    assert str(summary.date_range_end) == '2025-01-02'
+
+
+def test_backfill_command_loads_existing_snapshots(acme):
+    GoogleAdsData.objects.create(client=acme, data=[
+        {'Date': '2025-01-01', 'Campaign': 'Brand', 'Clicks': 3, 'Cost': '$1.50'},
+    ])
+    call_command('backfill_daily_metrics', stdout=io.StringIO())
+    fact = DailyMetric.objects.get(client=acme)
+    assert (fact.platform, fact.clicks, fact.spend) == ('google_ads', 3.0, 1.5)
@@ -0,0 +1,44 @@
+import json
+
+import pandas as pd
+
+from dashboard.fields import CompressedJSON, compress_json, decompress_json
+from dashboard.models import GoogleAdsData, MonthlySummary
+from dashboard.schema import frame_to_records, normalize_frame
+
+
+def google_payload(days):
+    return frame_to_records(normalize_frame(pd.DataFrame({
+        'Date': pd.date_range('2025-01-01', periods=days).strftime('%Y-%m-%d'),
+        'Campaign': ['Brand Search', 'Display Retargeting'] * (days // 2),
+        'Impressions': range(days),
+        'Clicks': range(days),
+        'Cost': [12.5] * days,
+    }), 'google_ads'))
+
+
+def test_round_trip_and_compression_ratio():
+    payload = google_payload(200)
+    raw = compress_json(payload)
+    assert decompress_json(raw) == payload
+    assert len(raw) * 5 < len(json.dumps(payload))
+
+
+def test_plain_json_written_before_compression_still_decodes():
+    assert decompress_json(b'[{"clicks": 3}]') == [{'clicks': 3}]
+
+
+def test_payload_is_decoded_lazily_on_first_access(acme):
+    payload = google_payload(10)
+    GoogleAdsData.objects.create(client=acme, data=payload)
+
+    snapshot = GoogleAdsData.objects.get()
+    assert isinstance(snapshot.__dict__['data'], CompressedJSON)
+    # Saving other fields keeps the stored bytes without decoding them
+    snapshot.save()
+    assert isinstance(snapshot.__dict__['data'], CompressedJSON)
+    assert snapshot.data == payload
+    assert snapshot.__dict__['data'] == payload
+
+    summary = MonthlySummary.objects.create(client=acme, month='2025-01-01')
+    assert MonthlySummary.objects.get(pk=summary.pk).platform_data == {}
@@ -0,0 +1,59 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from dashboard import hot_tier
+from dashboard.facts import metrics_frame
+
+
+@pytest.fixture
+def acme(acme, write_facts):
+    rows = pd.DataFrame([
+        {'Date': '2025-01-03', 'Campaign': 'Brand', 'Clicks': 3, 'Cost': 30},
+        {'Date': '2025-01-01', 'Campaign': 'Brand', 'Clicks': 1, 'Cost': 10},
+        {'Date': '2025-01-02', 'Campaign': 'Search', 'Clicks': 2, 'Cost': 20},
+    ])
+    write_facts(acme, 'google_ads', rows)
+    return acme
+
+
+def test_series_are_sorted_by_day_and_sliced_by_window(acme):
+    series = hot_tier.client_series(acme, ['google_ads', 'zoho'])
+    google = series['google_ads']
+    assert google.days.dtype == 'int32'
+    assert list(google.days) == [hot_tier.day_number(f'2025-01-0{day}') for day in (1, 2, 3)]
+    assert google.total('spend') == 60.0
+    assert len(series['zoho']) == 0
+
+    window = google.window(hot_tier.day_number('2025-01-02'), hot_tier.day_number(date(2025, 1, 3)))
+    assert window.total('clicks') == 5.0
+    assert window.frame()['campaign'].tolist() == ['Search', 'Brand']
+
+
+def test_frame_matches_the_fact_table(acme):
+    frame = hot_tier.client_series(acme, ['google_ads'])['google_ads'].frame()
+    expected = metrics_frame(acme).sort_values('date', ignore_index=True)
+    pd.testing.assert_frame_equal(frame, expected)
+
+
+def test_new_facts_invalidate_the_entry(acme, django_assert_num_queries, write_facts):
+    first = hot_tier.client_series(acme, ['google_ads'])['google_ads']
+    with django_assert_num_queries(0):
+        assert hot_tier.client_series(acme, ['google_ads'])['google_ads'] is first
+
+    rows = pd.DataFrame([{'Date': '2025-01-04', 'Campaign': 'Brand', 'Cost': 40}])
+    write_facts(acme, 'google_ads', rows)
+    assert hot_tier.client_series(acme, ['google_ads'])['google_ads'].total('spend') == 100.0
+
+
+def test_least_recently_used_entries_are_evicted(acme, settings, write_facts):
+    rows = pd.DataFrame([{'Date': '2025-01-01', 'Campaign': 'Brand', 'Cost': 5}])
+    write_facts(acme, 'linkedin_ads', rows)
+    google = hot_tier.client_series(acme, ['google_ads'])['google_ads']
+    settings.HOT_TIER_MAX_BYTES = google.nbytes
+
+    hot_tier.client_series(acme, ['linkedin_ads'])
+    assert hot_tier.stats()['bytes'] <= google.nbytes
+    assert (acme.pk, 'google_ads') not in hot_tier._entries
+    assert (acme.pk, 'linkedin_ads') in hot_tier._entries
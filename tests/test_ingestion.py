@@ -0,0 +1,106 @@
+import io
+
+import pytest
+from openpyxl import Workbook
+
+from dashboard.ingestion import ingest_upload, iter_upload_chunks
+from dashboard.models import GoogleAdsData, UnifiedClientData
+
+CSV_HEADER = "Date,Campaign,Impressions,Clicks,Cost,Conversions,Revenue\n"
+
+
+def make_csv(rows):
+    lines = [
+        f"2025-01-{day:02d},Brand_Search,{1000 + day},{10 + day},{day}.5,1,{day * 3}\n"
+        for day in range(1, rows + 1)
+    ]
+    return io.BytesIO((CSV_HEADER + ''.join(lines)).encode())
+
+
+def make_upload(client, filename):
+    return UnifiedClientData.objects.create(
+        client=client, source='upload', file_name=filename, status='processing'
+    )
+
+
+def test_csv_is_read_in_fixed_size_chunks():
+    chunks = list(iter_upload_chunks(make_csv(25), 'export.csv', chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+
+def test_unsupported_extension_is_rejected():
+    with pytest.raises(ValueError):
+        iter_upload_chunks(io.BytesIO(b''), 'export.json', chunk_size=10)
+
+
+def test_ingest_csv_writes_each_chunk_and_records_progress(acme):
+    upload = make_upload(acme, 'export.csv')
+    total = ingest_upload(upload, make_csv(25), 'google_ads', chunk_size=10)
+
+    assert total == 25
+    assert GoogleAdsData.objects.filter(client=upload.client).count() == 3
+    assert upload.status == 'synced'
+    assert upload.total_records == 25
+    assert upload.processing_started_at and upload.processing_completed_at
+    assert str(upload.date_range_start) == '2025-01-01'
+    assert str(upload.date_range_end) == '2025-01-25'
+    record = GoogleAdsData.objects.filter(client=upload.client).first().data[0]
+    assert record['platform'] == 'google_ads'
+    assert 'date' in record
+
+
+def test_rows_parsed_is_recorded_after_each_chunk(acme, monkeypatch):
+    from dashboard import ingestion
+
+    upload = make_upload(acme, 'export.csv')
+    progress = []
+    real_facts_frame, real_store = ingestion.facts_frame, ingestion.store_upload_rows
+
+    def record(*fields):
+        progress.append(UnifiedClientData.objects.values_list(*fields).get(pk=upload.pk))
+
+    def facts_frame(chunk):
+        record('rows_parsed')
+        return real_facts_frame(chunk)
+
+    def store_upload_rows(*args):
+        record('rows_parsed', 'total_records')
+        return real_store(*args)
+
+    monkeypatch.setattr(ingestion, 'facts_frame', facts_frame)
+    monkeypatch.setattr(ingestion, 'store_upload_rows', store_upload_rows)
+    ingest_upload(upload, make_csv(25), 'google_ads', chunk_size=10)
+
+    assert progress == [(10,), (20,), (25,), (25, 0)]
+    assert upload.rows_parsed == 25
+
+
+def test_ingest_xlsx_streams_rows(acme):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['Date', 'Campaign', 'Impressions', 'Clicks'])
+    for day in range(1, 8):
+        sheet.append([f'2025-02-{day:02d}', 'Display', 100 * day, day])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    upload = make_upload(acme, 'export.xlsx')
+    assert ingest_upload(upload, buffer, 'google_ads', chunk_size=3) == 7
+    assert GoogleAdsData.objects.filter(client=upload.client).count() == 3
+
+
+def test_failed_ingest_marks_upload_failed(acme):
+    upload = make_upload(acme, 'export.xlsx')
+    with pytest.raises(Exception):
+        ingest_upload(upload, make_csv(5), 'google_ads')
+    upload.refresh_from_db()
+    assert upload.status == 'failed'
+    assert upload.error_message
+
+
+def test_csv_platform_is_detected_when_not_given(acme):
+    upload = make_upload(acme, 'export.csv')
+    ingest_upload(upload, make_csv(5), chunk_size=10)
+    assert upload.platforms_included == ['google_ads']
+    assert GoogleAdsData.objects.filter(client=upload.client).count() == 1
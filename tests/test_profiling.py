@@ -0,0 +1,74 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.cleaning import empty_report
+from dashboard.ingestion import ingest_upload
+from dashboard.models import UnifiedClientData
+from dashboard.profiling import (
+    SKETCH_SIZE, empty_profile, finalize_profile, merge_profiles, update_profile,
+)
+from dashboard.schema import normalize_frame
+
+
+def test_profile_counts_nulls_parse_failures_and_outliers():
+    frame = pd.DataFrame({
+        'Date': ['2025-01-01', '2025-01-02', 'not a date', None],
+        'Campaign': ['Brand', 'Brand', None, 'Display'],
+        'Clicks': ['10', '12', 'n/a', '11'],
+        'Cost': ['$5', '$6', 'oops', '$7'],
+    })
+    profile = empty_profile()
+    normalize_frame(frame, 'google_ads', empty_report(), profile)
+    stats = finalize_profile(profile)
+
+    assert stats['rows'] == 4
+    date = stats['columns']['date']
+    assert date['parse_failures'] == 1
+    assert date['null_rate'] == 0.5
+    assert date['distinct'] == 2
+    assert stats['columns']['campaign']['null_rate'] == 0.25
+    clicks = stats['columns']['clicks']
+    assert (clicks['min'], clicks['max'], clicks['parse_failures']) == (10.0, 12.0, 0)
+    assert clicks['null_rate'] == 0.25
+    spend = stats['columns']['spend']
+    assert spend['parse_failures'] == 1
+
+
+def test_outliers_use_tukey_fences():
+    values = pd.DataFrame({'spend': [10.0, 11.0, 12.0, 10.5, 11.5, 9.5, 500.0, -300.0]})
+    stats = finalize_profile(update_profile(empty_profile(), values))
+    assert stats['columns']['spend']['outliers'] == 2
+
+
+def test_profiles_merge_across_chunks():
+    values = pd.DataFrame({'value': np.arange(10000, dtype='float64')})
+    whole = update_profile(empty_profile(), values)
+    merged = merge_profiles(
+        update_profile(empty_profile(), values.iloc[:4000]),
+        update_profile(empty_profile(), values.iloc[4000:]),
+    )
+    assert finalize_profile(merged) == finalize_profile(whole)
+    distinct = finalize_profile(merged)['columns']['value']['distinct']
+    assert distinct == pytest.approx(10000, rel=0.1)
+    assert len(merged['columns']['value']['sketch']) == SKETCH_SIZE
+
+
+def test_upload_profile_is_saved_next_to_summary(acme):
+    upload = UnifiedClientData.objects.create(
+        client=acme, source='upload', file_name='export.csv'
+    )
+    csv = (
+        "Date,Campaign,Impressions,Clicks,Cost\n"
+        "2025-01-01,Brand,1000,10,5.5\n"
+        "2025-01-02,Brand,,12,bad\n"
+    )
+    ingest_upload(upload, io.BytesIO(csv.encode()), 'google_ads', chunk_size=1)
+
+    profile = upload.data_profile['google_ads']
+    assert profile['rows'] == 2
+    assert profile['columns']['impressions']['null_rate'] == 0.5
+    assert profile['columns']['spend']['parse_failures'] == 1
+    assert profile['columns']['clicks']['min'] == 10.0
@@ -0,0 +1,197 @@
+"""
+Query-plan regression tests for the hot per-client reads.
+
+Each hot view is requested on a seeded dataset while its queries are
+captured; every captured SELECT is then run through EXPLAIN and the test
+fails when the plan reads one of the per-client tables without filtering
+it through an index, whether by a table scan or by walking a whole index.
+"""
+
+import json
+import re
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dashboard.facts import upsert_daily_metrics
+from dashboard.models import (
+    Campaign, CampaignReport, Client, DailyMetric, MLPrediction, MonthlySummary,
+    UserProfile, PLATFORM_DATA_MODELS,
+)
+from dashboard.rollups import GRAINS
+from dashboard.schema import normalize_frame
+
+HOT_TABLES = {
+    Campaign._meta.db_table,
+    CampaignReport._meta.db_table,
+    MLPrediction._meta.db_table,
+    MonthlySummary._meta.db_table,
+    DailyMetric._meta.db_table,
+} | {model._meta.db_table for model in PLATFORM_DATA_MODELS.values()} | {
+    model._meta.db_table for model in GRAINS.values()
+}
+
+# (url name, method, parameters) of each hot request
+HOT_VIEWS = [
+    ('client_portal', 'get', {}),
+    ('report_list', 'get', {}),
+    ('ml_predictions', 'get', {}),
+    ('monthly_analysis', 'get', {}),
+    ('dashboard_data_api', 'get', {}),
+    ('dashboard_data_api', 'get', {'granularity': 'day', 'platform': 'google_ads'}),
+    ('dashboard_data_api', 'get', {'granularity': 'week'}),
+    ('dashboard_data_api', 'get', {'granularity': 'month', 'fields': 'spend,clicks'}),
+    ('advanced_analytics_api', 'post', {'analytic_type': 'trends'}),
+]
+
+
+def explain(sql):
+    """Return the query plan of sql as a list of lines."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        # Seeded tables are tiny, so make the planner show whether an index is usable
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_plan_lines(plan[0]['Plan']))
+
+
+def _plan_lines(node):
+    """One line per PostgreSQL plan node, with its index condition if any."""
+    line = node['Node Type']
+    if 'Relation Name' in node:
+        line += f" on {node['Relation Name']}"
+    if 'Index Cond' in node:
+        line += f" ({node['Index Cond']})"
+    yield line
+    for child in node.get('Plans', []):
+        yield from _plan_lines(child)
+
+
+def full_scans(plan):
+    """Plan lines that read a hot table without filtering it through an index.
+
+    A scan of a whole index (SQLite's SCAN ... USING INDEX, or an index
+    scan without an index condition) reads every client's rows just like
+    a table scan, so it fails too.
+    """
+    if connection.vendor == 'sqlite':
+        pattern = re.compile(r'^SCAN (\w+)')
+    else:
+        pattern = re.compile(r'^(?:Seq Scan|Index Scan|Index Only Scan) on (\w+)$')
+    return [
+        line for line in plan
+        if (match := pattern.search(line.strip())) and match.group(1) in HOT_TABLES
+    ]
+
+
+def assert_indexed(queries):
+    for query in queries:
+        sql = query['sql']
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        plan = explain(sql)
+        assert not full_scans(plan), f'Full scan in:\n{sql}\nPlan:\n' + '\n'.join(plan)
+
+
+@pytest.fixture
+def seeded():
+    """Two clients with campaigns, reports, predictions, summaries and snapshots."""
+    clients = [
+        Client.objects.create(name=name, email=f'{name}@example.com', company=name)
+        for name in ('acme', 'globex')
+    ]
+    today = date.today()
+    for client in clients:
+        for index, (platform, _) in enumerate(Campaign.PLATFORM_CHOICES * 4):
+            campaign = Campaign.objects.create(
+                client=client, name=f'{platform} {index}', platform=platform,
+                status='active' if index % 3 else 'paused',
+                start_date=today - timedelta(days=index * 7),
+                spend=100, revenue=250,
+            )
+            CampaignReport.objects.create(
+                campaign=campaign, report_type='performance', title=f'Report {index}'
+            )
+            MLPrediction.objects.create(
+                client=client, campaign=campaign, prediction_type='campaign'
+            )
+        for months_ago in range(6):
+            MonthlySummary.objects.create(
+                client=client, month=date(today.year - 1, 12 - months_ago, 1)
+            )
+        for model in PLATFORM_DATA_MODELS.values():
+            for _ in range(3):
+                model.objects.create(client=client, data=[])
+        upsert_daily_metrics(client, 'google_ads', normalize_frame(pd.DataFrame({
+            'Date': [(today - timedelta(days=d)).isoformat() for d in range(30)],
+            'Campaign': 'Brand', 'Cost': 10,
+        }), 'google_ads'))
+
+    user = User.objects.create_user('analyst', password='secret')
+    UserProfile.objects.create(user=user, client=clients[0])
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    return clients[0], user
+
+
+# Committed data on every alias, so the views also run with a replica
+# configured (REPLICA_SQLITE_PATH)
+@pytest.mark.django_db(transaction=True, databases='__all__')
+@pytest.mark.parametrize('url_name, method, params', HOT_VIEWS)
+def test_hot_views_use_indexes(seeded, client, url_name, method, params):
+    _, user = seeded
+    client.force_login(user)
+    with CaptureQueriesContext(connection) as captured:
+        if method == 'post':
+            response = client.post(reverse(url_name), params, content_type='application/json')
+        else:
+            response = client.get(reverse(url_name), params)
+    assert response.status_code == 200
+    assert_indexed(captured.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_dashboard_filters_use_indexes(seeded, client):
+    _, user = seeded
+    client.force_login(user)
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(reverse('client_portal'), {
+            'platform': 'google_ads', 'status': 'active',
+            'date_from': (date.today() - timedelta(days=60)).isoformat(),
+        })
+    assert response.status_code == 200
+    assert_indexed(captured.captured_queries)
+
+
+@pytest.mark.django_db
+def test_snapshot_reads_use_indexes(seeded):
+    account, _ = seeded
+    with CaptureQueriesContext(connection) as captured:
+        for model in PLATFORM_DATA_MODELS.values():
+            list(model.objects.filter(client=account).order_by('-fetched_at')[:1])
+        list(CampaignReport.objects.filter(campaign__client=account).order_by('-generated_at'))
+        list(MLPrediction.objects.filter(campaign__client=account).order_by('-created_at'))
+    assert_indexed(captured.captured_queries)
+
+
+@pytest.mark.django_db
+def test_fact_and_rollup_refresh_use_indexes(seeded):
+    account, _ = seeded
+    today = date.today()
+    with CaptureQueriesContext(connection) as captured:
+        upsert_daily_metrics(account, 'google_ads', normalize_frame(pd.DataFrame({
+            'Date': [(today - timedelta(days=d)).isoformat() for d in range(40)],
+            'Campaign': 'Brand', 'Cost': 12,
+        }), 'google_ads'))
+    assert_indexed(captured.captured_queries)
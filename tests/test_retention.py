@@ -0,0 +1,83 @@
+import os
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+from django.utils import timezone
+
+from dashboard.models import (
+    Client, GoogleAdsData, MailchimpData, ParquetSnapshot, RetentionPolicy, RetentionRun,
+)
+from dashboard.retention import archive_dir, read_archive, run_retention
+from dashboard.schema import normalize_frame
+from dashboard.snapshot_store import archive_snapshot, set_current_snapshot
+
+
+@pytest.fixture
+def archive(settings, tmp_path):
+    settings.RETENTION_ARCHIVE_DIR = str(tmp_path / 'archive')
+    settings.SNAPSHOT_STORE_DIR = str(tmp_path / 'store')
+    settings.DATA_RETENTION_DAYS = 90
+    return tmp_path / 'archive'
+
+
+def make_client(name):
+    return Client.objects.create(name=name, email=f'{name}@example.com', company=name)
+
+
+def add_snapshots(model, client, ages):
+    for days in ages:
+        snapshot = model.objects.create(client=client, data=[{'clicks': days}])
+        model.objects.filter(pk=snapshot.pk).update(
+            fetched_at=timezone.now() - timedelta(days=days)
+        )
+
+
+@pytest.mark.django_db
+def test_expired_snapshots_are_archived_then_deleted_in_batches(archive):
+    client = make_client('acme')
+    add_snapshots(GoogleAdsData, client, [100, 120, 130, 10])
+
+    run = run_retention(batch_size=2)
+
+    assert (run.status, run.batches, run.rows_archived, run.rows_deleted) == ('complete', 2, 3, 3)
+    assert run.bytes_archived > 0
+    assert [snapshot.data for snapshot in GoogleAdsData.objects.all()] == [[{'clicks': 10}]]
+    files = sorted((archive / str(client.pk) / 'google_ads').iterdir())
+    archived = [row['data'][0]['clicks'] for path in files for row in read_archive(path)]
+    assert sorted(archived) == [100, 120, 130]
+
+
+@pytest.mark.django_db
+def test_retention_is_configurable_per_platform_and_client(archive, settings):
+    settings.DATA_RETENTION_PLATFORM_DAYS = {'mailchimp': 365}
+    acme, globex = make_client('acme'), make_client('globex')
+    RetentionPolicy.objects.create(client=globex, days=30)
+    RetentionPolicy.objects.create(client=globex, platform='mailchimp', days=200)
+    for client in (acme, globex):
+        add_snapshots(GoogleAdsData, client, [60])
+        add_snapshots(MailchimpData, client, [250])
+
+    run_retention()
+
+    assert list(GoogleAdsData.objects.values_list('client', flat=True)) == [acme.pk]
+    assert list(MailchimpData.objects.values_list('client', flat=True)) == [acme.pk]
+
+
+@pytest.mark.django_db
+def test_current_snapshot_is_kept_and_parquet_files_are_moved(archive, settings):
+    pytest.importorskip('pyarrow')
+    settings.SNAPSHOT_STORE = 'parquet'
+    client = make_client('acme')
+    frame = normalize_frame(pd.DataFrame({'Date': ['2025-01-01'], 'Clicks': [1]}), 'google_ads')
+    old = timezone.now() - timedelta(days=200)
+    expired = archive_snapshot(client, 'google_ads', frame, fetched_at=old)
+    current = archive_snapshot(client, 'google_ads', frame, fetched_at=old + timedelta(days=1))
+    set_current_snapshot(client, 'google_ads', current)
+
+    run = run_retention()
+
+    assert list(ParquetSnapshot.objects.values_list('pk', flat=True)) == [current.pk]
+    assert os.listdir(archive_dir(client.pk, 'google_ads')) == [os.path.basename(expired.path)]
+    assert not os.path.exists(expired.path)
+    assert RetentionRun.objects.get().rows_deleted == run.rows_deleted == 1
@@ -0,0 +1,64 @@
+from datetime import date
+from decimal import Decimal
+
+from dashboard.models import DailyRollup, MonthlyRollup, MonthlySummary, WeeklyRollup
+from dashboard.rollups import period_end, period_start, rebuild_rollups
+
+EXPORT_COLUMNS = ['Date', 'Campaign', 'Impressions', 'Clicks', 'Cost']
+ROLLUP_VALUES = ['platform', 'period_start', 'rows', 'campaigns', 'clicks', 'spend']
+
+
+def rollups(model, client):
+    return list(model.objects.filter(client=client).order_by('platform', 'period_start')
+                .values_list(*ROLLUP_VALUES))
+
+
+def test_period_bounds():
+    # 2025-01-01 is a Wednesday
+    assert period_start(date(2025, 1, 1), 'week') == date(2024, 12, 30)
+    assert period_end(date(2025, 1, 1), 'week') == date(2025, 1, 5)
+    assert period_start(date(2025, 2, 14), 'month') == date(2025, 2, 1)
+    assert period_end(date(2024, 2, 14), 'month') == date(2024, 2, 29)
+    assert period_end(date(2025, 12, 31), 'month') == date(2025, 12, 31)
+
+
+def test_writes_refresh_the_periods_they_touch(acme, write_facts):
+    write_facts(acme, 'google_ads', [
+        ['2024-12-31', 'Brand', 100, 10, 5.0],
+        ['2025-01-01', 'Brand', 100, 20, 10.0],
+        ['2025-01-01', 'Search', 50, 5, 2.5],
+    ], columns=EXPORT_COLUMNS)
+    # A later fetch corrects one day and adds another
+    write_facts(acme, 'google_ads', [
+        ['2025-01-01', 'Search', 50, 15, 7.5],
+        ['2025-01-06', 'Brand', 200, 40, 20.0],
+    ], columns=EXPORT_COLUMNS)
+
+    assert rollups(WeeklyRollup, acme) == [
+        ('google_ads', date(2024, 12, 30), 3, 2, 45.0, 22.5),
+        ('google_ads', date(2025, 1, 6), 1, 1, 40.0, 20.0),
+    ]
+    assert rollups(MonthlyRollup, acme) == [
+        ('google_ads', date(2024, 12, 1), 1, 1, 10.0, 5.0),
+        ('google_ads', date(2025, 1, 1), 3, 2, 75.0, 37.5),
+    ]
+    assert DailyRollup.objects.get(client=acme, period_start=date(2025, 1, 1)).clicks == 35.0
+
+    incremental = [rollups(model, acme) for model in (DailyRollup, WeeklyRollup, MonthlyRollup)]
+    rebuild_rollups(acme)
+    assert [rollups(model, acme) for model in (DailyRollup, WeeklyRollup, MonthlyRollup)] == incremental
+
+
+def test_monthly_summaries_are_derived_from_month_rollups(acme, write_facts):
+    write_facts(acme, 'google_ads', [['2025-01-01', 'Brand', 1000, 20, 10.0]], columns=EXPORT_COLUMNS)
+    write_facts(acme, 'linkedin_ads', [['2025-01-15', 'Ads', 1000, 30, 30.0]], columns=EXPORT_COLUMNS)
+
+    summary = MonthlySummary.objects.get(client=acme, month=date(2025, 1, 1))
+    assert summary.total_campaigns == 2
+    assert summary.total_clicks == 50
+    assert summary.total_spend == Decimal('40.00')
+    assert summary.overall_ctr == Decimal('0.0250')
+    assert summary.avg_cpc == Decimal('0.80')
+    assert summary.is_generated
+    assert set(summary.platform_data) == {'google_ads', 'linkedin_ads'}
+    assert summary.platform_data['linkedin_ads']['spend'] == 30.0
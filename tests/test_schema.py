@@ -0,0 +1,94 @@
+import datetime
+
+import pandas as pd
+import pytest
+from django.conf import settings
+
+from dashboard.schema import (
+    CANONICAL_COLUMNS, date_range, detect_platform, normalize_frame, parse_dates,
+)
+
+
+def read_sample(name):
+    return pd.read_csv(settings.BASE_DIR / 'sample_data' / f'techflow_{name}.csv', nrows=20)
+
+
+@pytest.mark.parametrize('platform, sample', [
+    ('google_ads', 'google_ads'),
+    ('linkedin_ads', 'linkedin_ads'),
+    ('mailchimp', 'mailchimp'),
+    ('zoho', 'zoho_crm'),
+    ('demandbase', 'demandbase'),
+])
+def test_techflow_exports_map_to_canonical_columns(platform, sample):
+    frame = normalize_frame(read_sample(sample), platform)
+    assert list(frame.columns[:len(CANONICAL_COLUMNS)]) == CANONICAL_COLUMNS
+    assert (frame['platform'] == platform).all()
+    assert frame['date'].str.match(r'^\d{4}-\d{2}-\d{2}$').all()
+    assert frame['revenue'].sum() > 0
+
+
+def test_platform_specific_names_are_renamed():
+    google = normalize_frame(read_sample('google_ads'), 'google_ads')
+    raw = read_sample('google_ads')
+    assert google['spend'].sum() == pytest.approx(raw['Cost'].sum())
+    assert google['campaign'].iloc[0] == raw['Campaign'].iloc[0]
+
+    linkedin = normalize_frame(read_sample('linkedin_ads'), 'linkedin_ads')
+    raw = read_sample('linkedin_ads')
+    assert linkedin['conversions'].sum() == raw['Leads'].sum()
+    assert linkedin['campaign'].iloc[0] == raw['Campaign_Name'].iloc[0]
+
+
+def test_normalize_is_idempotent_and_fills_missing_columns():
+    frame = normalize_frame(pd.DataFrame({'Date': ['2025-01-06'], 'Clicks': ['7']}), 'zoho')
+    again = normalize_frame(frame, 'zoho')
+    pd.testing.assert_frame_equal(frame, again)
+    assert again.loc[0, 'clicks'] == 7.0
+    assert again.loc[0, 'spend'] == 0.0
+    assert again.loc[0, 'campaign'] == ''
+
+
+def test_unknown_platform_is_rejected():
+    with pytest.raises(ValueError):
+        normalize_frame(pd.DataFrame(), 'myspace')
+
+
+@pytest.mark.parametrize('platform, sample', [
+    ('google_ads', 'google_ads'),
+    ('linkedin_ads', 'linkedin_ads'),
+    ('mailchimp', 'mailchimp'),
+    ('zoho', 'zoho_crm'),
+    ('demandbase', 'demandbase'),
+])
+def test_platform_is_detected_from_techflow_headers(platform, sample):
+    assert detect_platform(read_sample(sample).columns) == platform
+
+
+def test_unknown_headers_are_not_detected():
+    assert detect_platform(['Date', 'Visitors', 'Bounce Rate']) is None
+
+
+def test_parse_dates_parses_each_distinct_value_once(monkeypatch):
+    calls = []
+    real_to_datetime = pd.to_datetime
+
+    def counting_to_datetime(values, *args, **kwargs):
+        calls.append(len(values))
+        return real_to_datetime(values, *args, **kwargs)
+
+    monkeypatch.setattr(pd, 'to_datetime', counting_to_datetime)
+    values = ['2025-01-02', '2025-01-01', None, '2025-01-02'] * 1000
+    dates = parse_dates(values)
+
+    assert calls == [2]
+    assert dates.isna().sum() == 1000
+    assert date_range(dates) == (datetime.date(2025, 1, 1), datetime.date(2025, 1, 2))
+
+
+def test_parse_dates_falls_back_for_other_formats():
+    dates = parse_dates(['01/15/2025', '2025-01-16', 'garbage', datetime.datetime(2025, 1, 17)])
+    assert [d.date().isoformat() if not pd.isna(d) else None for d in dates] == [
+        '2025-01-15', '2025-01-16', None, '2025-01-17'
+    ]
+    assert date_range(parse_dates([None, 'garbage'])) == (None, None)
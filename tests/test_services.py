@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from dashboard import services
+from dashboard.services import MLPredictionService
+
+
+def make_features(rows=200):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'impressions': rng.normal(10000, 500, rows),
+        'clicks': rng.normal(300, 20, rows),
+        'spend': rng.normal(1000, 50, rows),
+    })
+    df.loc[5, 'impressions'] = 10 ** 7
+    df.loc[17, 'spend'] = -10 ** 6
+    return df
+
+
+def test_remove_outliers_filters_features_and_targets_together():
+    df = make_features()
+    targets = np.arange(len(df), dtype=float)
+    X, y_ctr, y_roi = MLPredictionService()._remove_outliers(df, targets, targets * 2)
+
+    assert X.shape == (198, 3)
+    assert len(y_ctr) == len(y_roi) == 198
+    assert 5 not in y_ctr and 17 not in y_ctr
+    # Row i of X still belongs to target i
+    kept = y_ctr.astype(int)
+    np.testing.assert_array_equal(X, df.to_numpy()[kept])
+    np.testing.assert_array_equal(y_roi, kept * 2)
+
+
+def test_large_training_sets_use_sampled_quantiles(monkeypatch):
+    monkeypatch.setattr(services, 'OUTLIER_SAMPLE_SIZE', 50)
+    df = make_features()
+    X, y = MLPredictionService()._remove_outliers(df, np.zeros(len(df)))
+    assert len(X) == len(y)
+    assert df['impressions'].max() not in X[:, 0]
@@ -0,0 +1,177 @@
+import os
+
+import pandas as pd
+import pytest
+from django.db import DEFAULT_DB_ALIAS, router
+from django.test import RequestFactory
+
+from dashboard.facts import metrics_frame
+from dashboard.models import Campaign, CampaignReport, Client, DailyMetric, ShardAssignment
+from dashboard.services import MLPredictionService
+from dashboard.sharding import (
+    ClientShardMiddleware, ShardMoveInProgress, ShardRouter, client_shard, move_client,
+    plan_rebalance, shard_aliases, shard_for_client, use_shard,
+)
+from dashboard.tasks import store_sync_snapshot
+
+
+pytestmark = pytest.mark.filterwarnings('ignore:Overriding setting DATABASES')
+
+
+def requires_shards(test):
+    """Run test against the SHARD_SQLITE_PATHS databases, if there are any."""
+    skip = pytest.mark.skipif(
+        not os.environ.get('SHARD_SQLITE_PATHS'),
+        reason='set SHARD_SQLITE_PATHS to run against real shard databases',
+    )
+    return skip(pytest.mark.shards(test))
+
+
+@pytest.fixture
+def two_shards(settings):
+    # shard_1 is never queried by these tests, only routed to
+    settings.DATABASES = {**settings.DATABASES, 'shard_1': {'ENGINE': 'django.db.backends.sqlite3'}}
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS, 'shard_1']
+    settings.SHARD_DIRECTORY_TTL = 0
+
+
+def make_client(name):
+    return Client.objects.create(name=name, email=f'{name}@example.com', company=name)
+
+
+def sync_frame(clicks):
+    return pd.DataFrame([{
+        'date': '2025-01-01', 'campaign': 'Brand', 'impressions': 100,
+        'clicks': clicks, 'spend': 10.0, 'conversions': 1, 'revenue': 50.0,
+    }])
+
+
+@pytest.mark.django_db
+def test_without_shards_everything_stays_on_default(settings):
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS]
+    client = make_client('acme')
+    assert shard_aliases() == [DEFAULT_DB_ALIAS]
+    assert shard_for_client(client.pk) == DEFAULT_DB_ALIAS
+    assert router.db_for_write(Campaign, instance=Campaign(client=client)) == DEFAULT_DB_ALIAS
+    with client_shard(client) as alias:
+        assert alias == DEFAULT_DB_ALIAS
+    assert not ShardAssignment.objects.exists()
+
+
+@pytest.mark.django_db
+def test_router_follows_the_directory(two_shards, settings):
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS]
+    placed, unplaced = make_client('acme'), make_client('globex')
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS, 'shard_1']
+    ShardAssignment.objects.create(client=placed, alias='shard_1')
+
+    shard_router = ShardRouter()
+    assert shard_router.db_for_write(Campaign, instance=Campaign(client=placed)) == 'shard_1'
+    assert shard_router.db_for_write(Campaign, instance=Campaign(client=unplaced)) == DEFAULT_DB_ALIAS
+    # Unsharded models are left to the next router
+    assert shard_router.db_for_read(Client, instance=placed) is None
+    with client_shard(placed):
+        assert shard_router.db_for_read(Campaign) == 'shard_1'
+    assert shard_router.db_for_read(Campaign) is None
+
+
+@pytest.mark.django_db
+def test_locked_clients_refuse_shard_work(two_shards, settings):
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS]
+    client = make_client('acme')
+    campaign = Campaign(client=client)
+    report = CampaignReport(campaign=campaign)
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS, 'shard_1']
+    ShardAssignment.objects.create(client=client, alias=DEFAULT_DB_ALIAS, locked=True)
+    with pytest.raises(ShardMoveInProgress):
+        with client_shard(client):
+            pass
+
+    # Writes that do not go through client_shard are refused too; reads are not
+    shard_router = ShardRouter()
+    assert shard_router.db_for_read(Campaign, instance=campaign) == DEFAULT_DB_ALIAS
+    with pytest.raises(ShardMoveInProgress):
+        shard_router.db_for_write(Campaign, instance=campaign)
+    with pytest.raises(ShardMoveInProgress):
+        shard_router.db_for_write(CampaignReport, instance=report)
+    with use_shard(DEFAULT_DB_ALIAS, client.pk):
+        assert shard_router.db_for_read(DailyMetric) == DEFAULT_DB_ALIAS
+        with pytest.raises(ShardMoveInProgress):
+            shard_router.db_for_write(DailyMetric)
+
+    response = ClientShardMiddleware(lambda request: None).process_exception(
+        RequestFactory().post('/'), ShardMoveInProgress()
+    )
+    assert response.status_code == 503
+    assert response['Retry-After']
+
+
+@pytest.mark.django_db
+def test_plan_rebalance_evens_out_client_counts(two_shards, settings):
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS]
+    clients = [make_client(f'client{number}') for number in range(4)]
+    settings.SHARD_DATABASE_ALIASES = [DEFAULT_DB_ALIAS, 'shard_1']
+
+    moves = plan_rebalance()
+    assert len(moves) == 2
+    assert {source for _, source, _ in moves} == {DEFAULT_DB_ALIAS}
+    assert {target for _, _, target in moves} == {'shard_1'}
+    assert {client_id for client_id, _, _ in moves} <= {client.pk for client in clients}
+
+
+@requires_shards
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_new_clients_are_spread_over_the_shards(settings):
+    settings.SHARD_DIRECTORY_TTL = 0
+    clients = [make_client(f'client{number}') for number in range(len(shard_aliases()))]
+    assert {shard_for_client(client.pk) for client in clients} == set(shard_aliases())
+    for client in clients:
+        alias = shard_for_client(client.pk)
+        assert Client.objects.using(alias).filter(pk=client.pk).exists()
+
+
+@requires_shards
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_move_client_keeps_every_row(settings):
+    settings.SHARD_DIRECTORY_TTL = 0
+    client = make_client('acme')
+    source = shard_for_client(client.pk)
+    target = next(alias for alias in shard_aliases() if alias != source)
+    store_sync_snapshot(client, 'google_ads', sync_frame(clicks=10))
+    client.campaigns.create(
+        name='Brand', platform='google_ads', start_date='2025-01-01', budget=100,
+    )
+    with client_shard(client):
+        before = metrics_frame(client)
+
+    move_client(client.pk, target)
+
+    assert shard_for_client(client.pk) == target
+    assert not DailyMetric.objects.using(source).filter(client_id=client.pk).exists()
+    assert Campaign.objects.using(target).filter(client_id=client.pk).count() == 1
+    with client_shard(client):
+        pd.testing.assert_frame_equal(metrics_frame(client), before)
+        # Writes after the move land on the new shard
+        store_sync_snapshot(client, 'google_ads', sync_frame(clicks=25))
+    assert DailyMetric.objects.using(target).get(client_id=client.pk).clicks == 25
+
+
+@requires_shards
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_model_training_reads_campaigns_from_every_shard(settings, monkeypatch):
+    settings.SHARD_DIRECTORY_TTL = 0
+    clients = [make_client(f'client{number}') for number in range(len(shard_aliases()))]
+    for client in clients:
+        for number in range(5):
+            client.campaigns.create(
+                name=f'Campaign {number}', platform='google_ads', start_date='2025-01-01', budget=100,
+            )
+    trained_on = []
+
+    def prepare(self, campaigns):
+        trained_on.extend(campaigns)
+        return [], [], [], []
+
+    monkeypatch.setattr(MLPredictionService, '_prepare_training_data', prepare)
+    MLPredictionService().auto_train_models()
+    assert {campaign.client_id for campaign in trained_on} == {client.pk for client in clients}
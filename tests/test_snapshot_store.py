@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from dashboard.models import GoogleAdsData, ParquetSnapshot
+from dashboard.schema import normalize_frame
+from dashboard.snapshot_store import archive_snapshot, load_snapshot_frame, snapshot_history
+
+pytest.importorskip('pyarrow')
+
+
+def make_frame(day):
+    return normalize_frame(pd.DataFrame({
+        'Date': [f'2025-01-{day:02d}'], 'Campaign': ['Brand'], 'Clicks': [day], 'CTR': ['1.5%'],
+    }), 'google_ads')
+
+
+@pytest.fixture(autouse=True)
+def parquet_store(settings, tmp_path):
+    settings.SNAPSHOT_STORE = 'parquet'
+    settings.SNAPSHOT_STORE_DIR = str(tmp_path)
+
+
+def test_parquet_store_writes_files_with_pointer_rows(acme, tmp_path):
+    snapshot = archive_snapshot(acme, 'google_ads', make_frame(1))
+
+    assert isinstance(snapshot, ParquetSnapshot)
+    assert snapshot.path.startswith(str(tmp_path / str(acme.pk) / 'google_ads'))
+    assert snapshot.row_count == 1
+    assert 'ctr' in snapshot.columns
+    assert not GoogleAdsData.objects.exists()
+
+
+def test_snapshots_are_read_column_projected_from_both_stores(acme, settings):
+    archive_snapshot(acme, 'google_ads', make_frame(1))
+    settings.SNAPSHOT_STORE = 'db'
+    archive_snapshot(acme, 'google_ads', make_frame(2))
+
+    clicks = []
+    for store, snapshot_id, _ in snapshot_history(acme, 'google_ads'):
+        frame = load_snapshot_frame(acme, 'google_ads', store, snapshot_id, columns=['date', 'clicks'])
+        assert list(frame.columns) == ['date', 'clicks']
+        clicks += frame['clicks'].tolist()
+    assert clicks == [2.0, 1.0]
@@ -0,0 +1,77 @@
+import io
+from contextlib import contextmanager
+
+import pandas as pd
+from django.core.management import call_command
+
+from dashboard import facts
+from dashboard import summary as summary_module
+from dashboard.facts import upsert_daily_metrics
+from dashboard.models import UnifiedClientData
+from dashboard.schema import normalize_frame
+from dashboard.tasks import store_sync_snapshot
+
+SUMMARY_FIELDS = ['total_records', 'date_range_start', 'date_range_end', 'platforms_included']
+
+
+def sync_summary(client):
+    summary = UnifiedClientData.objects.get(client=client, source='sync')
+    return {field: getattr(summary, field) for field in SUMMARY_FIELDS}, summary.data_summary
+
+
+def test_deltas_match_a_full_rebuild(acme, google_rows, write_facts):
+    store_sync_snapshot(acme, 'google_ads', google_rows([
+        ['2025-01-01', 'Brand', 10, 5.0], ['2025-01-02', 'Brand', 4, 2.0],
+    ]))
+    # Re-fetch: one day corrected, one new day
+    store_sync_snapshot(acme, 'google_ads', google_rows([
+        ['2025-01-02', 'Brand', 6, 3.0], ['2025-01-03', 'Search', 1, 0.5],
+    ]))
+    rows = pd.DataFrame([{'Date': '2024-12-31', 'Campaign': 'Ads', 'Clicks': 7, 'Spend': 9.0}])
+    write_facts(acme, 'linkedin_ads', rows)
+
+    incremental = sync_summary(acme)
+    assert incremental[0]['total_records'] == 4
+    assert incremental[1]['clicks'] == 24.0
+    assert incremental[1]['platforms']['google_ads']['rows'] == 3
+    assert str(incremental[0]['date_range_start']) == '2024-12-31'
+
+    call_command('rebuild_summaries', stdout=io.StringIO())
+    assert sync_summary(acme) == incremental
+
+
+def test_sync_does_not_rescan_history(acme, monkeypatch, google_rows):
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-01', 'Brand', 10, 5.0]]))
+
+    def rescan(client):
+        raise AssertionError('the summary was rebuilt')
+
+    monkeypatch.setattr(summary_module, 'rebuild_summary', rescan)
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-02', 'Brand', 2, 1.0]]))
+    assert sync_summary(acme)[1]['spend'] == 6.0
+
+
+def test_deltas_are_read_and_applied_under_the_summary_lock(acme, monkeypatch, google_rows):
+    store_sync_snapshot(acme, 'google_ads', google_rows([['2025-01-01', 'Brand', 10, 5.0]]))
+    events = []
+    real_lock, real_delta = summary_module.locked_summary, facts.fact_delta
+
+    @contextmanager
+    def lock(client):
+        with real_lock(client) as summary:
+            events.append('locked')
+            yield summary
+        events.append('released')
+
+    def delta(*args):
+        events.append('delta')
+        return real_delta(*args)
+
+    monkeypatch.setattr(summary_module, 'locked_summary', lock)
+    monkeypatch.setattr(facts, 'fact_delta', delta)
+    upsert_daily_metrics(acme, 'google_ads', normalize_frame(
+        google_rows([['2025-01-01', 'Brand', 12, 6.0]]), 'google_ads'
+    ))
+    # Another writer's delta waits for the lock instead of reading the same old state
+    assert events == ['locked', 'delta', 'released']
+    assert sync_summary(acme)[1]['spend'] == 6.0
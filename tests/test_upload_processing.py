@@ -0,0 +1,73 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from dashboard.models import Client, GoogleAdsData, UnifiedClientData
+from dashboard.tasks import process_unified_upload
+
+CSV = (
+    b"Date,Campaign,Impressions,Clicks,Cost\n"
+    b"2025-01-01,Brand,1000,10,5.5\n"
+    b"2025-01-02,Brand,1200,12,6.0\n"
+)
+
+
+def post_upload(client, content, name='export.csv'):
+    return client.post(reverse('unified_data_upload'), {
+        'platform': 'google_ads',
+        'data_file': SimpleUploadedFile(name, content),
+    })
+
+
+def test_upload_is_stored_and_enqueued(portal_user, client, monkeypatch,
+                                       django_capture_on_commit_callbacks):
+    enqueued = []
+    monkeypatch.setattr(process_unified_upload, 'delay', enqueued.append)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = post_upload(client, CSV)
+
+    upload = UnifiedClientData.objects.get(client=portal_user, source='upload')
+    assert response.status_code == 302
+    assert response['Location'].endswith(f'?upload={upload.pk}')
+    assert enqueued == [upload.pk]
+    assert upload.status == 'processing'
+    assert upload.source_file.name.startswith('uploads/')
+    assert not GoogleAdsData.objects.exists()
+
+
+def test_task_ingests_upload_and_progress_reports_it(portal_user, client,
+                                                     django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        post_upload(client, CSV)
+    upload = UnifiedClientData.objects.get(client=portal_user, source='upload')
+
+    progress = client.get(reverse('unified_data_upload_progress', args=[upload.pk])).json()
+    assert progress['status'] == 'synced'
+    assert progress['rows_parsed'] == 2
+    assert progress['total_records'] == 2
+    assert progress['error_message'] == ''
+    assert GoogleAdsData.objects.filter(client=portal_user).count() == 1
+
+
+def test_task_marks_unreadable_upload_failed(portal_user, client,
+                                            django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        post_upload(client, CSV, name='export.xlsx')
+    upload = UnifiedClientData.objects.get(client=portal_user, source='upload')
+
+    progress = client.get(reverse('unified_data_upload_progress', args=[upload.pk])).json()
+    assert progress['status'] == 'failed'
+    assert progress['error_message']
+
+
+def test_progress_is_scoped_to_the_users_client(portal_user, client):
+    other = Client.objects.create(name='Other', email='o@example.com', company='Other')
+    upload = UnifiedClientData.objects.create(client=other, source='upload')
+    response = client.get(reverse('unified_data_upload_progress', args=[upload.pk]))
+    assert response.status_code == 404
+
+
+def test_upload_page_renders_progress_for_an_upload(portal_user, client):
+    upload = UnifiedClientData.objects.create(client=portal_user, source='upload')
+    response = client.get(reverse('unified_data_upload'), {'upload': upload.pk})
+    assert response.status_code == 200
+    assert reverse('unified_data_upload_progress', args=[upload.pk]).encode() in response.content
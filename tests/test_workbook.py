@@ -0,0 +1,103 @@
+import io
+
+import pandas as pd
+import pytest
+from django.conf import settings
+from openpyxl import Workbook
+
+from dashboard.ingestion import ingest_upload
+from dashboard import workbook
+from dashboard.workbook import iter_parsed_sheets
+from dashboard.models import (
+    DemandbaseData, GoogleAdsData, LinkedInAdsData, MailchimpData, UnifiedClientData,
+    ZohoData,
+)
+
+SHEETS = {
+    'Google Ads': 'google_ads',
+    'LinkedIn': 'linkedin_ads',
+    'Mailchimp': 'mailchimp',
+    'Zoho': 'zoho_crm',
+    'Demandbase': 'demandbase',
+}
+
+
+def make_workbook(extra_sheet=None):
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for title, sample in SHEETS.items():
+        frame = pd.read_csv(settings.BASE_DIR / 'sample_data' / f'techflow_{sample}.csv', nrows=30)
+        sheet = workbook.create_sheet(title)
+        sheet.append(list(frame.columns))
+        for row in frame.itertuples(index=False):
+            sheet.append(list(row))
+    if extra_sheet:
+        sheet = workbook.create_sheet(extra_sheet)
+        sheet.append(['Notes'])
+        sheet.append(['Prepared by marketing ops'])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.fixture
+def upload(acme):
+    return UnifiedClientData.objects.create(
+        client=acme, source='upload', file_name='techflow.xlsx'
+    )
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_each_sheet_is_routed_to_its_platform(upload, settings, workers):
+    settings.UPLOAD_SHEET_WORKERS = workers
+    total = ingest_upload(upload, make_workbook(extra_sheet='Notes'), chunk_size=10)
+
+    assert total == 150
+    for model in (GoogleAdsData, LinkedInAdsData, MailchimpData, ZohoData, DemandbaseData):
+        assert model.objects.filter(client=upload.client).count() == 3
+    assert sorted(upload.platforms_included) == [
+        'demandbase', 'google_ads', 'linkedin_ads', 'mailchimp', 'zoho'
+    ]
+    sheets = upload.data_summary['sheets']
+    assert sheets['Zoho'] == {'platform': 'zoho', 'records': 30}
+    assert sheets['Notes'] == {'platform': None, 'records': 0}
+
+
+def test_selected_platform_is_fallback_for_unrecognized_sheets(upload, settings):
+    settings.UPLOAD_SHEET_WORKERS = 1
+    ingest_upload(upload, make_workbook(extra_sheet='Notes'), 'google_ads')
+    assert upload.data_summary['sheets']['Notes']['platform'] == 'google_ads'
+
+
+def _parse_in_daemon(path, out_dir, results):
+    pools = []
+    parse_in_pool = workbook._parse_in_billiard_pool
+
+    def recording_pool(*args):
+        pools.append(args[-1])
+        return parse_in_pool(*args)
+
+    workbook._parse_in_billiard_pool = recording_pool
+    try:
+        parsed = iter_parsed_sheets(path, 10, out_dir, max_workers=2)
+        results.put((pools, sorted(sheet['platform'] for sheet in parsed)))
+    except Exception as e:
+        results.put(repr(e))
+
+
+def test_sheets_are_parsed_in_parallel_in_daemonic_workers(tmp_path):
+    # Celery's prefork pool runs tasks in daemonic billiard processes
+    billiard = pytest.importorskip('billiard')
+    path = tmp_path / 'techflow.xlsx'
+    path.write_bytes(make_workbook().getvalue())
+    context = billiard.get_context('fork')
+    results = context.Queue()
+    worker = context.Process(target=_parse_in_daemon, args=(str(path), str(tmp_path), results), daemon=True)
+    worker.start()
+    outcome = results.get(timeout=60)
+    worker.join()
+    assert not isinstance(outcome, str), outcome
+    pools, outcome = outcome
+    assert pools == [2]
+    assert outcome == ['demandbase', 'google_ads', 'linkedin_ads', 'mailchimp', 'zoho']